@@ -1,10 +1,36 @@
+import hashlib
 import json
 import os
+import random
+import sqlite3
+import statistics
+import sys
+import threading
+import time
+import uuid
 import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime
+from requests.adapters import HTTPAdapter
 from typing import List, Dict, Any, Optional
 from mcp.server.fastmcp import FastMCP
 from dotenv import load_dotenv
 
+# Optional: inotify/FSEvents notifications for the inbox watcher (falls back to polling)
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+# Optional: page-level PDF access for splitting certificate packets
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:
+    PdfReader = PdfWriter = None
+
 # Load environment variables
 load_dotenv()
 
@@ -14,6 +40,751 @@ mcp = FastMCP("insurance")
 INSURANCE_API_URL = os.getenv("INSURANCE_API_URL", "")
 API_KEY = "img"
 
+# HTTP client settings for the insurance API
+INSURANCE_CONNECT_TIMEOUT = float(os.getenv("INSURANCE_CONNECT_TIMEOUT", "5"))
+INSURANCE_READ_TIMEOUT = float(os.getenv("INSURANCE_READ_TIMEOUT", "120"))
+INSURANCE_MAX_RETRIES = int(os.getenv("INSURANCE_MAX_RETRIES", "3"))
+INSURANCE_BACKOFF_BASE = float(os.getenv("INSURANCE_BACKOFF_BASE", "0.5"))
+INSURANCE_BACKOFF_MAX = float(os.getenv("INSURANCE_BACKOFF_MAX", "30"))
+INSURANCE_POOL_SIZE = int(os.getenv("INSURANCE_POOL_SIZE", "10"))
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+# Adaptive concurrency (AIMD) and circuit breaker for the insurance API
+INSURANCE_INITIAL_CONCURRENCY = int(os.getenv("INSURANCE_INITIAL_CONCURRENCY", "4"))
+INSURANCE_MAX_CONCURRENCY = int(os.getenv("INSURANCE_MAX_CONCURRENCY", str(INSURANCE_POOL_SIZE)))
+# An attempt slower than this multiple of the baseline per-MB latency counts as congestion
+INSURANCE_LATENCY_TOLERANCE = float(os.getenv("INSURANCE_LATENCY_TOLERANCE", "2.0"))
+INSURANCE_QUEUE_TIMEOUT = float(os.getenv("INSURANCE_QUEUE_TIMEOUT", "120"))
+INSURANCE_BREAKER_FAILURES = int(os.getenv("INSURANCE_BREAKER_FAILURES", "5"))
+INSURANCE_BREAKER_RESET = float(os.getenv("INSURANCE_BREAKER_RESET", "30"))
+# PDFs are streamed to the API in chunks of this size
+UPLOAD_CHUNK_SIZE = int(os.getenv("INSURANCE_UPLOAD_CHUNK_SIZE", str(64 * 1024)))
+
+# Local storage for the insurance server (one level up from servers/)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INSURANCE_DATA_DIR = os.path.join(PROJECT_ROOT, "data", "insurance")
+
+# Cache of successful extractions keyed by the PDF's SHA-256
+EXTRACTION_CACHE_PATH = os.path.join(INSURANCE_DATA_DIR, "extraction_cache.db")
+EXTRACTION_CACHE_TTL = float(os.getenv("INSURANCE_CACHE_TTL", str(7 * 24 * 60 * 60)))
+EXTRACTION_CACHE_MAX_BYTES = int(os.getenv("INSURANCE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Local checks run before any upload
+PREFLIGHT_MAX_BYTES = int(os.getenv("INSURANCE_MAX_PDF_BYTES", str(50 * 1024 * 1024)))
+# The PDF header may follow up to 1 KB of leading junk, and %%EOF may be followed by trailing junk
+PREFLIGHT_SCAN_BYTES = 1024
+
+# Bulk directory ingestion
+BATCH_OUTPUT_DIR = os.path.join(INSURANCE_DATA_DIR, "batches")
+MAX_DIRECTORY_CONCURRENCY = 16
+
+# Splitting multi-certificate packets
+PACKET_OUTPUT_DIR = os.path.join(INSURANCE_DATA_DIR, "packets")
+# Page text that marks the first page of an ACORD certificate or evidence form
+CERTIFICATE_START_MARKERS = (
+    "CERTIFICATE OF LIABILITY INSURANCE",
+    "CERTIFICATE OF PROPERTY INSURANCE",
+    "EVIDENCE OF PROPERTY INSURANCE",
+    "EVIDENCE OF COMMERCIAL PROPERTY INSURANCE"
+)
+
+# Background extraction jobs
+JOB_QUEUE_PATH = os.path.join(INSURANCE_DATA_DIR, "jobs.db")
+JOB_WORKERS = int(os.getenv("INSURANCE_JOB_WORKERS", "2"))
+# Jobs that failed or were interrupted this many times are marked failed instead of retried again
+JOB_MAX_ATTEMPTS = 3
+# Jobs that hit an open circuit breaker or a transient failure wait this long before
+# retrying, doubling per deferral up to the cap; breaker deferrals don't count as attempts
+JOB_RETRY_DELAY = INSURANCE_BREAKER_RESET
+JOB_RETRY_MAX_DELAY = 10 * 60
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+
+# Watch-folder ingestion, enabled by setting INSURANCE_INBOX_DIR
+INBOX_DIR = os.getenv("INSURANCE_INBOX_DIR", "")
+INBOX_CHECKPOINT_PATH = os.path.join(INSURANCE_DATA_DIR, "inbox.db")
+INBOX_POLL_INTERVAL = float(os.getenv("INSURANCE_INBOX_POLL_INTERVAL", "5"))
+# A file must keep the same size and mtime this long before it is treated as fully written
+INBOX_SETTLE_SECONDS = float(os.getenv("INSURANCE_INBOX_SETTLE_SECONDS", "2"))
+
+# Queryable store of extracted certificate fields
+CERTIFICATE_STORE_PATH = os.path.join(INSURANCE_DATA_DIR, "certificates.db")
+# Field names vary between API versions, so coverage fields are matched on any of these
+# (compared lowercased with spaces and underscores removed)
+COVERAGE_TYPE_KEYS = {"coveragetype", "coverage", "coveragename", "typeofinsurance", "type", "coverageid"}
+POLICY_NUMBER_KEYS = {"policynumber", "policyno", "policynum"}
+INSURER_KEYS = {"insurername", "insurer", "carrier", "carriername"}
+EFFECTIVE_DATE_KEYS = {"policyeffectivedate", "effectivedate", "policyeff", "effdate"}
+EXPIRATION_DATE_KEYS = {"policyexpirationdate", "expirationdate", "policyexp", "expirydate", "expdate"}
+DATE_FORMATS = ("%m/%d/%Y", "%Y-%m-%d", "%m/%d/%y", "%m-%d-%Y", "%d-%b-%Y", "%B %d, %Y")
+
+def file_sha256(file_path: str) -> str:
+    """Hash a file's contents without reading it into memory at once."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ExtractionCache:
+    """
+    Stored insurance API extractions, one per PDF content hash.
+
+    Each entry records which API endpoint produced it, so pointing
+    INSURANCE_API_URL somewhere else (say, a newer model) doesn't serve
+    results extracted by the old one. The hash pins the PDF's bytes, so
+    `ttl` only bounds how long an extraction is trusted before the API is
+    asked again. Only successful extractions are stored. Once they take up
+    more than `max_bytes`, those least recently asked for are dropped.
+    """
+
+    def __init__(self, db_path: str, ttl: float, max_bytes: int, api_url: str):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.api_url = api_url
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "stale_endpoint": 0, "evictions": 0,
+                      "upload_bytes_saved": 0}
+        self._conn = None
+        self._lock = threading.RLock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS extractions (
+                    sha256 TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    api_url TEXT,
+                    pdf_bytes INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(extractions)")}
+            if "api_url" not in columns:
+                # Older entries don't know their endpoint; they are trusted until they expire
+                self._conn.execute("ALTER TABLE extractions ADD COLUMN api_url TEXT")
+                self._conn.execute("ALTER TABLE extractions ADD COLUMN pdf_bytes INTEGER NOT NULL DEFAULT 0")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_extractions_last_access ON extractions (last_access)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, sha256: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the stored extraction of the PDF with this content hash, or
+        None if there is none, it has expired, or another endpoint made it.
+        """
+        now = time.time()
+        with self._lock, self.conn:
+            row = self.conn.execute(
+                "SELECT result, created_at, api_url, pdf_bytes FROM extractions WHERE sha256 = ?", (sha256,)
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            result, created_at, api_url, pdf_bytes = row
+            stale = api_url is not None and api_url != self.api_url
+            if stale or now - created_at > self.ttl:
+                self.conn.execute("DELETE FROM extractions WHERE sha256 = ?", (sha256,))
+                self.stats["stale_endpoint" if stale else "expired"] += 1
+                self.stats["misses"] += 1
+                return None
+            self.conn.execute("UPDATE extractions SET last_access = ? WHERE sha256 = ?", (now, sha256))
+            self.stats["hits"] += 1
+            self.stats["upload_bytes_saved"] += pdf_bytes
+        return json.loads(result)
+
+    def put(self, sha256: str, result: Dict[str, Any], pdf_bytes: int) -> None:
+        """Store a successful extraction of a `pdf_bytes`-long PDF, then trim the cache to `max_bytes`."""
+        payload = json.dumps(result)
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO extractions (sha256, result, size, created_at, last_access, api_url, "
+                "pdf_bytes) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (sha256, payload, len(payload), now, now, self.api_url, pdf_bytes)
+            )
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM extractions").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            for evict_hash, size in self.conn.execute(
+                "SELECT sha256, size FROM extractions ORDER BY last_access ASC"
+            ).fetchall():
+                if total <= self.max_bytes or evict_hash == sha256:
+                    break
+                self.conn.execute("DELETE FROM extractions WHERE sha256 = ?", (evict_hash,))
+                total -= size
+                self.stats["evictions"] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Uploads answered from the cache since the server started, and what the cache holds."""
+        with self._lock:
+            entries, size, pdf_bytes = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(pdf_bytes), 0) FROM extractions"
+            ).fetchone()
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+                "certificates_cached": entries,
+                "pdf_bytes_covered": pdf_bytes,
+                "size_bytes": size,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "api_url": self.api_url
+            }
+
+extraction_cache = ExtractionCache(EXTRACTION_CACHE_PATH, EXTRACTION_CACHE_TTL, EXTRACTION_CACHE_MAX_BYTES,
+                                   INSURANCE_API_URL)
+
+def find_field(data: Any, keys: set) -> Optional[Any]:
+    """
+    Find the first value whose normalized key is in `keys`, looking in a
+    dict and then in its nested dicts (e.g. a coverage's policy info).
+    """
+    if not isinstance(data, dict):
+        return None
+    nested = []
+    for key, value in data.items():
+        if key.lower().replace("_", "").replace(" ", "") in keys and not isinstance(value, (dict, list)):
+            return value
+        if isinstance(value, dict):
+            nested.append(value)
+    for value in nested:
+        found = find_field(value, keys)
+        if found is not None:
+            return found
+    return None
+
+def parse_date(value: Any) -> Optional[str]:
+    """Normalize a certificate date to ISO format, or None if unparseable."""
+    if not value:
+        return None
+    text = str(value).strip()
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+def party_name(party: Any) -> str:
+    return str(party.get("Name", "")).strip() if isinstance(party, dict) else ""
+
+class CertificateStore:
+    """
+    Indexed local store of extracted certificate data.
+
+    Every successful extraction is recorded, keyed by the PDF's content hash,
+    with one row per coverage. Expiry dates, insured names and
+    classifications are indexed so compliance questions are answered from
+    SQLite rather than by re-uploading PDFs.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._conn = None
+        self._lock = threading.RLock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS certificates (
+                    sha256 TEXT PRIMARY KEY,
+                    file_path TEXT NOT NULL,
+                    insured_name TEXT NOT NULL,
+                    insured_key TEXT NOT NULL,
+                    producer_name TEXT NOT NULL,
+                    holder_name TEXT NOT NULL,
+                    classification TEXT NOT NULL,
+                    signed INTEGER NOT NULL,
+                    extracted_at REAL NOT NULL,
+                    data TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_certificates_insured ON certificates (insured_key);
+                CREATE INDEX IF NOT EXISTS idx_certificates_classification ON certificates (classification);
+                CREATE INDEX IF NOT EXISTS idx_certificates_signed ON certificates (signed);
+                CREATE TABLE IF NOT EXISTS coverages (
+                    sha256 TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    coverage_type TEXT NOT NULL,
+                    policy_number TEXT NOT NULL,
+                    insurer TEXT NOT NULL,
+                    effective_date TEXT,
+                    expiration_date TEXT,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (sha256, position)
+                );
+                CREATE INDEX IF NOT EXISTS idx_coverages_expiration ON coverages (expiration_date);
+                """
+            )
+            self._conn.commit()
+        return self._conn
+
+    def contains(self, sha256: str) -> bool:
+        with self._lock:
+            return self.conn.execute(
+                "SELECT 1 FROM certificates WHERE sha256 = ?", (sha256,)
+            ).fetchone() is not None
+
+    def record(self, sha256: str, file_path: str, result: Dict[str, Any]) -> None:
+        """Store (or replace) the searchable fields of a successful extraction."""
+        insured = party_name(result.get("Insured"))
+        signed = str(result.get("Signed", "")).strip().lower() in ("yes", "y", "true", "1")
+        data = {
+            field: result.get(field)
+            for field in ("Insured", "Producer", "CertificateHolder", "Classification", "Signed")
+        }
+        coverages = result.get("Coverages") or []
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO certificates (sha256, file_path, insured_name, insured_key, "
+                "producer_name, holder_name, classification, signed, extracted_at, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    sha256, file_path, insured, insured.lower(),
+                    party_name(result.get("Producer")),
+                    party_name(result.get("CertificateHolder")),
+                    str(result.get("Classification", "")),
+                    int(signed), time.time(), json.dumps(data)
+                )
+            )
+            self.conn.execute("DELETE FROM coverages WHERE sha256 = ?", (sha256,))
+            self.conn.executemany(
+                "INSERT INTO coverages (sha256, position, coverage_type, policy_number, insurer, "
+                "effective_date, expiration_date, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        sha256, position,
+                        str(find_field(coverage, COVERAGE_TYPE_KEYS) or ""),
+                        str(find_field(coverage, POLICY_NUMBER_KEYS) or ""),
+                        str(find_field(coverage, INSURER_KEYS) or ""),
+                        parse_date(find_field(coverage, EFFECTIVE_DATE_KEYS)),
+                        parse_date(find_field(coverage, EXPIRATION_DATE_KEYS)),
+                        json.dumps(coverage)
+                    )
+                    for position, coverage in enumerate(coverages)
+                    if isinstance(coverage, dict)
+                ]
+            )
+
+    def expiring(self, until: str, since: Optional[str], coverage_type: Optional[str],
+                 limit: int) -> List[Dict[str, Any]]:
+        """Coverages expiring on or before `until` (and on or after `since`), soonest first."""
+        query = (
+            "SELECT c.insured_name, c.classification, c.file_path, v.coverage_type, v.policy_number, "
+            "v.insurer, v.effective_date, v.expiration_date FROM coverages v "
+            "JOIN certificates c ON c.sha256 = v.sha256 WHERE v.expiration_date <= ?"
+        )
+        params: list = [until]
+        if since:
+            query += " AND v.expiration_date >= ?"
+            params.append(since)
+        if coverage_type:
+            query += " AND v.coverage_type LIKE ?"
+            params.append(f"%{coverage_type}%")
+        query += " ORDER BY v.expiration_date LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(query, params).fetchall()]
+
+    def find(self, insured_name: Optional[str], classification: Optional[str],
+             signed: Optional[bool], limit: int) -> List[Dict[str, Any]]:
+        """Certificates matching an insured name prefix, classification and signature status."""
+        query = (
+            "SELECT sha256, file_path, insured_name, producer_name, holder_name, classification, "
+            "signed, extracted_at FROM certificates WHERE 1 = 1"
+        )
+        params: list = []
+        if insured_name:
+            # A range on the lowercased name uses the index, unlike LIKE
+            prefix = insured_name.strip().lower()
+            query += " AND insured_key >= ? AND insured_key < ?"
+            params.extend([prefix, prefix + "\uffff"])
+        if classification:
+            query += " AND classification = ?"
+            params.append(classification)
+        if signed is not None:
+            query += " AND signed = ?"
+            params.append(int(signed))
+        query += " ORDER BY insured_key LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+        certificates = []
+        for row in rows:
+            certificate = dict(row)
+            certificate["signed"] = bool(certificate["signed"])
+            certificate["extracted_at"] = datetime.fromtimestamp(certificate["extracted_at"]).isoformat()
+            certificates.append(certificate)
+        return certificates
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            certificates, unsigned = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(signed = 0), 0) FROM certificates"
+            ).fetchone()
+            coverages, undated = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(expiration_date IS NULL), 0) FROM coverages"
+            ).fetchone()
+            classifications = self.conn.execute(
+                "SELECT classification, COUNT(*) FROM certificates GROUP BY classification"
+            ).fetchall()
+        return {
+            "certificates": certificates,
+            "unsigned": unsigned,
+            "coverages": coverages,
+            "coverages_without_expiration": undated,
+            "classifications": {row[0]: row[1] for row in classifications}
+        }
+
+certificate_store = CertificateStore(CERTIFICATE_STORE_PATH)
+
+class MultipartFileStream:
+    """
+    multipart/form-data body for a single file, produced lazily.
+
+    The file is read and sent UPLOAD_CHUNK_SIZE bytes at a time, so memory
+    per upload is bounded by the chunk size rather than the file size.
+    Because the total length is known up front, requests sends a regular
+    Content-Length body rather than chunked transfer encoding.
+    """
+
+    def __init__(self, field_name: str, file_path: str, content_type: str = "application/pdf",
+                 chunk_size: int = UPLOAD_CHUNK_SIZE):
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.boundary = uuid.uuid4().hex
+        filename = os.path.basename(file_path).replace('"', "%22")
+        self._preamble = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field_name}"; filename="{filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+        self._epilogue = f"\r\n--{self.boundary}--\r\n".encode()
+        self._file_size = os.path.getsize(file_path)
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return len(self._preamble) + self._file_size + len(self._epilogue)
+
+    def __iter__(self):
+        yield self._preamble
+        with open(self.file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.chunk_size), b""):
+                yield chunk
+        yield self._epilogue
+
+class InsuranceAPIUnavailable(Exception):
+    """Raised instead of calling the insurance API while it is overloaded or unhealthy."""
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD limit on concurrent insurance API requests.
+
+    Each request that completes normally raises the limit by 1/limit (about
+    +1 per round of requests). A 429/5xx, a connection failure or a timeout
+    halves it. So does an attempt slower than `latency_tolerance` times the
+    baseline. Latency is compared per MB uploaded (bodies under 1 MB count
+    as 1 MB), so a large PDF that is merely slow to send does not read as
+    congestion. Decreases are spaced by at least one baseline interval, so
+    one burst of slow responses only counts once.
+    """
+
+    latency_unit_bytes = 1024 * 1024
+
+    def __init__(self, initial: int, maximum: int, latency_tolerance: float, queue_timeout: float):
+        self.maximum = max(1, maximum)
+        self.limit = float(min(max(1, initial), self.maximum))
+        self.latency_tolerance = latency_tolerance
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.baseline_seconds_per_mb: Optional[float] = None
+        self.stats = {"acquired": 0, "queue_timeouts": 0, "increases": 0, "decreases": 0}
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        """Wait for a free slot; raise InsuranceAPIUnavailable after the queue timeout."""
+        deadline = time.monotonic() + self.queue_timeout
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stats["queue_timeouts"] += 1
+                    raise InsuranceAPIUnavailable(
+                        f"Insurance API is overloaded: no request slot freed within {self.queue_timeout:.0f}s "
+                        f"(concurrency limit {int(self.limit)})"
+                    )
+                self._cond.wait(remaining)
+            self.in_flight += 1
+            self.stats["acquired"] += 1
+
+    def release(self, latency: float, overloaded: bool, body_bytes: int = 0) -> None:
+        """Free a slot and adjust the limit from the request's outcome and upload size."""
+        seconds_per_mb = latency / max(1.0, body_bytes / self.latency_unit_bytes)
+        with self._cond:
+            self.in_flight -= 1
+            baseline = self.baseline_seconds_per_mb
+            slow = baseline is not None and seconds_per_mb > baseline * self.latency_tolerance
+            if overloaded or slow:
+                now = time.monotonic()
+                if now - self._last_decrease >= (baseline or 0.0):
+                    self.limit = max(1.0, self.limit / 2)
+                    self._last_decrease = now
+                    self.stats["decreases"] += 1
+            else:
+                self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+                self.stats["increases"] += 1
+            if not overloaded:
+                # Slow EWMA, so a gradual slowdown still stands out against it
+                self.baseline_seconds_per_mb = (
+                    seconds_per_mb if baseline is None else 0.9 * baseline + 0.1 * seconds_per_mb
+                )
+            self._cond.notify_all()
+
+    def summary(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                **self.stats,
+                "limit": int(self.limit),
+                "limit_exact": round(self.limit, 3),
+                "max_limit": self.maximum,
+                "in_flight": self.in_flight,
+                "baseline_seconds_per_mb": (
+                    round(self.baseline_seconds_per_mb, 3) if self.baseline_seconds_per_mb else None
+                ),
+                "latency_tolerance": self.latency_tolerance,
+                "queue_timeout_seconds": self.queue_timeout
+            }
+
+class CircuitBreaker:
+    """
+    Fails insurance API calls fast while the backend is unhealthy.
+
+    After `failure_threshold` consecutive failed uploads the circuit opens
+    and calls are refused for `reset_timeout` seconds. Then a single probe
+    request is let through (half-open): success closes the circuit, failure
+    opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.stats = {"rejected": 0, "opened": 0, "probes": 0}
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """Raise InsuranceAPIUnavailable if the call should not reach the API."""
+        with self._lock:
+            if self.state == "open":
+                remaining = self.opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    self.stats["rejected"] += 1
+                    raise InsuranceAPIUnavailable(
+                        f"Insurance API circuit is open after {self.consecutive_failures} consecutive failures; "
+                        f"retry in {remaining:.0f}s"
+                    )
+                self.state = "half_open"
+            if self.state == "half_open":
+                if self._probe_in_flight:
+                    self.stats["rejected"] += 1
+                    raise InsuranceAPIUnavailable("Insurance API circuit is half-open; a recovery probe is in flight")
+                self._probe_in_flight = True
+                self.stats["probes"] += 1
+
+    def cancel(self) -> None:
+        """Forget a call that ended without reaching a verdict on the API's health."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record(self, success: bool) -> None:
+        with self._lock:
+            self._probe_in_flight = False
+            if success:
+                self.state = "closed"
+                self.consecutive_failures = 0
+                return
+            self.consecutive_failures += 1
+            if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.stats["opened"] += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            summary = {
+                **self.stats,
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout_seconds": self.reset_timeout
+            }
+            if self.state == "open":
+                summary["retry_in_seconds"] = round(max(0.0, self.opened_at + self.reset_timeout - time.monotonic()), 1)
+            return summary
+
+class InsuranceAPIClient:
+    """
+    Shared HTTP client for the insurance API.
+
+    Reuses pooled keep-alive connections, applies connect/read timeouts and
+    retries 429/5xx responses and connection failures with exponential
+    backoff and full jitter (honouring Retry-After when the server sends
+    one). Every attempt holds a slot from the concurrency limiter, if one
+    is given. Latency and retry counts are recorded for every request.
+    """
+
+    def __init__(self, connect_timeout: float, read_timeout: float, max_retries: int,
+                 backoff_base: float, backoff_max: float, pool_size: int,
+                 limiter: Optional[AdaptiveConcurrencyLimiter] = None):
+        self.timeout = (connect_timeout, read_timeout)
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.stats = {"requests": 0, "retries": 0, "failures": 0}
+        self.recent = deque(maxlen=100)
+        self._latencies = deque(maxlen=1000)
+        self._lock = threading.Lock()
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response]) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def post_pdf(self, url: str, file_path: str) -> requests.Response:
+        """
+        Upload a PDF, retrying transient failures.
+
+        Returns the final response (which may still be an error status);
+        raises the last connection error if every attempt failed to connect.
+        """
+        started = time.perf_counter()
+        retries = 0
+        response = None
+        error = None
+        try:
+            for attempt in range(self.max_retries + 1):
+                response = None
+                error = None
+                if self.limiter is not None:
+                    self.limiter.acquire()
+                attempt_started = time.perf_counter()
+                overloaded = False
+                body = None
+                try:
+                    # A fresh stream per attempt, since a failed attempt may have consumed it
+                    body = MultipartFileStream(API_KEY, file_path)
+                    response = self.session.post(
+                        url,
+                        data=body,
+                        headers={"Content-Type": body.content_type},
+                        timeout=self.timeout
+                    )
+                    overloaded = response.status_code in RETRYABLE_STATUS_CODES
+                    if not overloaded:
+                        return response
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                    error = e
+                    overloaded = True
+                finally:
+                    if self.limiter is not None:
+                        self.limiter.release(
+                            time.perf_counter() - attempt_started,
+                            overloaded,
+                            len(body) if body is not None else 0
+                        )
+
+                if attempt == self.max_retries:
+                    break
+                retries += 1
+                time.sleep(self._backoff(attempt, response))
+
+            if error is not None:
+                raise error
+            return response
+        finally:
+            latency = time.perf_counter() - started
+            with self._lock:
+                self.stats["requests"] += 1
+                self.stats["retries"] += retries
+                failed = error is not None or response is None or response.status_code >= 400
+                if failed:
+                    self.stats["failures"] += 1
+                self._latencies.append(latency)
+                self.recent.append({
+                    "file": os.path.basename(file_path),
+                    "status_code": response.status_code if response is not None else None,
+                    "latency_seconds": round(latency, 3),
+                    "retries": retries,
+                    "completed_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+                })
+
+    def summary(self) -> Dict[str, Any]:
+        """Request counters, latency percentiles and the most recent requests."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            percentiles = {}
+            if latencies:
+                percentiles = {
+                    "p50_seconds": round(statistics.median(latencies), 3),
+                    "p95_seconds": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+                    "max_seconds": round(latencies[-1], 3)
+                }
+            return {
+                **self.stats,
+                **percentiles,
+                "connect_timeout_seconds": self.timeout[0],
+                "read_timeout_seconds": self.timeout[1],
+                "max_retries": self.max_retries,
+                "recent_requests": list(self.recent)
+            }
+
+concurrency_limiter = AdaptiveConcurrencyLimiter(
+    INSURANCE_INITIAL_CONCURRENCY,
+    INSURANCE_MAX_CONCURRENCY,
+    INSURANCE_LATENCY_TOLERANCE,
+    INSURANCE_QUEUE_TIMEOUT
+)
+circuit_breaker = CircuitBreaker(INSURANCE_BREAKER_FAILURES, INSURANCE_BREAKER_RESET)
+
+api_client = InsuranceAPIClient(
+    INSURANCE_CONNECT_TIMEOUT,
+    INSURANCE_READ_TIMEOUT,
+    INSURANCE_MAX_RETRIES,
+    INSURANCE_BACKOFF_BASE,
+    INSURANCE_BACKOFF_MAX,
+    INSURANCE_POOL_SIZE,
+    limiter=concurrency_limiter
+)
+
 def upload_pdf_to_insurance(file_path: str) -> Dict[str, Any]:
     """
     Upload a PDF file to the insurance API for processing
@@ -31,18 +802,26 @@ def upload_pdf_to_insurance(file_path: str) -> Dict[str, Any]:
         if not file_path.lower().endswith('.pdf'):
             return {"error": "File must be a PDF", "Success": "False"}
         
-        # Prepare the file for upload
-        with open(file_path, 'rb') as pdf_file:
-            files = {
-                API_KEY: (os.path.basename(file_path), pdf_file, 'application/pdf')
-            }
-            
-            # Make POST request to the API
-            response = requests.post(INSURANCE_API_URL, files=files)
-            response.raise_for_status()
-            
-            return response.json()
+        # Fail fast while the API is unhealthy, otherwise go through the
+        # pooled, retrying, concurrency-limited client
+        circuit_breaker.before_call()
+        try:
+            response = api_client.post_pdf(INSURANCE_API_URL, file_path)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            circuit_breaker.record(False)
+            raise
+        except Exception:
+            # Not a verdict on the API's health (e.g. the limiter queue timed out)
+            circuit_breaker.cancel()
+            raise
+        # Client errors (4xx other than 429) mean the API is up but rejected this file
+        circuit_breaker.record(response.status_code not in RETRYABLE_STATUS_CODES)
+        response.raise_for_status()
+        
+        return response.json()
     
+    except InsuranceAPIUnavailable as e:
+        return {"error": str(e), "unavailable": True, "Success": "False"}
     except requests.exceptions.RequestException as e:
         return {
             "error": str(e), 
@@ -52,6 +831,672 @@ def upload_pdf_to_insurance(file_path: str) -> Dict[str, Any]:
     except Exception as e:
         return {"error": str(e), "Success": "False"}
 
+class PdfPreflight:
+    """
+    Cheap local checks run before a PDF reaches the insurance API.
+
+    Empty, oversized, non-PDF and truncated files are rejected without a
+    network call. Identical content that is already being uploaded is not
+    uploaded again: later callers wait for the first upload and share its
+    result. Counters record how many API calls were avoided.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.stats = {
+            "checked": 0,
+            "passed": 0,
+            "rejected_empty": 0,
+            "rejected_too_large": 0,
+            "rejected_not_pdf": 0,
+            "rejected_truncated": 0,
+            "cache_hits": 0,
+            "duplicates_in_flight": 0
+        }
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Dict[str, Any]] = {}
+
+    def count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def check(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Return an error result if the file cannot be a valid PDF, else None."""
+        self.count("checked")
+        size = os.path.getsize(file_path)
+        if size == 0:
+            self.count("rejected_empty")
+            return {"error": f"File is empty: {file_path}", "preflight": "empty", "Success": "False"}
+        if size > self.max_bytes:
+            self.count("rejected_too_large")
+            return {
+                "error": f"File is {size} bytes, over the {self.max_bytes} byte limit: {file_path}",
+                "preflight": "too_large",
+                "Success": "False"
+            }
+
+        with open(file_path, "rb") as f:
+            head = f.read(PREFLIGHT_SCAN_BYTES)
+            f.seek(max(0, size - PREFLIGHT_SCAN_BYTES))
+            tail = f.read(PREFLIGHT_SCAN_BYTES)
+        if b"%PDF-" not in head:
+            self.count("rejected_not_pdf")
+            return {"error": f"File is not a PDF (no %PDF header): {file_path}", "preflight": "not_pdf", "Success": "False"}
+        if b"%%EOF" not in tail:
+            self.count("rejected_truncated")
+            return {
+                "error": f"PDF appears truncated or corrupt (no %%EOF trailer): {file_path}",
+                "preflight": "truncated",
+                "Success": "False"
+            }
+
+        self.count("passed")
+        return None
+
+    def join(self, sha256: str) -> tuple:
+        """
+        Register interest in uploading `sha256`.
+
+        Returns (entry, is_leader). The leader performs the upload and calls
+        `finish`; everyone else waits on the entry and reuses its result.
+        """
+        with self._lock:
+            entry = self._in_flight.get(sha256)
+            if entry is not None:
+                self.stats["duplicates_in_flight"] += 1
+                return entry, False
+            entry = {"done": threading.Event(), "result": None}
+            self._in_flight[sha256] = entry
+            return entry, True
+
+    def finish(self, sha256: str, result: Dict[str, Any]) -> None:
+        with self._lock:
+            entry = self._in_flight.pop(sha256)
+        entry["result"] = result
+        entry["done"].set()
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            rejected = sum(value for key, value in self.stats.items() if key.startswith("rejected_"))
+            return {
+                **self.stats,
+                "rejected": rejected,
+                "api_calls_saved": rejected + self.stats["cache_hits"] + self.stats["duplicates_in_flight"],
+                "max_bytes": self.max_bytes,
+                "in_flight": len(self._in_flight)
+            }
+
+preflight = PdfPreflight(PREFLIGHT_MAX_BYTES)
+
+def extract_certificate(file_path: str) -> Dict[str, Any]:
+    """
+    Return the insurance API extraction for a PDF, uploading it only if it
+    passes preflight and the same content has not been extracted recently
+    or is not already being uploaded.
+    """
+    if not os.path.exists(file_path):
+        return {"error": f"File not found: {file_path}", "Success": "False"}
+    if not file_path.lower().endswith('.pdf'):
+        return {"error": "File must be a PDF", "Success": "False"}
+
+    try:
+        rejection = preflight.check(file_path)
+        if rejection is not None:
+            return rejection
+        sha256 = file_sha256(file_path)
+    except OSError as e:
+        return {"error": str(e), "Success": "False"}
+
+    cached = extraction_cache.get(sha256)
+    if cached is not None:
+        preflight.count("cache_hits")
+        if not certificate_store.contains(sha256):
+            certificate_store.record(sha256, os.path.abspath(file_path), cached)
+        return cached
+
+    entry, is_leader = preflight.join(sha256)
+    if not is_leader:
+        entry["done"].wait()
+        return entry["result"]
+
+    result = {"error": "Extraction did not complete", "Success": "False"}
+    try:
+        result = upload_pdf_to_insurance(file_path)
+        if result.get("Success") == "True":
+            extraction_cache.put(sha256, result, os.path.getsize(file_path))
+            certificate_store.record(sha256, os.path.abspath(file_path), result)
+    finally:
+        preflight.finish(sha256, result)
+    return result
+
+class CertificateJobQueue:
+    """
+    Persistent queue of certificate extractions drained by background workers.
+
+    Jobs live in SQLite, so anything submitted but not finished is picked up
+    again after a restart: on start, jobs left "running" by a previous
+    process are put back in the queue. A failed extraction is retried with
+    backoff until it has used `max_attempts`, unless the failure is one a
+    retry can't fix (a preflight rejection or a 4xx response).
+    """
+
+    def __init__(self, db_path: str, workers: int, max_attempts: int):
+        self.db_path = db_path
+        self.workers = max(1, workers)
+        self.max_attempts = max_attempts
+        self._conn = None
+        self._lock = threading.RLock()
+        self._wakeup = threading.Condition(self._lock)
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    file_path TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    submitted_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    result TEXT,
+                    error TEXT,
+                    deferrals INTEGER NOT NULL DEFAULT 0,
+                    retry_at REAL
+                )
+                """
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            if "deferrals" not in columns:
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN deferrals INTEGER NOT NULL DEFAULT 0")
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN retry_at REAL")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, submitted_at)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def start(self) -> None:
+        """Recover interrupted jobs and start the worker threads (idempotent)."""
+        with self._lock:
+            if self._threads:
+                return
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE jobs SET status = 'failed', finished_at = ?, "
+                    "error = 'Interrupted too many times' "
+                    "WHERE status = 'running' AND attempts >= ?",
+                    (time.time(), self.max_attempts)
+                )
+                self.conn.execute("UPDATE jobs SET status = 'queued' WHERE status = 'running'")
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"certificate-job-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, file_path: str) -> str:
+        """Queue a PDF for extraction and return its job ID."""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO jobs (id, file_path, status, submitted_at) VALUES (?, ?, 'queued', ?)",
+                    (job_id, file_path, time.time())
+                )
+            self._wakeup.notify()
+        self.start()
+        return job_id
+
+    def _claim(self) -> Optional[tuple]:
+        with self._lock, self.conn:
+            row = self.conn.execute(
+                "SELECT id, file_path FROM jobs WHERE status = 'queued' AND (retry_at IS NULL OR retry_at <= ?) "
+                "ORDER BY submitted_at LIMIT 1",
+                (time.time(),)
+            ).fetchone()
+            if row is not None:
+                self.conn.execute(
+                    "UPDATE jobs SET status = 'running', started_at = ?, attempts = attempts + 1 WHERE id = ?",
+                    (time.time(), row[0])
+                )
+            return row
+
+    def _defer(self, job_id: str, error: str, count_attempt: bool = False) -> None:
+        """
+        Put a job back in the queue with a backed-off retry time.
+
+        The attempt is only counted if it reached the API (`count_attempt`).
+        """
+        with self._lock, self.conn:
+            deferrals = self.conn.execute("SELECT deferrals FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+            delay = min(JOB_RETRY_MAX_DELAY, JOB_RETRY_DELAY * 2 ** deferrals)
+            self.conn.execute(
+                "UPDATE jobs SET status = 'queued', attempts = attempts - ?, deferrals = deferrals + 1, "
+                "retry_at = ?, error = ? WHERE id = ?",
+                (0 if count_attempt else 1, time.time() + random.uniform(0.5, 1.0) * delay, error, job_id)
+            )
+
+    @staticmethod
+    def _retryable(result: Dict[str, Any]) -> bool:
+        """Whether a failed extraction might succeed if tried again."""
+        if result.get("preflight"):
+            return False
+        status_code = result.get("status_code")
+        return status_code is None or status_code in RETRYABLE_STATUS_CODES
+
+    def _finish(self, job_id: str, result: Dict[str, Any]) -> None:
+        if result.get("unavailable"):
+            # The circuit breaker is open: the API is down, not the file, so try again later
+            self._defer(job_id, result.get("error", "Insurance API unavailable"))
+            return
+        success = result.get("Success") == "True"
+        error = None if success else result.get("error", "Failed to process PDF")
+        with self._lock, self.conn:
+            if not success and self._retryable(result):
+                attempts = self.conn.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+                if attempts < self.max_attempts:
+                    self._defer(job_id, error, count_attempt=True)
+                    return
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = ? WHERE id = ?",
+                (
+                    "succeeded" if success else "failed",
+                    time.time(),
+                    json.dumps(result),
+                    error,
+                    job_id
+                )
+            )
+
+    def _work(self) -> None:
+        while True:
+            job = self._claim()
+            if job is None:
+                with self._wakeup:
+                    # The timeout also picks up jobs queued by another process sharing the database
+                    timeout = 5.0
+                    next_retry = self.conn.execute(
+                        "SELECT MIN(retry_at) FROM jobs WHERE status = 'queued'"
+                    ).fetchone()[0]
+                    if next_retry is not None:
+                        timeout = min(timeout, max(0.05, next_retry - time.time()))
+                    self._wakeup.wait(timeout=timeout)
+                continue
+            job_id, file_path = job
+            try:
+                result = extract_certificate(file_path)
+            except Exception as e:
+                result = {"error": str(e), "Success": "False"}
+            self._finish(job_id, result)
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row, include_result: bool) -> Dict[str, Any]:
+        job = {
+            "job_id": row["id"],
+            "file_path": row["file_path"],
+            "status": row["status"],
+            "attempts": row["attempts"],
+            "submitted_at": datetime.fromtimestamp(row["submitted_at"]).isoformat(),
+            "started_at": datetime.fromtimestamp(row["started_at"]).isoformat() if row["started_at"] else None,
+            "finished_at": datetime.fromtimestamp(row["finished_at"]).isoformat() if row["finished_at"] else None,
+            "error": row["error"]
+        }
+        if row["status"] == "queued" and row["retry_at"]:
+            job["deferrals"] = row["deferrals"]
+            job["retry_at"] = datetime.fromtimestamp(row["retry_at"]).isoformat()
+        if row["started_at"] and row["finished_at"]:
+            job["seconds"] = round(row["finished_at"] - row["started_at"], 3)
+        if include_result:
+            job["result"] = json.loads(row["result"]) if row["result"] else None
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job with its extraction result, or None if unknown."""
+        with self._lock:
+            cursor = self.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+            cursor.row_factory = sqlite3.Row
+            row = cursor.fetchone()
+        return self._row_to_job(row, include_result=True) if row else None
+
+    def list(self, status: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        """Most recently submitted jobs, optionally filtered by status."""
+        query = "SELECT * FROM jobs"
+        params: list = []
+        if status:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY submitted_at DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            cursor = self.conn.execute(query, params)
+            cursor.row_factory = sqlite3.Row
+            rows = cursor.fetchall()
+        return [self._row_to_job(row, include_result=False) for row in rows]
+
+    def statuses(self, job_ids: List[str]) -> Dict[str, str]:
+        """Current status of each of the given jobs; unknown IDs are left out."""
+        statuses = {}
+        with self._lock:
+            for start in range(0, len(job_ids), 500):
+                chunk = job_ids[start:start + 500]
+                statuses.update(self.conn.execute(
+                    f"SELECT id, status FROM jobs WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+                ).fetchall())
+        return statuses
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs in each status."""
+        with self._lock:
+            rows = self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in JOB_STATUSES}
+        counts.update(dict(rows))
+        return counts
+
+job_queue = CertificateJobQueue(JOB_QUEUE_PATH, JOB_WORKERS, JOB_MAX_ATTEMPTS)
+
+class InboxEventHandler(FileSystemEventHandler):
+    """Forwards watchdog events for the inbox to the watcher."""
+
+    def __init__(self, watcher: "InboxWatcher"):
+        self.watcher = watcher
+
+    def on_any_event(self, event) -> None:
+        if event.is_directory:
+            return
+        for path in (getattr(event, "src_path", None), getattr(event, "dest_path", None)):
+            if path:
+                self.watcher.notify(os.fsdecode(path))
+
+class InboxWatcher:
+    """
+    Watches an inbox directory and queues new PDFs for extraction.
+
+    Uses watchdog notifications when the package is installed and polls
+    the directory otherwise. A file is picked up only once its size and
+    mtime have stopped changing for `settle_seconds`, so partially written
+    files are not uploaded. Files are submitted to the job queue and
+    recorded in a persisted checkpoint keyed by path, size and mtime, which
+    marks them done once their job succeeds, or failed once the job queue
+    has given up retrying it. After a restart, done files are skipped,
+    files whose job is still queued are left to the job queue, and files
+    whose job failed or was lost are submitted again. A file that is
+    replaced with new content is processed again.
+    """
+
+    def __init__(self, inbox_dir: str, checkpoint_path: str, poll_interval: float, settle_seconds: float):
+        self.inbox_dir = os.path.abspath(inbox_dir) if inbox_dir else ""
+        self.checkpoint_path = checkpoint_path
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        self.mode = None
+        self.stats = {"scans": 0, "submitted": 0, "completed": 0, "failed": 0}
+        self._conn = None
+        self._lock = threading.RLock()
+        self._wakeup = threading.Event()
+        self._dirty: set = set()
+        # path -> (size, mtime_ns, monotonic time the file was first seen with that size and mtime)
+        self._pending: Dict[str, tuple] = {}
+        self._processed: Dict[str, tuple] = {}
+        # path -> job ID for submitted files whose job hasn't finished
+        self._in_flight: Dict[str, str] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._observer = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.checkpoint_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.checkpoint_path, check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS inbox_files (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    job_id TEXT NOT NULL,
+                    submitted_at REAL NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'submitted',
+                    finished_at REAL
+                )
+                """
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(inbox_files)")}
+            if "status" not in columns:
+                # Rows from before completion tracking are checked against the job queue on start
+                self._conn.execute("ALTER TABLE inbox_files ADD COLUMN status TEXT NOT NULL DEFAULT 'submitted'")
+                self._conn.execute("ALTER TABLE inbox_files ADD COLUMN finished_at REAL")
+            self._conn.commit()
+        return self._conn
+
+    def start(self) -> bool:
+        """Start watching; returns False if no inbox directory is configured."""
+        with self._lock:
+            if not self.inbox_dir:
+                return False
+            if self._thread is not None:
+                return True
+            os.makedirs(self.inbox_dir, exist_ok=True)
+            self.load_checkpoint()
+            self.mode = "polling"
+            if Observer is not None:
+                try:
+                    self._observer = Observer()
+                    self._observer.schedule(InboxEventHandler(self), self.inbox_dir, recursive=False)
+                    self._observer.daemon = True
+                    self._observer.start()
+                    self.mode = "watchdog"
+                except OSError as e:
+                    print(f"Inbox notifications unavailable, polling instead: {e}", file=sys.stderr)
+                    self._observer = None
+            self._thread = threading.Thread(target=self._run, name="certificate-inbox", daemon=True)
+            self._thread.start()
+            return True
+
+    def load_checkpoint(self) -> None:
+        """Restore processed and in-flight files from the checkpoint left by a previous run."""
+        with self._lock:
+            self._processed = {}
+            self._in_flight = {}
+            for path, size, mtime_ns, job_id, status in self.conn.execute(
+                "SELECT path, size, mtime_ns, job_id, status FROM inbox_files"
+            ):
+                if status == "failed":
+                    # Not processed: eligible for another round of attempts
+                    continue
+                self._processed[path] = (size, mtime_ns)
+                if status != "done":
+                    self._in_flight[path] = job_id
+            self._check_jobs()
+
+    def notify(self, path: str) -> None:
+        with self._lock:
+            self._dirty.add(os.path.abspath(path))
+        self._wakeup.set()
+
+    def _candidates(self, full_scan: bool) -> List[str]:
+        with self._lock:
+            dirty = self._dirty
+            self._dirty = set()
+        if full_scan:
+            with os.scandir(self.inbox_dir) as entries:
+                return [entry.path for entry in entries]
+        # With notifications, only touched and still-settling files need a look
+        return list(dirty | set(self._pending))
+
+    def _check_jobs(self) -> None:
+        """
+        Mark files done or failed once their job finishes, and forget files
+        whose job was lost.
+
+        A job only fails once the job queue has run out of retries. Failed
+        files are submitted again after a restart or when their content
+        changes.
+        """
+        if not self._in_flight:
+            return
+        statuses = job_queue.statuses(list(self._in_flight.values()))
+        finished, failed, lost = [], [], []
+        for path, job_id in list(self._in_flight.items()):
+            status = statuses.get(job_id)
+            if status == "succeeded":
+                finished.append(path)
+            elif status == "failed":
+                failed.append(path)
+            elif status is None:
+                lost.append(path)
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "UPDATE inbox_files SET status = ?, finished_at = ? WHERE path = ?",
+                [("done", now, path) for path in finished] + [("failed", now, path) for path in failed]
+            )
+            self.conn.executemany("DELETE FROM inbox_files WHERE path = ?", [(path,) for path in lost])
+        for path in finished + failed:
+            del self._in_flight[path]
+        for path in lost:
+            # Picked up again by the next full scan
+            del self._in_flight[path]
+            self._processed.pop(path, None)
+        self.stats["completed"] += len(finished)
+        self.stats["failed"] += len(failed)
+
+    def scan(self, full_scan: bool = True) -> int:
+        """Check candidate files and submit the settled ones; returns how many were submitted."""
+        self.stats["scans"] += 1
+        self._check_jobs()
+        now = time.monotonic()
+        submitted = 0
+        for path in self._candidates(full_scan):
+            if not path.lower().endswith(".pdf"):
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # Deleted or renamed before it settled
+                self._pending.pop(path, None)
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if self._processed.get(path) == signature:
+                self._pending.pop(path, None)
+                continue
+
+            pending = self._pending.get(path)
+            if pending is None or pending[:2] != signature:
+                self._pending[path] = (*signature, now)
+                continue
+            if now - pending[2] < self.settle_seconds:
+                continue
+
+            del self._pending[path]
+            job_id = job_queue.submit(path)
+            with self._lock, self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO inbox_files (path, size, mtime_ns, job_id, submitted_at, status) "
+                    "VALUES (?, ?, ?, ?, ?, 'submitted')",
+                    (path, signature[0], signature[1], job_id, time.time())
+                )
+            self._processed[path] = signature
+            self._in_flight[path] = job_id
+            self.stats["submitted"] += 1
+            submitted += 1
+        return submitted
+
+    def _run(self) -> None:
+        next_full_scan = 0.0
+        while True:
+            # Cleared before scanning, so a notification that arrives mid-scan triggers another one
+            self._wakeup.clear()
+            now = time.monotonic()
+            # Polling rescans the directory every interval; with notifications
+            # a full rescan only runs once a minute, in case an event was missed
+            full_scan = self.mode != "watchdog" or now >= next_full_scan
+            if full_scan:
+                next_full_scan = now + (60.0 if self.mode == "watchdog" else 0.0)
+            try:
+                self.scan(full_scan)
+            except OSError as e:
+                print(f"Inbox scan failed: {e}", file=sys.stderr)
+
+            timeout = self.poll_interval
+            if self._pending:
+                timeout = min(timeout, self.settle_seconds)
+            if self.mode == "watchdog" and not self._pending:
+                timeout = max(0.0, next_full_scan - time.monotonic())
+            if self._in_flight:
+                timeout = min(timeout, self.poll_interval)
+            self._wakeup.wait(timeout)
+
+    def summary(self, recent: int = 20) -> Dict[str, Any]:
+        if not self.inbox_dir:
+            return {"enabled": False, "hint": "Set INSURANCE_INBOX_DIR to enable watch-folder ingestion"}
+        with self._lock:
+            processed = self.conn.execute("SELECT COUNT(*) FROM inbox_files WHERE status = 'done'").fetchone()[0]
+            failed = self.conn.execute("SELECT COUNT(*) FROM inbox_files WHERE status = 'failed'").fetchone()[0]
+            rows = self.conn.execute(
+                "SELECT path, job_id FROM inbox_files ORDER BY submitted_at DESC LIMIT ?", (recent,)
+            ).fetchall()
+        recent_files = []
+        for path, job_id in rows:
+            job = job_queue.get(job_id)
+            recent_files.append({
+                "file": path,
+                "job_id": job_id,
+                "status": job["status"] if job else "unknown",
+                "error": job["error"] if job else None
+            })
+        return {
+            "enabled": True,
+            "inbox_dir": self.inbox_dir,
+            "mode": self.mode or "stopped",
+            "poll_interval_seconds": self.poll_interval,
+            "settle_seconds": self.settle_seconds,
+            "files_processed": processed,
+            "files_failed": failed,
+            "files_settling": len(self._pending),
+            "files_in_flight": len(self._in_flight),
+            **self.stats,
+            "recent_files": recent_files
+        }
+
+inbox_watcher = InboxWatcher(INBOX_DIR, INBOX_CHECKPOINT_PATH, INBOX_POLL_INTERVAL, INBOX_SETTLE_SECONDS)
+
+def certificate_page_ranges(reader: "PdfReader", pages_per_certificate: Optional[int]) -> tuple:
+    """
+    Work out where each certificate in a packet starts and ends.
+
+    Returns (ranges, method), where ranges are 0-based inclusive (first, last)
+    page pairs. With an explicit `pages_per_certificate` the packet is cut
+    into fixed-size groups. Otherwise a new certificate starts on every page
+    whose text carries an ACORD certificate title. Scanned packets with no
+    extractable text fall back to one certificate per page.
+    """
+    page_count = len(reader.pages)
+    if pages_per_certificate:
+        step = max(1, pages_per_certificate)
+        return [(first, min(first + step, page_count) - 1) for first in range(0, page_count, step)], "fixed"
+
+    starts = []
+    for index, page in enumerate(reader.pages):
+        try:
+            text = " ".join((page.extract_text() or "").upper().split())
+        except Exception:
+            text = ""
+        if any(marker in text for marker in CERTIFICATE_START_MARKERS):
+            starts.append(index)
+    if not starts:
+        return [(index, index) for index in range(page_count)], "single_page"
+
+    # Pages before the first title page (e.g. a cover letter) belong to the first certificate
+    starts[0] = 0
+    ends = [start - 1 for start in starts[1:]] + [page_count - 1]
+    return list(zip(starts, ends)), "acord_title"
+
 @mcp.tool()
 def process_insurance_certificate(file_path: str) -> Dict[str, Any]:
     """
@@ -70,7 +1515,7 @@ def process_insurance_certificate(file_path: str) -> Dict[str, Any]:
         - Description of operation
         - Success status
     """
-    result = upload_pdf_to_insurance(file_path)
+    result = extract_certificate(file_path)
     return result
 
 @mcp.tool()
@@ -84,7 +1529,7 @@ def get_certificate_holder_info(file_path: str) -> Dict[str, Any]:
     Returns:
         Certificate holder information (name, address, city, state, zip code)
     """
-    result = upload_pdf_to_insurance(file_path)
+    result = extract_certificate(file_path)
     if result.get("Success") == "True":
         return result.get("CertificateHolder", {})
     else:
@@ -101,7 +1546,7 @@ def get_coverage_details(file_path: str) -> List[Dict[str, Any]]:
     Returns:
         List of coverage details including limits, policy info, and endorsements
     """
-    result = upload_pdf_to_insurance(file_path)
+    result = extract_certificate(file_path)
     if result.get("Success") == "True":
         return result.get("Coverages", [])
     else:
@@ -118,7 +1563,7 @@ def get_insured_information(file_path: str) -> Dict[str, Any]:
     Returns:
         Insured party information (name, address, city, state, zip code, phone)
     """
-    result = upload_pdf_to_insurance(file_path)
+    result = extract_certificate(file_path)
     if result.get("Success") == "True":
         return result.get("Insured", {})
     else:
@@ -135,7 +1580,7 @@ def get_producer_information(file_path: str) -> Dict[str, Any]:
     Returns:
         Producer information (name, address, phone, email, fax)
     """
-    result = upload_pdf_to_insurance(file_path)
+    result = extract_certificate(file_path)
     if result.get("Success") == "True":
         return result.get("Producer", {})
     else:
@@ -152,7 +1597,7 @@ def validate_certificate_signature(file_path: str) -> Dict[str, Any]:
     Returns:
         Information about certificate signature status
     """
-    result = upload_pdf_to_insurance(file_path)
+    result = extract_certificate(file_path)
     if result.get("Success") == "True":
         return {
             "signed": result.get("Signed", "No"),
@@ -162,5 +1607,350 @@ def validate_certificate_signature(file_path: str) -> Dict[str, Any]:
     else:
         return {"error": result.get("error", "Failed to process PDF")}
 
+@mcp.resource("insurance://cache")
+def get_extraction_cache_stats() -> str:
+    """
+    Report extraction cache statistics: how many extractions were served
+    without an upload since the server started and how many PDF bytes that
+    spared the API, plus how many certificates the cache holds.
+    """
+    return json.dumps(extraction_cache.summary(), indent=2)
+
+@mcp.tool()
+def process_certificate_directory(path: str, concurrency: int = 4, output_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Process every insurance certificate PDF in a directory concurrently
+    
+    Args:
+        path: Absolute path to a directory containing PDF files
+        concurrency: Number of PDFs uploaded in parallel (default: 4, max: 16)
+        output_path: JSONL file to write results to (default: a new file under data/insurance/batches)
+    
+    Returns:
+        Summary with throughput, failures, per-file latency and the path of
+        the JSONL output, which holds one extraction result per line
+    """
+    if not os.path.isdir(path):
+        return {"error": f"Directory not found: {path}", "Success": "False"}
+
+    pdf_files = sorted(
+        os.path.join(path, name) for name in os.listdir(path)
+        if name.lower().endswith('.pdf') and os.path.isfile(os.path.join(path, name))
+    )
+
+    if output_path is None:
+        batch_name = os.path.basename(os.path.normpath(path)) or "batch"
+        output_path = os.path.join(BATCH_OUTPUT_DIR, f"{batch_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl")
+
+    # Fail before any upload if the results have nowhere to go
+    try:
+        if os.path.dirname(output_path):
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        output_file = open(output_path, "w")
+    except OSError as e:
+        return {"error": f"Cannot write results to {output_path}: {e}", "Success": "False"}
+
+    def process_one(file_path: str) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            result = extract_certificate(file_path)
+        except Exception as e:
+            # One file's failure is reported in its own entry instead of aborting the batch
+            result = {"error": str(e), "Success": "False"}
+        return {"file": file_path, "result": result, "seconds": time.perf_counter() - started}
+
+    latencies = []
+    failures = []
+    succeeded = 0
+    started = time.perf_counter()
+    workers = max(1, min(concurrency, MAX_DIRECTORY_CONCURRENCY, INSURANCE_POOL_SIZE))
+    with output_file, ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(process_one, file_path) for file_path in pdf_files]
+        # Results are written as each upload finishes, so partial output survives an interruption
+        for future in as_completed(futures):
+            outcome = future.result()
+            output_file.write(json.dumps(outcome) + "\n")
+            output_file.flush()
+
+            success = outcome["result"].get("Success") == "True"
+            latencies.append({
+                "file": os.path.basename(outcome["file"]),
+                "seconds": round(outcome["seconds"], 3),
+                "success": success
+            })
+            if success:
+                succeeded += 1
+            else:
+                failures.append({
+                    "file": outcome["file"],
+                    "error": outcome["result"].get("error", "Failed to process PDF")
+                })
+
+    elapsed = time.perf_counter() - started
+    seconds = sorted(entry["seconds"] for entry in latencies)
+    return {
+        "directory": path,
+        "output_path": output_path,
+        "files_found": len(pdf_files),
+        "succeeded": succeeded,
+        "failed": len(failures),
+        "failures": failures,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_files_per_second": round(len(pdf_files) / elapsed, 3) if elapsed > 0 else 0.0,
+        "latency_p50_seconds": round(statistics.median(seconds), 3) if seconds else None,
+        "latency_max_seconds": seconds[-1] if seconds else None,
+        "file_latencies": latencies,
+        "concurrency": workers
+    }
+
+@mcp.tool()
+def process_certificate_packet(file_path: str, pages_per_certificate: Optional[int] = None,
+                               concurrency: int = 4) -> Dict[str, Any]:
+    """
+    Split a PDF holding several certificates and process each one concurrently
+    
+    Args:
+        file_path: Absolute path to the packet PDF
+        pages_per_certificate: Fixed number of pages per certificate; by default
+            certificates are found from ACORD certificate titles in the page text
+        concurrency: Number of certificates uploaded in parallel (default: 4, max: 16)
+    
+    Returns:
+        One result per certificate with its page range (1-based), the split
+        file and the extraction result, plus the split method and timing
+    """
+    if PdfReader is None:
+        return {"error": "Splitting packets requires pypdf. Install it with: pip install pypdf", "Success": "False"}
+    if not os.path.exists(file_path):
+        return {"error": f"File not found: {file_path}", "Success": "False"}
+    if not file_path.lower().endswith('.pdf'):
+        return {"error": "File must be a PDF", "Success": "False"}
+
+    started = time.perf_counter()
+    try:
+        rejection = preflight.check(file_path)
+        if rejection is not None:
+            return rejection
+        reader = PdfReader(file_path)
+        ranges, method = certificate_page_ranges(reader, pages_per_certificate)
+
+        # Parts are named by packet content, so re-running a packet reuses its files
+        output_dir = os.path.join(PACKET_OUTPUT_DIR, file_sha256(file_path)[:16])
+        os.makedirs(output_dir, exist_ok=True)
+    except Exception as e:
+        return {"error": f"Could not split packet: {e}", "Success": "False"}
+    detect_seconds = time.perf_counter() - started
+
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    parts = [
+        {
+            "certificate": number,
+            "pages": [first + 1, last + 1],
+            "file": os.path.join(output_dir, f"{stem}_{number:03d}_p{first + 1}-{last + 1}.pdf")
+        }
+        for number, (first, last) in enumerate(ranges, start=1)
+    ]
+    workers = max(1, min(concurrency, MAX_DIRECTORY_CONCURRENCY, INSURANCE_POOL_SIZE))
+    local = threading.local()
+
+    def split_and_extract(part: Dict[str, Any]) -> Dict[str, Any]:
+        # Each worker writes its own part, so the first uploads start while later parts are still being cut
+        try:
+            if not os.path.exists(part["file"]):
+                if getattr(local, "reader", None) is None:
+                    # A PdfReader shares one file handle, so each worker thread parses its own
+                    local.reader = PdfReader(file_path)
+                writer = PdfWriter()
+                for index in range(part["pages"][0] - 1, part["pages"][1]):
+                    writer.add_page(local.reader.pages[index])
+                tmp_path = f"{part['file']}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as part_file:
+                    writer.write(part_file)
+                os.replace(tmp_path, part["file"])
+        except Exception as e:
+            return {"error": f"Could not split pages {part['pages'][0]}-{part['pages'][1]}: {e}", "Success": "False"}
+        return extract_certificate(part["file"])
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for part, result in zip(parts, executor.map(split_and_extract, parts)):
+            part["result"] = result
+
+    succeeded = sum(1 for part in parts if part["result"].get("Success") == "True")
+    return {
+        "packet": file_path,
+        "page_count": len(reader.pages),
+        "split_method": method,
+        "certificates_found": len(parts),
+        "succeeded": succeeded,
+        "failed": len(parts) - succeeded,
+        "detect_seconds": round(detect_seconds, 3),
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+        "concurrency": workers,
+        "certificates": parts,
+        "Success": "True" if parts and succeeded == len(parts) else "False"
+    }
+
+@mcp.resource("insurance://preflight")
+def get_preflight_stats() -> str:
+    """
+    Report local preflight statistics for the current server process.
+
+    Includes rejections by reason, extraction cache hits, duplicate uploads
+    joined while in flight, and the total API calls saved.
+    """
+    return json.dumps(preflight.summary(), indent=2)
+
+@mcp.resource("insurance://inbox")
+def get_inbox_status() -> str:
+    """
+    Report watch-folder ingestion status.
+
+    Shows whether the inbox is enabled, the watch mode, how many files have
+    been processed or are still settling, and the job status of the most
+    recently submitted files.
+    """
+    return json.dumps(inbox_watcher.summary(), indent=2)
+
+@mcp.resource("insurance://health")
+def get_api_health() -> str:
+    """
+    Report the adaptive concurrency limiter and circuit breaker state.
+
+    Shows the current concurrency limit, requests in flight, baseline
+    seconds per MB uploaded, and the breaker state with its failure count
+    and time until the next recovery probe.
+    """
+    return json.dumps({
+        "concurrency_limiter": concurrency_limiter.summary(),
+        "circuit_breaker": circuit_breaker.summary()
+    }, indent=2)
+
+@mcp.resource("insurance://http")
+def get_http_stats() -> str:
+    """
+    Report insurance API client statistics.
+
+    Includes request, retry and failure counts, latency percentiles and
+    the latency and retry count of the most recent requests.
+    """
+    return json.dumps(api_client.summary(), indent=2)
+
+@mcp.tool()
+def submit_certificate(file_path: str) -> Dict[str, Any]:
+    """
+    Queue an insurance certificate PDF for extraction in the background
+    
+    Args:
+        file_path: Absolute path to the PDF file to process
+    
+    Returns:
+        The job ID to pass to get_certificate_job, returned immediately
+        without waiting for the extraction
+    """
+    if not os.path.exists(file_path):
+        return {"error": f"File not found: {file_path}", "Success": "False"}
+    if not file_path.lower().endswith('.pdf'):
+        return {"error": "File must be a PDF", "Success": "False"}
+
+    file_path = os.path.abspath(file_path)
+    job_id = job_queue.submit(file_path)
+    return {"job_id": job_id, "status": "queued", "file_path": file_path}
+
+@mcp.tool()
+def get_certificate_job(job_id: str) -> Dict[str, Any]:
+    """
+    Get the status of a queued certificate extraction
+    
+    Args:
+        job_id: ID returned by submit_certificate
+    
+    Returns:
+        Job status (queued, running, succeeded or failed), timings, and the
+        full extraction result once the job has finished
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        return {"error": f"Job not found: {job_id}", "Success": "False"}
+    return job
+
+@mcp.tool()
+def list_jobs(status: Optional[str] = None, limit: int = 50) -> Dict[str, Any]:
+    """
+    List background certificate extraction jobs, newest first
+    
+    Args:
+        status: Only return jobs with this status (queued, running, succeeded or failed)
+        limit: Maximum number of jobs to return (default: 50)
+    
+    Returns:
+        Job counts by status and the matching jobs without their extraction results
+    """
+    if status is not None and status not in JOB_STATUSES:
+        return {"error": f"Unknown status: {status}. Expected one of: {', '.join(JOB_STATUSES)}"}
+
+    return {
+        "counts": job_queue.counts(),
+        "jobs": job_queue.list(status, max(1, min(limit, 500)))
+    }
+
+@mcp.tool()
+def find_expiring_coverages(days: int = 30, coverage_type: Optional[str] = None,
+                            include_expired: bool = False, limit: int = 100) -> Dict[str, Any]:
+    """
+    Find policies on previously extracted certificates that expire soon
+    
+    Args:
+        days: Look-ahead window in days from today (default: 30)
+        coverage_type: Only coverages whose type contains this text, e.g. "General Liability"
+        include_expired: Also return coverages that have already expired (default: False)
+        limit: Maximum number of coverages to return (default: 100)
+    
+    Returns:
+        Coverages ordered by expiration date, each with the insured, policy
+        number, insurer, dates, days left and the source PDF
+    """
+    today = datetime.now().date()
+    until = date.fromordinal(today.toordinal() + max(0, days)).isoformat()
+    coverages = certificate_store.expiring(
+        until,
+        None if include_expired else today.isoformat(),
+        coverage_type,
+        max(1, min(limit, 1000))
+    )
+    for coverage in coverages:
+        coverage["days_left"] = (date.fromisoformat(coverage["expiration_date"]) - today).days
+    return {"as_of": today.isoformat(), "until": until, "count": len(coverages), "coverages": coverages}
+
+@mcp.tool()
+def find_certificates(insured_name: Optional[str] = None, classification: Optional[str] = None,
+                      signed: Optional[bool] = None, limit: int = 100) -> Dict[str, Any]:
+    """
+    Search previously extracted certificates without re-uploading them
+    
+    Args:
+        insured_name: Insured name prefix, case-insensitive
+        classification: Exact document classification, e.g. "COI"
+        signed: True for signed certificates only, False for unsigned only
+        limit: Maximum number of certificates to return (default: 100)
+    
+    Returns:
+        Matching certificates with insured, producer and holder names,
+        classification, signature status and the source PDF
+    """
+    certificates = certificate_store.find(insured_name, classification, signed, max(1, min(limit, 1000)))
+    return {"count": len(certificates), "certificates": certificates}
+
+@mcp.resource("insurance://certificates")
+def get_certificate_store_stats() -> str:
+    """
+    Report what the certificate store holds: certificate and coverage
+    counts, unsigned certificates and counts per classification.
+    """
+    return json.dumps(certificate_store.summary(), indent=2)
+
 if __name__ == "__main__":
+    # Resume jobs left queued or interrupted by a previous run
+    job_queue.start()
+    if inbox_watcher.start():
+        print(f"Watching {inbox_watcher.inbox_dir} for certificates ({inbox_watcher.mode})", file=sys.stderr)
     mcp.run(transport='stdio') 
\ No newline at end of file
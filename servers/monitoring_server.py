@@ -2,23 +2,665 @@
 Real-time Monitoring & Alerts MCP Server
 Monitor websites, job postings, research, and send intelligent alerts
 """
+import asyncio
+import heapq
 import json
 import hashlib
+import math
+import mmap
+import os
+import random
+import re
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
+from urllib.parse import urlparse
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
 from mcp.server.fastmcp import FastMCP
+from dotenv import load_dotenv
 
-mcp = FastMCP("monitoring-alerts")
+# Load environment variables
+load_dotenv()
+
+@asynccontextmanager
+async def scheduler_lifespan(server: FastMCP):
+    """Run the due-time scheduler for as long as the server is up."""
+    if MONITORING_SCHEDULER_ENABLED:
+        scheduler.start()
+    try:
+        yield {}
+    finally:
+        await scheduler.stop()
+
+mcp = FastMCP("monitoring-alerts", lifespan=scheduler_lifespan)
+
+# Local storage for the monitoring server (one level up from servers/)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MONITORING_DATA_DIR = os.path.join(PROJECT_ROOT, "data", "monitoring")
+MONITORING_DB_PATH = os.getenv("MONITORING_DB_PATH", os.path.join(MONITORING_DATA_DIR, "monitoring.db"))
+
+# Alert history is pruned to whichever of these limits is reached first
+ALERT_RETENTION_DAYS = int(os.getenv("MONITORING_ALERT_RETENTION_DAYS", "30"))
+ALERT_MAX_ROWS = int(os.getenv("MONITORING_ALERT_MAX_ROWS", "100000"))
+
+# Findings already reported, so each item alerts a monitor only once
+SEEN_BLOOM_PATH = os.path.join(os.path.dirname(MONITORING_DB_PATH), "seen_items.bloom")
+SEEN_ERROR_RATE = float(os.getenv("MONITORING_SEEN_ERROR_RATE", "0.01"))
+SEEN_MAX_ROWS = int(os.getenv("MONITORING_SEEN_MAX_ROWS", "5000000"))
+SEEN_CACHE_SIZE = 10000
+# Rebuild the Bloom filter from the table once this fraction of its capacity has been pruned
+SEEN_REBUILD_FRACTION = 0.1
+# Fields that identify an item; when none are present, its text fields are hashed instead
+ITEM_ID_FIELDS = ("url", "link", "id", "arxiv_id", "doi")
+
+# Fetching monitors' own JSON feeds: a global cap on concurrent fetches, a
+# token bucket per host, and a hard time limit on each fetch
+FEED_MAX_CONCURRENCY = int(os.getenv("MONITORING_MAX_CONCURRENT_FETCHES", "8"))
+FEED_HOST_RATE = float(os.getenv("MONITORING_HOST_RATE", "1.0"))
+FEED_HOST_BURST = int(os.getenv("MONITORING_HOST_BURST", "3"))
+FEED_TIMEOUT = float(os.getenv("MONITORING_CHECK_TIMEOUT", "10"))
+FEED_MAX_BYTES = int(os.getenv("MONITORING_FEED_MAX_BYTES", str(5 * 1024 * 1024)))
+# Keys a feed may wrap its item list in
+FEED_ITEM_KEYS = ("items", "entries", "results", "jobs", "articles")
+
+# Background scheduler that runs each monitor when it is due
+MONITORING_SCHEDULER_ENABLED = os.getenv("MONITORING_SCHEDULER", "true").lower() not in ("0", "false", "no")
+# Each interval is stretched or shrunk by up to this fraction so monitors don't fire in lockstep
+SCHEDULE_JITTER = float(os.getenv("MONITORING_SCHEDULE_JITTER", "0.1"))
+CHECK_FREQUENCIES = {
+    "hourly": 60 * 60,
+    "daily": 24 * 60 * 60,
+    "weekly": 7 * 24 * 60 * 60,
+    "monthly": 30 * 24 * 60 * 60
+}
+FREQUENCY_UNITS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+DEFAULT_CHECK_FREQUENCY = "daily"
+# Monitors whose scheduled check failed are retried after this delay, doubling per
+# consecutive failed run up to the cap
+SCHEDULE_RETRY_DELAY = 60
+SCHEDULE_RETRY_MAX_DELAY = 60 * 60
+
+# Columns kept outside the JSON config so they can be indexed and updated in place
+MONITOR_COLUMNS = ("monitor_id", "type", "alert_contact", "active", "check_frequency", "created_at",
+                   "last_checked", "next_check")
+
+def frequency_seconds(check_frequency: str) -> float:
+    """Interval for a check frequency: hourly, daily, weekly, monthly or e.g. "15m", "6h", "2d"."""
+    value = (check_frequency or DEFAULT_CHECK_FREQUENCY).strip().lower()
+    if value in CHECK_FREQUENCIES:
+        return CHECK_FREQUENCIES[value]
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([smhd])", value)
+    if not match:
+        raise ValueError(
+            f"Unknown check frequency: {check_frequency}. "
+            f"Use {', '.join(CHECK_FREQUENCIES)} or a number with s/m/h/d, e.g. 30m"
+        )
+    return max(1.0, float(match.group(1)) * FREQUENCY_UNITS[match.group(2)])
+
+def resolve_check_frequency(check_frequency: str) -> tuple:
+    """
+    Return (check_frequency, warning). A frequency that can't be parsed falls
+    back to DEFAULT_CHECK_FREQUENCY with a warning instead of failing, since
+    earlier versions stored any value they were given.
+    """
+    try:
+        frequency_seconds(check_frequency)
+    except ValueError as e:
+        return DEFAULT_CHECK_FREQUENCY, f"{e}. Checking {DEFAULT_CHECK_FREQUENCY} instead."
+    return check_frequency, None
+
+def next_due(check_frequency: str, after: Optional[float] = None) -> float:
+    """Epoch time of the next check, one jittered interval after `after` (default: now)."""
+    interval = frequency_seconds(check_frequency)
+    return (after if after is not None else time.time()) + interval * (1 + random.uniform(-SCHEDULE_JITTER, SCHEDULE_JITTER))
+
+def new_monitor_id(prefix: str) -> str:
+    """Random, collision-free monitor ID such as job_monitor_3f9c0e5d8a6b4c1e9f2a7b6c5d4e3f21."""
+    return f"{prefix}_{uuid.uuid4().hex}"
 
 class MonitoringManager:
+    """
+    Persistent registry of monitors and the alerts they produce.
+
+    Monitors live in a WAL-mode SQLite database, so they survive restarts.
+    Type, contact and active flag are indexed columns; the rest of each
+    monitor's configuration is stored as JSON. Alert history is pruned by
+    age and row count whenever alerts are recorded.
+    """
+
+    def __init__(self, db_path: str, retention_days: int, max_alerts: int):
+        self.db_path = db_path
+        self.retention_days = retention_days
+        self.max_alerts = max_alerts
+        self._conn = None
+        self._lock = threading.RLock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS monitors (
+                    monitor_id TEXT PRIMARY KEY,
+                    type TEXT NOT NULL,
+                    alert_contact TEXT NOT NULL,
+                    active INTEGER NOT NULL DEFAULT 1,
+                    check_frequency TEXT NOT NULL DEFAULT 'daily',
+                    created_at TEXT NOT NULL,
+                    last_checked TEXT,
+                    next_check REAL,
+                    config TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_monitors_type ON monitors (type);
+                CREATE INDEX IF NOT EXISTS idx_monitors_contact ON monitors (alert_contact);
+                CREATE INDEX IF NOT EXISTS idx_monitors_active ON monitors (active);
+                CREATE TABLE IF NOT EXISTS alerts (
+                    alert_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    monitor_id TEXT NOT NULL,
+                    alert_contact TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    payload TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_alerts_contact ON alerts (alert_contact, created_at);
+                CREATE INDEX IF NOT EXISTS idx_alerts_created ON alerts (created_at);
+                """
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(monitors)")}
+            if "next_check" not in columns:
+                # Databases created before scheduling was added
+                self._conn.execute("ALTER TABLE monitors ADD COLUMN next_check REAL")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_monitors_due ON monitors (active, next_check)")
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def _row_to_monitor(row: sqlite3.Row) -> Dict[str, Any]:
+        monitor = json.loads(row["config"])
+        for column in MONITOR_COLUMNS:
+            monitor[column] = row[column]
+        monitor["active"] = bool(monitor["active"])
+        if monitor["next_check"] is not None:
+            monitor["next_check"] = datetime.fromtimestamp(monitor["next_check"]).isoformat()
+        return monitor
+
+    def add_monitor(self, config: Dict[str, Any]) -> None:
+        """Store a new monitor; `config` must carry monitor_id, type and alert_contact."""
+        config = {"active": True, "check_frequency": "daily", "last_checked": None, **config}
+        extra = {key: value for key, value in config.items() if key not in MONITOR_COLUMNS}
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO monitors (monitor_id, type, alert_contact, active, check_frequency, "
+                "created_at, last_checked, next_check, config) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    config["monitor_id"], config["type"], config["alert_contact"],
+                    int(bool(config["active"])), config["check_frequency"],
+                    config.get("created_at") or datetime.now().isoformat(),
+                    config["last_checked"], config.get("next_check"), json.dumps(extra)
+                )
+            )
+
+    def get_monitor(self, monitor_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self.conn.execute("SELECT * FROM monitors WHERE monitor_id = ?", (monitor_id,)).fetchone()
+        return self._row_to_monitor(row) if row else None
+
+    def list_monitors(self, monitor_type: Optional[str] = None, contact: Optional[str] = None,
+                      active: Optional[bool] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Monitors matching the given filters, oldest first."""
+        query = "SELECT * FROM monitors WHERE 1 = 1"
+        params: list = []
+        if monitor_type:
+            query += " AND type = ?"
+            params.append(monitor_type)
+        if contact:
+            query += " AND alert_contact = ?"
+            params.append(contact)
+        if active is not None:
+            query += " AND active = ?"
+            params.append(int(active))
+        query += " ORDER BY created_at"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+        return [self._row_to_monitor(row) for row in rows]
+
+    def get_monitors(self, monitor_ids: List[str]) -> List[Dict[str, Any]]:
+        if not monitor_ids:
+            return []
+        placeholders = ", ".join("?" for _ in monitor_ids)
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT * FROM monitors WHERE monitor_id IN ({placeholders})", monitor_ids
+            ).fetchall()
+        return [self._row_to_monitor(row) for row in rows]
+
+    def due_monitors(self, now: float) -> List[Dict[str, Any]]:
+        """Active monitors whose next check is at or before `now` (or was never scheduled)."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT * FROM monitors WHERE active = 1 AND (next_check IS NULL OR next_check <= ?) "
+                "ORDER BY next_check",
+                (now,)
+            ).fetchall()
+        return [self._row_to_monitor(row) for row in rows]
+
+    def schedule_entries(self) -> List[tuple]:
+        """(monitor_id, next_check, check_frequency) for every active monitor."""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT monitor_id, next_check, check_frequency FROM monitors WHERE active = 1"
+            ).fetchall()
+
+    def count_monitors(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT type, active, COUNT(*) FROM monitors GROUP BY type, active"
+            ).fetchall()
+        counts = {"total": 0, "active": 0, "by_type": {}}
+        for monitor_type, active, count in rows:
+            counts["total"] += count
+            counts["active"] += count if active else 0
+            counts["by_type"][monitor_type] = counts["by_type"].get(monitor_type, 0) + count
+        return counts
+
+    def set_active(self, monitor_id: str, active: bool) -> bool:
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "UPDATE monitors SET active = ? WHERE monitor_id = ?", (int(active), monitor_id)
+            )
+        return cursor.rowcount > 0
+
+    def set_next_check(self, monitor_id: str, next_check: float) -> None:
+        with self._lock, self.conn:
+            self.conn.execute("UPDATE monitors SET next_check = ? WHERE monitor_id = ?", (next_check, monitor_id))
+
+    def delete_monitor(self, monitor_id: str) -> bool:
+        with self._lock, self.conn:
+            cursor = self.conn.execute("DELETE FROM monitors WHERE monitor_id = ?", (monitor_id,))
+        return cursor.rowcount > 0
+
+    def mark_checked(self, schedule: Dict[str, float], checked_at: str) -> None:
+        """Record a check and the next due time for each monitor in `schedule`."""
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "UPDATE monitors SET last_checked = ?, next_check = ? WHERE monitor_id = ?",
+                [(checked_at, next_check, monitor_id) for monitor_id, next_check in schedule.items()]
+            )
+
+    def record_alerts(self, alerts: List[Dict[str, Any]]) -> None:
+        """Store alerts ({monitor_id, alert_contact, ...}) and prune old history."""
+        if not alerts:
+            return
+        now = datetime.now()
+        cutoff = (now - timedelta(days=self.retention_days)).isoformat()
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO alerts (monitor_id, alert_contact, created_at, payload) VALUES (?, ?, ?, ?)",
+                [
+                    (alert["monitor_id"], alert["alert_contact"], now.isoformat(), json.dumps(alert))
+                    for alert in alerts
+                ]
+            )
+            self.conn.execute("DELETE FROM alerts WHERE created_at < ?", (cutoff,))
+            # IDs only grow, so everything below (newest ID - limit) is beyond the row cap
+            self.conn.execute(
+                "DELETE FROM alerts WHERE alert_id <= (SELECT MAX(alert_id) FROM alerts) - ?",
+                (self.max_alerts,)
+            )
+
+    def alerts_for(self, contact: str, days: int, limit: int = 100) -> List[Dict[str, Any]]:
+        """Alerts sent to a contact in the last `days` days, newest first."""
+        since = (datetime.now() - timedelta(days=days)).isoformat()
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT created_at, payload FROM alerts WHERE alert_contact = ? AND created_at >= ? "
+                "ORDER BY created_at DESC LIMIT ?",
+                (contact, since, limit)
+            ).fetchall()
+        return [{**json.loads(row["payload"]), "alert_date": row["created_at"]} for row in rows]
+
+    def alert_count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM alerts").fetchone()[0]
+
+monitoring = MonitoringManager(MONITORING_DB_PATH, ALERT_RETENTION_DAYS, ALERT_MAX_ROWS)
+
+class MonitorScheduler:
+    """
+    Runs each monitor when its next check is due.
+
+    Due times live in a min-heap keyed by epoch seconds, so the scheduler
+    sleeps until the earliest one instead of scanning every monitor. Runs
+    as an asyncio task in the server's event loop; checks run in a worker
+    thread. Monitor changes from tools (possibly on other threads) are
+    handed over through `reschedule`/`unschedule` and wake the loop. Heap
+    entries that no longer match a monitor's current due time are skipped
+    when popped.
+    """
+
+    def __init__(self, manager: MonitoringManager):
+        self.manager = manager
+        self.stats = {"runs": 0, "checks": 0, "failed_runs": 0, "max_lag_seconds": 0.0}
+        self._consecutive_failures = 0
+        self._heap: List[tuple] = []
+        self._due: Dict[str, float] = {}
+        self._pending: List[tuple] = []
+        self._pending_lock = threading.Lock()
+        self._sequence = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the scheduler task on the running event loop."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def reschedule(self, monitor_id: str, due: float) -> None:
+        """Set a monitor's next due time; safe to call from any thread."""
+        self._hand_over(monitor_id, due)
+
+    def unschedule(self, monitor_id: str) -> None:
+        self._hand_over(monitor_id, None)
+
+    def _hand_over(self, monitor_id: str, due: Optional[float]) -> None:
+        with self._pending_lock:
+            self._pending.append((monitor_id, due))
+        if self.running:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _push(self, monitor_id: str, due: Optional[float]) -> None:
+        if due is None:
+            self._due.pop(monitor_id, None)
+            return
+        self._due[monitor_id] = due
+        self._sequence += 1
+        heapq.heappush(self._heap, (due, self._sequence, monitor_id))
+
+    def _apply_pending(self) -> None:
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+        for monitor_id, due in pending:
+            self._push(monitor_id, due)
+        # Keep stale entries from piling up when monitors are rescheduled often
+        if len(self._heap) > 2 * len(self._due) + 64:
+            self._heap = [entry for entry in self._heap if self._due.get(entry[2]) == entry[0]]
+            heapq.heapify(self._heap)
+
+    def _load(self) -> None:
+        self._heap, self._due = [], {}
+        now = time.time()
+        for monitor_id, next_check, check_frequency in self.manager.schedule_entries():
+            if next_check is None:
+                next_check = next_due(resolve_check_frequency(check_frequency)[0], now)
+                self.manager.set_next_check(monitor_id, next_check)
+            self._push(monitor_id, next_check)
+
+    def _pop_due(self, now: float) -> List[tuple]:
+        due_entries = []
+        while self._heap and self._heap[0][0] <= now:
+            due, _, monitor_id = heapq.heappop(self._heap)
+            if self._due.get(monitor_id) == due:
+                del self._due[monitor_id]
+                due_entries.append((monitor_id, due))
+        return due_entries
+
+    def _run_due(self, due_entries: List[tuple]) -> None:
+        started = time.time()
+        monitors = [
+            monitor for monitor in self.manager.get_monitors([monitor_id for monitor_id, _ in due_entries])
+            if monitor["active"]
+        ]
+        if monitors:
+            run_checks(monitors)
+        self.stats["runs"] += 1
+        self.stats["checks"] += len(monitors)
+        lag = max((started - due for _, due in due_entries), default=0.0)
+        self.stats["max_lag_seconds"] = round(max(self.stats["max_lag_seconds"], lag), 3)
+
+    def _retry(self, due_entries: List[tuple], error: Exception) -> None:
+        """Put monitors from a failed run back on the heap with a backed-off due time."""
+        self._consecutive_failures += 1
+        self.stats["failed_runs"] += 1
+        delay = min(SCHEDULE_RETRY_MAX_DELAY, SCHEDULE_RETRY_DELAY * 2 ** (self._consecutive_failures - 1))
+        print(f"Scheduled monitor checks failed: {error}; retrying {len(due_entries)} monitors "
+              f"in {delay}s", file=sys.stderr)
+        retry_at = time.time() + delay
+        for monitor_id, _ in due_entries:
+            # Changes handed over during the run are applied afterwards and take precedence
+            self._push(monitor_id, retry_at)
+
+    async def _run(self) -> None:
+        await asyncio.to_thread(self._load)
+        while True:
+            self._wakeup.clear()
+            self._apply_pending()
+            due_entries = self._pop_due(time.time())
+            if due_entries:
+                try:
+                    await asyncio.to_thread(self._run_due, due_entries)
+                except Exception as e:
+                    self._retry(due_entries, e)
+                else:
+                    self._consecutive_failures = 0
+                continue
+            timeout = max(0.0, self._heap[0][0] - time.time()) if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def summary(self, upcoming: int = 10) -> Dict[str, Any]:
+        entries = sorted((due, monitor_id) for monitor_id, due in list(self._due.items()))
+        return {
+            "running": self.running,
+            "scheduled_monitors": len(entries),
+            "jitter": SCHEDULE_JITTER,
+            **self.stats,
+            "upcoming": [
+                {"monitor_id": monitor_id, "next_check": datetime.fromtimestamp(due).isoformat()}
+                for due, monitor_id in entries[:upcoming]
+            ]
+        }
+
+scheduler = MonitorScheduler(monitoring)
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse whitespace, so keywords match regardless of case or spacing."""
+    return " ".join(str(text).lower().split())
+
+def monitor_keywords(monitor_config: Dict[str, Any]) -> List[str]:
+    """Terms a monitor matches on: keywords for job and news monitors, topics for research."""
+    terms = monitor_config.get("keywords") or monitor_config.get("topics") or []
+    return [normalize_text(term) for term in terms if normalize_text(term)]
+
+class KeywordMatcher:
+    """
+    One Aho-Corasick automaton over the keywords of every active monitor.
+
+    `match` scans a text once, in time linear in its length plus the number
+    of hits, and returns every monitor with a keyword in it. Matches must
+    sit on word boundaries, so "ai" does not match inside "maintain".
+
+    Updates are incremental. A new keyword is inserted into the existing
+    trie and only the failure links are recomputed, lazily on the next
+    match. A keyword no monitor uses any more just stops routing. The
+    automaton is rebuilt from scratch only once such dead keywords
+    outnumber the live ones.
+    """
+
     def __init__(self):
-        self.monitors = {}
-        self.alerts_sent = []
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._monitor_terms: Dict[str, List[str]] = {}
+        self._routes: Dict[str, set] = {}
+        self.stats = {"link_rebuilds": 0, "full_rebuilds": 0, "texts_scanned": 0}
+        self._reset()
+
+    def _reset(self) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Keywords ending at each node, and those plus the ones reachable through failure links
+        self._terms: List[List[str]] = [[]]
+        self._output: List[List[str]] = [[]]
+        self._trie_terms: set = set()
+        self._links_stale = False
+
+    def _insert(self, term: str) -> None:
+        node = 0
+        for char in term:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._terms.append([])
+            node = next_node
+        self._terms[node].append(term)
+        self._trie_terms.add(term)
+        self._links_stale = True
 
-monitoring = MonitoringManager()
+    def _build_links(self) -> None:
+        # Breadth-first, so a node's failure target is finished before the node itself
+        self._output = [list(terms) for terms in self._terms]
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+                queue.append(child)
+        self._links_stale = False
+        self.stats["link_rebuilds"] += 1
+
+    def load(self, monitors: List[Dict[str, Any]]) -> None:
+        """(Re)build the automaton from a full list of active monitors."""
+        with self._lock:
+            self._monitor_terms = {}
+            self._routes = {}
+            self._reset()
+            for monitor in monitors:
+                self._add(monitor["monitor_id"], monitor_keywords(monitor))
+            self._loaded = True
+            self.stats["full_rebuilds"] += 1
+
+    def ensure_loaded(self, loader) -> None:
+        with self._lock:
+            if not self._loaded:
+                self.load(loader())
+
+    def _add(self, monitor_id: str, terms: List[str]) -> None:
+        self._monitor_terms[monitor_id] = terms
+        for term in terms:
+            self._routes.setdefault(term, set()).add(monitor_id)
+            if term not in self._trie_terms:
+                self._insert(term)
+
+    def add_monitor(self, monitor_id: str, terms: List[str]) -> None:
+        with self._lock:
+            if not self._loaded:
+                return
+            self.remove_monitor(monitor_id)
+            self._add(monitor_id, terms)
+
+    def remove_monitor(self, monitor_id: str) -> None:
+        with self._lock:
+            for term in self._monitor_terms.pop(monitor_id, []):
+                routed = self._routes.get(term)
+                if routed is not None:
+                    routed.discard(monitor_id)
+                    if not routed:
+                        del self._routes[term]
+            dead = len(self._trie_terms) - len(self._routes)
+            if self._loaded and dead > max(64, len(self._routes)):
+                # Compact: rebuild the trie with only the keywords still in use
+                monitor_terms = self._monitor_terms
+                self._reset()
+                self._monitor_terms, self._routes = {}, {}
+                for other_id, terms in monitor_terms.items():
+                    self._add(other_id, terms)
+                self.stats["full_rebuilds"] += 1
+
+    def match(self, text: str) -> Dict[str, set]:
+        """Map each monitor with a keyword in `text` to the keywords found."""
+        normalized = normalize_text(text)
+        with self._lock:
+            if self._links_stale:
+                self._build_links()
+            self.stats["texts_scanned"] += 1
+            goto, fail, output, routes = self._goto, self._fail, self._output, self._routes
+            hits: Dict[str, set] = {}
+            node = 0
+            for position, char in enumerate(normalized):
+                while node and char not in goto[node]:
+                    node = fail[node]
+                node = goto[node].get(char, 0)
+                for term in output[node]:
+                    start = position - len(term) + 1
+                    if start > 0 and normalized[start - 1].isalnum():
+                        continue
+                    if position + 1 < len(normalized) and normalized[position + 1].isalnum():
+                        continue
+                    for monitor_id in routes.get(term, ()):
+                        hits.setdefault(monitor_id, set()).add(term)
+            return hits
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "monitors": len(self._monitor_terms),
+                "keywords": len(self._routes),
+                "trie_keywords": len(self._trie_terms),
+                "trie_nodes": len(self._goto),
+                **self.stats
+            }
+
+keyword_matcher = KeywordMatcher()
 
 @mcp.tool()
-def create_job_monitor(companies: List[str], keywords: List[str], alert_contact: str, check_frequency: str = "daily") -> Dict[str, Any]:
+def create_job_monitor(companies: List[str], keywords: List[str], alert_contact: str, check_frequency: str = "daily",
+                       feed_urls: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Create a monitor for new job postings at specific companies
     
@@ -26,12 +668,19 @@ def create_job_monitor(companies: List[str], keywords: List[str], alert_contact:
         companies: List of companies to monitor
         keywords: Keywords to look for in job descriptions
         alert_contact: WhatsApp contact to send alerts to
-        check_frequency: How often to check (daily, weekly)
+        check_frequency: How often to check (hourly, daily, weekly, monthly, or e.g. "30m", "6h")
+        feed_urls: Optional URLs of JSON job feeds (a list of postings) to check as well
     
     Returns:
         Monitor setup confirmation with monitoring details
     """
-    monitor_id = f"job_monitor_{int(datetime.now().timestamp())}"
+    check_frequency, frequency_warning = resolve_check_frequency(check_frequency)
+    try:
+        next_check = next_due(check_frequency)
+        feed_urls = validate_feed_urls(feed_urls)
+    except ValueError as e:
+        return {"monitor_created": False, "error": str(e)}
+    monitor_id = new_monitor_id("job_monitor")
     
     monitor_config = {
         "monitor_id": monitor_id,
@@ -39,9 +688,11 @@ def create_job_monitor(companies: List[str], keywords: List[str], alert_contact:
         "companies": companies,
         "keywords": keywords,
         "alert_contact": alert_contact,
+        "feed_urls": feed_urls,
         "check_frequency": check_frequency,
         "created_at": datetime.now().isoformat(),
         "last_checked": None,
+        "next_check": next_check,
         "active": True,
         "matches_found": 0
     }
@@ -61,20 +712,26 @@ def create_job_monitor(companies: List[str], keywords: List[str], alert_contact:
             }
             current_matches.append(match)
     
-    monitoring.monitors[monitor_id] = monitor_config
+    monitoring.add_monitor(monitor_config)
+    scheduler.reschedule(monitor_id, next_check)
+    keyword_matcher.add_monitor(monitor_id, monitor_keywords(monitor_config))
     
-    return {
+    result = {
         "monitor_created": True,
         "monitor_id": monitor_id,
         "monitoring": f"{len(companies)} companies for {len(keywords)} keywords",
         "current_matches_found": len(current_matches),
         "sample_matches": current_matches[:3],
-        "next_check": (datetime.now() + timedelta(days=1)).isoformat(),
+        "next_check": datetime.fromtimestamp(next_check).isoformat(),
         "alert_setup": f"Will notify {alert_contact} when new matches found"
     }
+    if frequency_warning:
+        result["warning"] = frequency_warning
+    return result
 
 @mcp.tool()
-def create_research_monitor(topics: List[str], alert_contact: str, min_relevance: str = "high") -> Dict[str, Any]:
+def create_research_monitor(topics: List[str], alert_contact: str, min_relevance: str = "high",
+                            check_frequency: str = "daily", feed_urls: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Monitor new research publications on specific topics
     
@@ -82,11 +739,19 @@ def create_research_monitor(topics: List[str], alert_contact: str, min_relevance
         topics: Research topics to monitor
         alert_contact: Contact to alert when new papers found
         min_relevance: Minimum relevance threshold (low, medium, high)
+        check_frequency: How often to check (hourly, daily, weekly, monthly, or e.g. "30m", "6h")
+        feed_urls: Optional URLs of JSON publication feeds (a list of papers) to check as well
     
     Returns:
         Research monitoring setup details
     """
-    monitor_id = f"research_monitor_{int(datetime.now().timestamp())}"
+    check_frequency, frequency_warning = resolve_check_frequency(check_frequency)
+    try:
+        next_check = next_due(check_frequency)
+        feed_urls = validate_feed_urls(feed_urls)
+    except ValueError as e:
+        return {"research_monitor_created": False, "error": str(e)}
+    monitor_id = new_monitor_id("research_monitor")
     
     monitor_config = {
         "monitor_id": monitor_id,
@@ -95,8 +760,12 @@ def create_research_monitor(topics: List[str], alert_contact: str, min_relevance
         "alert_contact": alert_contact,
         "min_relevance": min_relevance,
         "sources": ["arxiv", "google_scholar", "pubmed"],
+        "feed_urls": feed_urls,
+        "check_frequency": check_frequency,
         "created_at": datetime.now().isoformat(),
         "last_checked": None,
+        "next_check": next_check,
+        "active": True,
         "papers_found": 0
     }
     
@@ -114,20 +783,28 @@ def create_research_monitor(topics: List[str], alert_contact: str, min_relevance
         }
         recent_papers.append(paper)
     
-    monitoring.monitors[monitor_id] = monitor_config
+    monitoring.add_monitor(monitor_config)
+    scheduler.reschedule(monitor_id, next_check)
+    keyword_matcher.add_monitor(monitor_id, monitor_keywords(monitor_config))
     
-    return {
+    result = {
         "research_monitor_created": True,
         "monitor_id": monitor_id,
         "topics_monitored": topics,
         "sources_checked": ["ArXiv", "Google Scholar", "PubMed"],
         "recent_papers_sample": recent_papers,
         "relevance_threshold": min_relevance,
-        "notification_contact": alert_contact
+        "notification_contact": alert_contact,
+        "next_check": datetime.fromtimestamp(next_check).isoformat()
     }
+    if frequency_warning:
+        result["warning"] = frequency_warning
+    return result
 
 @mcp.tool()
-def create_industry_news_monitor(industry: str, keywords: List[str], alert_contact: str) -> Dict[str, Any]:
+def create_industry_news_monitor(industry: str, keywords: List[str], alert_contact: str,
+                                 check_frequency: str = "daily",
+                                 feed_urls: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Monitor industry news and developments
     
@@ -135,11 +812,19 @@ def create_industry_news_monitor(industry: str, keywords: List[str], alert_conta
         industry: Industry to monitor (e.g., "insurance", "fintech", "AI")
         keywords: Specific keywords to track
         alert_contact: Contact for alerts
+        check_frequency: How often to check (hourly, daily, weekly, monthly, or e.g. "30m", "6h")
+        feed_urls: Optional URLs of JSON news feeds (a list of articles) to check as well
     
     Returns:
         Industry news monitoring setup
     """
-    monitor_id = f"news_monitor_{int(datetime.now().timestamp())}"
+    check_frequency, frequency_warning = resolve_check_frequency(check_frequency)
+    try:
+        next_check = next_due(check_frequency)
+        feed_urls = validate_feed_urls(feed_urls)
+    except ValueError as e:
+        return {"industry_monitor_created": False, "error": str(e)}
+    monitor_id = new_monitor_id("news_monitor")
     
     monitor_config = {
         "monitor_id": monitor_id,
@@ -148,7 +833,12 @@ def create_industry_news_monitor(industry: str, keywords: List[str], alert_conta
         "keywords": keywords,
         "alert_contact": alert_contact,
         "news_sources": ["TechCrunch", "Forbes", "Reuters", "Industry Publications"],
+        "feed_urls": feed_urls,
+        "check_frequency": check_frequency,
         "created_at": datetime.now().isoformat(),
+        "last_checked": None,
+        "next_check": next_check,
+        "active": True,
         "significance_filter": "medium_to_high"
     }
     
@@ -173,90 +863,715 @@ def create_industry_news_monitor(industry: str, keywords: List[str], alert_conta
         }
     ]
     
-    monitoring.monitors[monitor_id] = monitor_config
+    monitoring.add_monitor(monitor_config)
+    scheduler.reschedule(monitor_id, next_check)
+    keyword_matcher.add_monitor(monitor_id, monitor_keywords(monitor_config))
     
-    return {
+    result = {
         "industry_monitor_created": True,
         "monitor_id": monitor_id,
         "industry": industry,
         "keywords_tracked": keywords,
         "news_sources": monitor_config["news_sources"],
         "recent_developments": recent_news,
-        "alert_contact": alert_contact
+        "alert_contact": alert_contact,
+        "next_check": datetime.fromtimestamp(next_check).isoformat()
     }
+    if frequency_warning:
+        result["warning"] = frequency_warning
+    return result
 
-@mcp.tool()
-def check_all_monitors() -> Dict[str, Any]:
+# Items currently published for each monitor type (simulated feeds)
+SIMULATED_FEEDS = {
+    "job_postings": [
+        {
+            "company": "Google",
+            "title": "Senior AI Research Scientist",
+            "description": "Research and ship AI and machine learning systems",
+            "posted": "2 hours ago",
+            "priority": "HIGH"
+        }
+    ],
+    "research_publications": [
+        {
+            "title": "Revolutionary Advances in Large Language Models",
+            "relevance": 0.95,
+            "published": "Today",
+            "significance": "Breakthrough methodology"
+        }
+    ],
+    "industry_news": [
+        {
+            "headline": "Major Insurance Company Adopts AI Claims Processing",
+            "impact": "HIGH",
+            "published": "1 hour ago",
+            "relevance": "Direct industry impact"
+        }
+    ]
+}
+
+# Item fields scanned for monitor keywords
+ITEM_TEXT_FIELDS = ("title", "headline", "company", "description", "summary")
+
+def fetch_items(monitor_type: str) -> List[Dict[str, Any]]:
+    """Fetch the items currently published for a monitor type."""
+    return SIMULATED_FEEDS.get(monitor_type, [])
+
+def validate_feed_urls(feed_urls: Optional[List[str]]) -> List[str]:
+    """Return the feed URLs with duplicates removed, raising ValueError for non-HTTP ones."""
+    urls = []
+    for url in feed_urls or []:
+        parsed = urlparse(url.strip())
+        if parsed.scheme not in ("http", "https") or not parsed.netloc:
+            raise ValueError(f"Invalid feed URL '{url}': expected an http(s) URL")
+        if url.strip() not in urls:
+            urls.append(url.strip())
+    return urls
+
+class FeedTimeout(Exception):
+    """A feed fetch ran past its deadline."""
+
+class TokenBucket:
     """
-    Check all active monitors and generate alerts for new findings
-    
-    Returns:
-        Summary of all monitor checks and alerts generated
+    Thread-safe token bucket allowing `rate` requests per second with bursts
+    of up to `burst`. Callers that can't get a token right away reserve the
+    next one (the balance goes negative), so waiters are served in order.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        if rate <= 0:
+            raise ValueError(f"Token bucket rate must be positive, got {rate}")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline: float) -> None:
+        """Take a token, sleeping until one is free; raise FeedTimeout if that would pass `deadline`."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            delay = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+            if now + delay > deadline:
+                raise FeedTimeout("rate limit wait exceeds the check timeout")
+            self.tokens -= 1
+            self.waited += delay
+        if delay:
+            time.sleep(delay)
+
+class FeedFetcher:
+    """
+    Fetches monitors' JSON feeds concurrently.
+
+    One pass fetches each distinct URL once, on a shared thread pool capped
+    at `max_concurrency`. Each host gets its own token bucket, so one
+    careers site is never sent more than `host_rate` requests per second.
+    The whole pass has a hard deadline of `timeout` seconds from when it is
+    called, covering time queued for a worker, the rate-limit wait, the
+    connection and the streamed body. Failed or slow feeds don't hold up
+    the rest: their monitors get the items from the feeds that did load,
+    marked `partial`.
     """
+
+    def __init__(self, max_concurrency: int, host_rate: float, host_burst: int,
+                 timeout: float, max_bytes: int):
+        if host_rate <= 0:
+            raise ValueError(f"Per-host feed rate must be positive, got {host_rate}")
+        self.max_concurrency = max(1, max_concurrency)
+        self.host_rate = host_rate
+        self.host_burst = host_burst
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_concurrency, pool_maxsize=self.max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.stats = {"passes": 0, "fetches": 0, "failures": 0, "timeouts": 0, "abandoned": 0}
+        self.recent = deque(maxlen=50)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="monitor-feed")
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.host_rate, self.host_burst)
+            return self._buckets[host]
+
+    def _get(self, url: str, deadline: float, stop: threading.Event) -> List[Dict[str, Any]]:
+        self._bucket(urlparse(url).netloc).acquire(deadline)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or stop.is_set():
+            raise FeedTimeout("check timeout reached")
+        with self.session.get(url, timeout=(remaining, remaining), stream=True,
+                              headers={"Accept": "application/json"}) as response:
+            response.raise_for_status()
+            # Socket timeouts reset on every read, so check the deadline after each one;
+            # read1 returns whatever has arrived instead of waiting for a full chunk
+            read = getattr(response.raw, "read1", response.raw.read)
+            body = bytearray()
+            while True:
+                chunk = read(65536, decode_content=True)
+                if not chunk:
+                    break
+                body.extend(chunk)
+                if len(body) > self.max_bytes:
+                    raise ValueError(f"feed larger than {self.max_bytes} bytes")
+                if time.monotonic() > deadline or stop.is_set():
+                    raise FeedTimeout("check timeout reached")
+        payload = json.loads(bytes(body))
+        if isinstance(payload, dict):
+            payload = next((payload[key] for key in FEED_ITEM_KEYS if isinstance(payload.get(key), list)), [])
+        if not isinstance(payload, list):
+            raise ValueError("feed is not a JSON list of items")
+        return [item for item in payload if isinstance(item, dict)]
+
+    def _fetch(self, url: str, deadline: float, stop: threading.Event) -> Dict[str, Any]:
+        started = time.monotonic()
+        result: Dict[str, Any] = {"url": url, "items": [], "status": "ok", "error": None}
+        try:
+            result["items"] = self._get(url, deadline, stop)
+        except (FeedTimeout, requests.Timeout) as e:
+            result.update(status="timeout", error=str(e) or "request timed out")
+        except (requests.RequestException, ValueError) as e:
+            result.update(status="error", error=str(e))
+        result["finished"] = time.monotonic()
+        result["latency_ms"] = round((result["finished"] - started) * 1000, 1)
+        return result
+
+    def fetch(self, monitors: List[Dict[str, Any]]) -> tuple:
+        """
+        Fetch every feed the given monitors subscribe to.
+
+        Returns:
+            ({url: items} for feeds that loaded, {monitor_id: check details})
+            where check details carry status (ok, partial, timeout or
+            error), latency in milliseconds, items fetched and feed errors.
+        """
+        started = time.monotonic()
+        deadline = started + self.timeout
+        urls = sorted({url for monitor in monitors for url in monitor.get("feed_urls") or []})
+        # Set at the deadline so fetches still queued or reading give up instead of
+        # holding pool workers that the next pass needs
+        stop = threading.Event()
+        pending = {url: self._pool.submit(self._fetch, url, deadline, stop) for url in urls}
+        wait(pending.values(), timeout=max(0.0, deadline - time.monotonic()))
+        stop.set()
+
+        results = {}
+        abandoned = 0
+        now = time.monotonic()
+        for url, future in pending.items():
+            if future.done():
+                results[url] = future.result()
+                continue
+            # A fetch blocked in a read can't be interrupted; it stops at its next read
+            if not future.cancel():
+                abandoned += 1
+            results[url] = {"url": url, "items": [], "status": "timeout", "error": "check timeout reached",
+                            "finished": now, "latency_ms": round((now - started) * 1000, 1)}
+
+        with self._lock:
+            self.stats["passes"] += 1
+            self.stats["fetches"] += len(results)
+            self.stats["failures"] += sum(1 for result in results.values() if result["status"] == "error")
+            self.stats["timeouts"] += sum(1 for result in results.values() if result["status"] == "timeout")
+            self.stats["abandoned"] += abandoned
+            for result in results.values():
+                self.recent.append({key: result[key] for key in ("url", "status", "error", "latency_ms")})
+
+        checks = {}
+        for monitor in monitors:
+            feeds = [results[url] for url in monitor.get("feed_urls") or []]
+            failed = [feed for feed in feeds if feed["status"] != "ok"]
+            if not failed:
+                status = "ok"
+            elif len(failed) < len(feeds):
+                status = "partial"
+            else:
+                status = "timeout" if all(feed["status"] == "timeout" for feed in failed) else "error"
+            finished = max((feed["finished"] for feed in feeds), default=started)
+            checks[monitor["monitor_id"]] = {
+                "status": status,
+                "latency_ms": round((finished - started) * 1000, 1),
+                "items_fetched": sum(len(feed["items"]) for feed in feeds),
+                "feed_errors": {feed["url"]: feed["error"] for feed in failed}
+            }
+        return {url: result["items"] for url, result in results.items() if result["status"] == "ok"}, checks
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "max_concurrency": self.max_concurrency,
+                "host_rate": self.host_rate,
+                "host_burst": self.host_burst,
+                "timeout_seconds": self.timeout,
+                "hosts": {
+                    host: {"tokens": round(bucket.tokens, 2), "rate_limit_wait_seconds": round(bucket.waited, 2)}
+                    for host, bucket in self._buckets.items()
+                },
+                "recent_fetches": list(self.recent)
+            }
+
+feed_fetcher = FeedFetcher(FEED_MAX_CONCURRENCY, FEED_HOST_RATE, FEED_HOST_BURST, FEED_TIMEOUT, FEED_MAX_BYTES)
+
+def item_text(item: Dict[str, Any]) -> str:
+    return " \n ".join(str(item[field]) for field in ITEM_TEXT_FIELDS if item.get(field))
+
+def route_items(monitors: List[Dict[str, Any]],
+                feed_items: Optional[Dict[str, List[Dict[str, Any]]]] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Fetch each monitor type's items once and route every item to the
+    monitors whose keywords it contains, scanning each item's text once
+    for all monitors together. Items from `feed_items` ({url: items}) go
+    only to the monitors subscribed to that feed.
+    """
+    keyword_matcher.ensure_loaded(lambda: monitoring.list_monitors(active=True))
+    findings: Dict[str, List[Dict[str, Any]]] = {monitor["monitor_id"]: [] for monitor in monitors}
+    sources = [
+        (item, {monitor["monitor_id"] for monitor in monitors if monitor["type"] == monitor_type})
+        for monitor_type in sorted({monitor["type"] for monitor in monitors})
+        for item in fetch_items(monitor_type)
+    ]
+    for url, items in (feed_items or {}).items():
+        subscribers = {monitor["monitor_id"] for monitor in monitors if url in (monitor.get("feed_urls") or [])}
+        sources.extend((item, subscribers) for item in items)
+    by_id = {monitor["monitor_id"]: monitor for monitor in monitors}
+    for item, subscribers in sources:
+        for monitor_id, terms in keyword_matcher.match(item_text(item)).items():
+            if monitor_id not in subscribers:
+                continue
+            companies = {normalize_text(company) for company in by_id[monitor_id].get("companies") or []}
+            if companies and item.get("company") and normalize_text(item["company"]) not in companies:
+                continue
+            findings[monitor_id].append({**item, "match_keywords": sorted(terms)})
+    return findings
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over 128-bit fingerprints, kept in a memory-mapped file.
+
+    Sized for `capacity` items at `error_rate` false positives. Bit
+    positions come from double hashing the fingerprint, so no extra hashing
+    is needed. A missing file, or one sized for other settings, is
+    recreated empty.
+    """
+
+    def __init__(self, path: str, capacity: int, error_rate: float):
+        self.path = path
+        self.capacity = max(1, capacity)
+        self.bits, self.hashes = self.dimensions(self.capacity, error_rate)
+        size = self.bits // 8
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fresh = not os.path.exists(path) or os.path.getsize(path) != size
+        with open(path, "r+b" if not fresh else "w+b") as f:
+            if fresh:
+                f.truncate(size)
+            self._map = mmap.mmap(f.fileno(), size)
+
+    @staticmethod
+    def dimensions(capacity: int, error_rate: float) -> tuple:
+        """(bits, hashes) for `capacity` items at `error_rate`; bits is a multiple of 8."""
+        capacity = max(1, capacity)
+        bits = max(64, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        bits += -bits % 8
+        return bits, max(1, round(bits / capacity * math.log(2)))
+
+    def _positions(self, fingerprint: bytes):
+        first = int.from_bytes(fingerprint[:8], "big")
+        second = int.from_bytes(fingerprint[8:16], "big") | 1
+        return ((first + i * second) % self.bits for i in range(self.hashes))
+
+    def add(self, fingerprint: bytes) -> None:
+        for position in self._positions(fingerprint):
+            self._map[position >> 3] |= 1 << (position & 7)
+
+    def add_many(self, fingerprints: List[bytes]) -> None:
+        """Add fingerprints in bulk; sets the same bits as add() would, vectorized with numpy."""
+        if not fingerprints:
+            return
+        halves = np.frombuffer(b"".join(fingerprints), dtype=">u8").reshape(-1, 2).astype(np.uint64)
+        bits = np.uint64(self.bits)
+        # Reduce before combining so (first + i * second) % bits stays exact in 64 bits
+        first = halves[:, 0] % bits
+        second = (halves[:, 1] | np.uint64(1)) % bits
+        array = np.frombuffer(self._map, dtype=np.uint8)
+        for i in range(self.hashes):
+            positions = (first + np.uint64(i) * second) % bits
+            np.bitwise_or.at(array, positions >> np.uint64(3),
+                             np.left_shift(1, positions & np.uint64(7)).astype(np.uint8))
+        del array
+
+    def __contains__(self, fingerprint: bytes) -> bool:
+        return all(self._map[position >> 3] & (1 << (position & 7)) for position in self._positions(fingerprint))
+
+    def clear(self) -> None:
+        self._map[:] = bytes(len(self._map))
+
+    def flush(self) -> None:
+        self._map.flush()
+
+    def close(self) -> None:
+        self._map.close()
+
+def item_fingerprint(monitor_id: str, item: Dict[str, Any]) -> bytes:
+    """
+    Stable 128-bit fingerprint of an item as seen by one monitor.
+
+    Uses the item's URL or ID when it has one, otherwise its normalized
+    text fields, so relative timestamps ("2 hours ago") and match details
+    don't make a repeated item look new.
+    """
+    identity = [f"{field}={item[field]}" for field in ITEM_ID_FIELDS if item.get(field)]
+    if not identity:
+        identity = [f"{field}={normalize_text(item[field])}" for field in ITEM_TEXT_FIELDS if item.get(field)]
+    payload = "\x1f".join([monitor_id, *identity]).encode()
+    return hashlib.sha256(payload).digest()[:16]
+
+class SeenItems:
+    """
+    Persistent set of findings already reported.
+
+    Lookups go through three tiers:
+
+    - An in-memory LRU of recent fingerprints.
+    - A Bloom filter that answers "definitely new" for most unseen items
+      without touching disk.
+    - An exact SQLite table that settles the Bloom filter's "maybe" answers.
+
+    Memory stays fixed however many items are stored: the Bloom filter has
+    a fixed size and lives in an mmap. The SQLite table is capped at
+    `max_rows`, dropping the oldest fingerprints first, and the Bloom
+    filter is sized for the same number of items. Pruned fingerprints stay
+    set in the filter until SEEN_REBUILD_FRACTION of its capacity has been
+    pruned; it is then rebuilt from the table so it never saturates.
+    """
+
+    def __init__(self, db_path: str, bloom_path: str, error_rate: float, max_rows: int, cache_size: int):
+        self.db_path = db_path
+        self.bloom_path = bloom_path
+        self.error_rate = error_rate
+        self.max_rows = max_rows
+        self.cache_size = cache_size
+        self.stats = {"checked": 0, "new": 0, "suppressed": 0, "bloom_negatives": 0,
+                      "exact_lookups": 0, "bloom_false_positives": 0, "bloom_rebuilds": 0}
+        self._conn = None
+        self._bloom: Optional[BloomFilter] = None
+        self._recent: "OrderedDict[bytes, None]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS seen_items (
+                    seen_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    fingerprint BLOB NOT NULL UNIQUE,
+                    monitor_id TEXT NOT NULL,
+                    first_seen REAL NOT NULL
+                )
+                """
+            )
+            # Fingerprints removed from the table since the Bloom filter was last built
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS seen_state (key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    @property
+    def bloom(self) -> BloomFilter:
+        if self._bloom is None:
+            bits, _ = BloomFilter.dimensions(self.max_rows, self.error_rate)
+            if os.path.exists(self.bloom_path) and os.path.getsize(self.bloom_path) == bits // 8:
+                self._bloom = BloomFilter(self.bloom_path, self.max_rows, self.error_rate)
+            else:
+                # Missing or sized for other settings: build it from the exact tier
+                self._rebuild_bloom()
+        return self._bloom
+
+    def _pruned(self) -> int:
+        row = self.conn.execute("SELECT value FROM seen_state WHERE key = 'pruned'").fetchone()
+        return row[0] if row else 0
+
+    def _record_pruned(self, count: int) -> None:
+        """Count fingerprints removed from the table; rebuild the filter once enough are stale."""
+        if count <= 0:
+            return
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO seen_state (key, value) VALUES ('pruned', ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = value + excluded.value",
+                (count,)
+            )
+        if self._pruned() >= max(1, int(self.max_rows * SEEN_REBUILD_FRACTION)):
+            self._rebuild_bloom()
+
+    def _rebuild_bloom(self) -> None:
+        """
+        Build a filter holding exactly the table's fingerprints and swap it in.
+
+        The new filter is written to a side file and renamed over the old one,
+        so a crash mid-rebuild never leaves a filter missing fingerprints.
+        """
+        rebuilt_path = self.bloom_path + ".rebuild"
+        if os.path.exists(rebuilt_path):
+            os.remove(rebuilt_path)
+        rebuilt = BloomFilter(rebuilt_path, self.max_rows, self.error_rate)
+        cursor = self.conn.execute("SELECT fingerprint FROM seen_items")
+        while True:
+            rows = cursor.fetchmany(100000)
+            if not rows:
+                break
+            rebuilt.add_many([fingerprint for (fingerprint,) in rows])
+        rebuilt.flush()
+        os.replace(rebuilt_path, self.bloom_path)
+        rebuilt.path = self.bloom_path
+        if self._bloom is not None:
+            self._bloom.close()
+        self._bloom = rebuilt
+        with self.conn:
+            self.conn.execute("DELETE FROM seen_state WHERE key = 'pruned'")
+        self.stats["bloom_rebuilds"] += 1
+
+    def _remember(self, fingerprint: bytes) -> None:
+        self._recent[fingerprint] = None
+        self._recent.move_to_end(fingerprint)
+        if len(self._recent) > self.cache_size:
+            self._recent.popitem(last=False)
+
+    def _seen(self, fingerprint: bytes) -> bool:
+        if fingerprint in self._recent:
+            self._recent.move_to_end(fingerprint)
+            return True
+        if fingerprint not in self.bloom:
+            self.stats["bloom_negatives"] += 1
+            return False
+        self.stats["exact_lookups"] += 1
+        found = self.conn.execute(
+            "SELECT 1 FROM seen_items WHERE fingerprint = ?", (fingerprint,)
+        ).fetchone() is not None
+        if not found:
+            self.stats["bloom_false_positives"] += 1
+        return found
+
+    def filter_new(self, findings: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Drop findings each monitor has already been told about, and record
+        the rest as seen. Takes and returns {monitor_id: [items]}.
+        """
+        fresh: Dict[str, List[Dict[str, Any]]] = {}
+        added = []
+        now = time.time()
+        with self._lock:
+            batch = set()
+            for monitor_id, items in findings.items():
+                fresh[monitor_id] = []
+                for item in items:
+                    fingerprint = item_fingerprint(monitor_id, item)
+                    self.stats["checked"] += 1
+                    if fingerprint in batch or self._seen(fingerprint):
+                        self.stats["suppressed"] += 1
+                        continue
+                    batch.add(fingerprint)
+                    fresh[monitor_id].append(item)
+                    added.append((fingerprint, monitor_id, now))
+            if not added:
+                return fresh
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO seen_items (fingerprint, monitor_id, first_seen) VALUES (?, ?, ?)",
+                    added
+                )
+                pruned = self.conn.execute(
+                    "DELETE FROM seen_items WHERE seen_id <= (SELECT MAX(seen_id) FROM seen_items) - ?",
+                    (self.max_rows,)
+                ).rowcount
+            for fingerprint, _, _ in added:
+                self.bloom.add(fingerprint)
+                self._remember(fingerprint)
+            self.bloom.flush()
+            self.stats["new"] += len(added)
+            self._record_pruned(pruned)
+        return fresh
+
+    def forget_monitor(self, monitor_id: str) -> None:
+        """Drop a deleted monitor's exact entries; its Bloom bits are cleared at the next rebuild."""
+        with self._lock:
+            with self.conn:
+                removed = self.conn.execute("DELETE FROM seen_items WHERE monitor_id = ?", (monitor_id,)).rowcount
+            self._record_pruned(removed)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            stored = self.conn.execute("SELECT COUNT(*) FROM seen_items").fetchone()[0]
+            bloom = self.bloom
+            return {
+                **self.stats,
+                "stored_fingerprints": stored,
+                "max_rows": self.max_rows,
+                "pruned_since_rebuild": self._pruned(),
+                "bloom_capacity": bloom.capacity,
+                "bloom_bytes": bloom.bits // 8,
+                "bloom_hashes": bloom.hashes,
+                "bloom_error_rate": self.error_rate,
+                "cached_fingerprints": len(self._recent)
+            }
+
+seen_items = SeenItems(MONITORING_DB_PATH, SEEN_BLOOM_PATH, SEEN_ERROR_RATE, SEEN_MAX_ROWS, SEEN_CACHE_SIZE)
+
+def run_checks(monitors: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Check the given monitors, record alerts for findings each monitor
+    hasn't seen before, and schedule each monitor's next check one
+    (jittered) interval from now. Monitors' feeds are fetched concurrently;
+    a feed that fails or times out leaves its monitors with partial results.
+    """
+    checked_at = time.time()
     check_results = {
-        "check_timestamp": datetime.now().isoformat(),
-        "monitors_checked": len(monitoring.monitors),
+        "check_timestamp": datetime.fromtimestamp(checked_at).isoformat(),
+        "monitors_checked": len(monitors),
         "alerts_generated": 0,
         "new_findings": [],
         "monitor_status": {}
     }
+    alerts = []
+    schedule = {}
+    feed_items, feed_checks = feed_fetcher.fetch(monitors)
+    routed = route_items(monitors, feed_items)
+    fresh = seen_items.filter_new(routed)
+    check_results["duplicates_suppressed"] = sum(len(items) for items in routed.values()) - sum(
+        len(items) for items in fresh.values()
+    )
     
-    for monitor_id, monitor_config in monitoring.monitors.items():
-        if not monitor_config.get("active", True):
-            continue
-            
-        monitor_type = monitor_config["type"]
-        
-        # Simulate checking each monitor type
-        if monitor_type == "job_postings":
-            new_jobs = [
-                {
-                    "company": "Google",
-                    "title": "Senior AI Research Scientist",
-                    "posted": "2 hours ago",
-                    "priority": "HIGH",
-                    "match_reason": "Contains keywords: AI, Machine Learning"
-                }
-            ]
-            if new_jobs:
-                check_results["new_findings"].extend(new_jobs)
-                check_results["alerts_generated"] += 1
-                
-        elif monitor_type == "research_publications":
-            new_papers = [
-                {
-                    "title": "Revolutionary Advances in Large Language Models",
-                    "relevance": 0.95,
-                    "published": "Today",
-                    "significance": "Breakthrough methodology"
-                }
-            ]
-            if new_papers:
-                check_results["new_findings"].extend(new_papers)
-                check_results["alerts_generated"] += 1
-                
-        elif monitor_type == "industry_news":
-            new_news = [
-                {
-                    "headline": "Major Insurance Company Adopts AI Claims Processing",
-                    "impact": "HIGH",
-                    "published": "1 hour ago",
-                    "relevance": "Direct industry impact"
-                }
-            ]
-            if new_news:
-                check_results["new_findings"].extend(new_news)
-                check_results["alerts_generated"] += 1
+    for monitor_config in monitors:
+        monitor_id = monitor_config["monitor_id"]
+        findings = fresh[monitor_id]
+        if findings:
+            check_results["new_findings"].extend(findings)
+            check_results["alerts_generated"] += 1
+            alerts.append({
+                "monitor_id": monitor_id,
+                "alert_contact": monitor_config["alert_contact"],
+                "type": monitor_config["type"],
+                "findings": findings
+            })
         
+        schedule[monitor_id] = next_due(resolve_check_frequency(monitor_config["check_frequency"])[0], checked_at)
         check_results["monitor_status"][monitor_id] = {
-            "type": monitor_type,
+            "type": monitor_config["type"],
             "status": "ACTIVE",
-            "last_checked": datetime.now().isoformat(),
-            "findings_today": 1
+            "last_checked": check_results["check_timestamp"],
+            "next_check": datetime.fromtimestamp(schedule[monitor_id]).isoformat(),
+            "findings_today": len(findings),
+            "fetch_status": feed_checks[monitor_id]["status"],
+            "latency_ms": feed_checks[monitor_id]["latency_ms"]
         }
+        if feed_checks[monitor_id]["feed_errors"]:
+            check_results["monitor_status"][monitor_id]["feed_errors"] = feed_checks[monitor_id]["feed_errors"]
     
+    check_results["partial"] = any(check["status"] != "ok" for check in feed_checks.values())
+    check_results["duration_ms"] = round((time.time() - checked_at) * 1000, 1)
+    monitoring.mark_checked(schedule, check_results["check_timestamp"])
+    monitoring.record_alerts(alerts)
+    for monitor_id, next_check in schedule.items():
+        scheduler.reschedule(monitor_id, next_check)
     return check_results
 
+@mcp.tool()
+def check_all_monitors(due_only: bool = False) -> Dict[str, Any]:
+    """
+    Check active monitors and generate alerts for new findings
+    
+    Args:
+        due_only: Only check monitors whose next check time has passed (default: False,
+            which checks every active monitor now)
+    
+    Returns:
+        Summary of all monitor checks and alerts generated, with each
+        checked monitor's next scheduled check, fetch status and latency;
+        `partial` is set when any feed failed or timed out
+    """
+    if due_only:
+        monitors = monitoring.due_monitors(time.time())
+    else:
+        monitors = monitoring.list_monitors(active=True)
+    return run_checks(monitors)
+
+@mcp.tool()
+def list_monitors(monitor_type: Optional[str] = None, contact: Optional[str] = None,
+                  active_only: bool = False, limit: int = 100) -> Dict[str, Any]:
+    """
+    List stored monitors
+    
+    Args:
+        monitor_type: Only monitors of this type (job_postings, research_publications, industry_news)
+        contact: Only monitors alerting this contact
+        active_only: Skip paused monitors (default: False)
+        limit: Maximum number of monitors to return (default: 100)
+    
+    Returns:
+        Monitor counts and the matching monitors with their configuration
+    """
+    monitors = monitoring.list_monitors(
+        monitor_type, contact, True if active_only else None, max(1, min(limit, 1000))
+    )
+    return {"counts": monitoring.count_monitors(), "monitors": monitors}
+
+@mcp.tool()
+def set_monitor_active(monitor_id: str, active: bool) -> Dict[str, Any]:
+    """
+    Pause or resume a monitor
+    
+    Args:
+        monitor_id: ID returned when the monitor was created
+        active: False to pause the monitor, True to resume it
+    
+    Returns:
+        The monitor's ID and new state
+    """
+    if not monitoring.set_active(monitor_id, active):
+        return {"error": f"Monitor not found: {monitor_id}"}
+    if not active:
+        scheduler.unschedule(monitor_id)
+        keyword_matcher.remove_monitor(monitor_id)
+        return {"monitor_id": monitor_id, "active": False}
+
+    # A monitor that was due while paused is checked straight away
+    monitor = monitoring.get_monitor(monitor_id)
+    keyword_matcher.add_monitor(monitor_id, monitor_keywords(monitor))
+    stored = datetime.fromisoformat(monitor["next_check"]).timestamp() if monitor["next_check"] else None
+    next_check = max(stored or 0.0, time.time())
+    monitoring.set_next_check(monitor_id, next_check)
+    scheduler.reschedule(monitor_id, next_check)
+    return {"monitor_id": monitor_id, "active": True, "next_check": datetime.fromtimestamp(next_check).isoformat()}
+
+@mcp.tool()
+def delete_monitor(monitor_id: str) -> Dict[str, Any]:
+    """
+    Delete a monitor permanently
+    
+    Args:
+        monitor_id: ID returned when the monitor was created
+    
+    Returns:
+        Deletion confirmation
+    """
+    if not monitoring.delete_monitor(monitor_id):
+        return {"error": f"Monitor not found: {monitor_id}"}
+    scheduler.unschedule(monitor_id)
+    keyword_matcher.remove_monitor(monitor_id)
+    seen_items.forget_monitor(monitor_id)
+    return {"monitor_id": monitor_id, "deleted": True}
+
 @mcp.tool()
 def get_personalized_alerts(contact: str, days: int = 7) -> Dict[str, Any]:
     """
@@ -273,6 +1588,7 @@ def get_personalized_alerts(contact: str, days: int = 7) -> Dict[str, Any]:
         "contact": contact,
         "period": f"Last {days} days",
         "generated_at": datetime.now().isoformat(),
+        "recorded_alerts": monitoring.alerts_for(contact, days),
         "priority_alerts": [
             {
                 "type": "JOB_OPPORTUNITY",
@@ -368,5 +1684,40 @@ def create_smart_digest(topics: List[str], frequency: str = "weekly") -> Dict[st
         "delivery_schedule": f"Every {frequency} via WhatsApp"
     }
 
+@mcp.resource("monitoring://feeds")
+def get_feed_stats() -> str:
+    """
+    Report feed fetching statistics: fetch limits, fetches, failures and
+    timeouts, each host's token bucket, and the most recent fetches with
+    their latency.
+    """
+    return json.dumps(feed_fetcher.summary(), indent=2)
+
+@mcp.resource("monitoring://seen")
+def get_seen_stats() -> str:
+    """
+    Report seen-item deduplication statistics: items checked, new and
+    suppressed, how many lookups the Bloom filter answered without disk,
+    and the size of each tier.
+    """
+    return json.dumps(seen_items.summary(), indent=2)
+
+@mcp.resource("monitoring://schedule")
+def get_schedule() -> str:
+    """
+    Report the background scheduler's state: whether it is running, how
+    many monitors are scheduled, checks run, the worst lag behind a due
+    time, and the next monitors due.
+    """
+    return json.dumps(scheduler.summary(), indent=2)
+
+@mcp.resource("monitoring://matcher")
+def get_matcher_stats() -> str:
+    """
+    Report the shared keyword matcher: monitors and keywords loaded, trie
+    size, texts scanned and how often it has been rebuilt.
+    """
+    return json.dumps(keyword_matcher.summary(), indent=2)
+
 if __name__ == "__main__":
     mcp.run(transport='stdio')
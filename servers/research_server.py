@@ -1,16 +1,1032 @@
 import arxiv
+import argparse
 import json
+import math
+import numpy as np
 import os
-from typing import List
+import re
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+import urllib.parse
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
 from mcp.server.fastmcp import FastMCP
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
 
 # Get the project root directory (one level up from servers/)
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 PAPER_DIR = os.path.join(PROJECT_ROOT, "data", "papers")
+PAPER_INDEX_PATH = os.path.join(PAPER_DIR, "paper_index.db")
+
+# Per-topic storage: a compacted snapshot plus an append-only log of newer entries
+PAPERS_SNAPSHOT = "papers_info.json"
+PAPERS_LOG = "papers_info.jsonl"
+# Shared store holding one canonical record per paper ID, in the same format
+PAPER_STORE_SNAPSHOT = "paper_store.json"
+PAPER_STORE_LOG = "paper_store.jsonl"
+# The log is folded into the snapshot once it outgrows both this floor and the snapshot
+LOG_COMPACT_MIN_BYTES = 256 * 1024
+
+# Hashed bag-of-words vectors used by find_related_papers
+RELATED_DIR = os.path.join(PAPER_DIR, "related")
+RELATED_DIM = 512
+RELATED_INITIAL_CAPACITY = 1024
+RELATED_STOPWORDS = frozenset(
+    "the and for are with this that from our can which these their has have was were been "
+    "into than then also such using use used based via over under between its not but more "
+    "most all any both each other some only new show shows paper propose proposed approach "
+    "method methods results result we they them there where when how what while".split()
+)
+
+# Pagination of the papers://{topic} resource
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+TOPIC_SORTS = {
+    # name: ORDER BY over topic_papers, served by the (topic, column) indexes
+    "published": "published DESC, rowid",
+    "title": "title_key, rowid",
+}
+
+# arXiv API endpoint and politeness settings; override the URL to point at a local stub
+ARXIV_QUERY_URL = os.getenv("ARXIV_QUERY_URL", arxiv.Client.query_url_format)
+# arXiv's terms of use ask for no more than one request every three seconds
+ARXIV_MIN_INTERVAL = float(os.getenv("ARXIV_MIN_INTERVAL", "3.0"))
+MAX_BATCH_CONCURRENCY = 8
+# sync_topic pages through newest submissions in small steps so it can stop early
+SYNC_PAGE_SIZE = 50
+
+# On-disk cache of arXiv query results
+ARXIV_CACHE_PATH = os.path.join(PAPER_DIR, "arxiv_cache.db")
+ARXIV_CACHE_TTL = float(os.getenv("ARXIV_CACHE_TTL", str(6 * 60 * 60)))
+ARXIV_CACHE_MAX_BYTES = int(os.getenv("ARXIV_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
 
 # Initialize FastMCP server
 mcp = FastMCP("research")
 
+def topic_dir_name(topic: str) -> str:
+    """Normalize a topic into its folder name under PAPER_DIR."""
+    return topic.lower().replace(" ", "_")
+
+class RecordLog:
+    """
+    Crash-safe mapping of ID -> JSON value stored as a snapshot plus a log.
+
+    The snapshot is a JSON object; the append-only JSONL log holds entries
+    written since the last compaction. Writes only append to the log, which
+    is periodically folded into the snapshot and swapped in atomically.
+    Replaying the log over the snapshot is idempotent, so a crash at any
+    point leaves the data readable.
+    """
+
+    def __init__(self, snapshot_path: str, log_path: str):
+        self.snapshot_path = snapshot_path
+        self.log_path = log_path
+        self._lock = threading.RLock()
+
+    def exists(self) -> bool:
+        return os.path.exists(self.snapshot_path) or os.path.exists(self.log_path)
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Return every stored entry.
+
+        A truncated or corrupt log line (for example from a crash mid-append)
+        is skipped; all entries before it are kept.
+        """
+        entries = {}
+
+        try:
+            with open(self.snapshot_path, "r") as json_file:
+                entries = json.load(json_file)
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError as e:
+            print(f"Error reading {self.snapshot_path}: {str(e)}", file=sys.stderr)
+
+        try:
+            with open(self.log_path, "r") as log_file:
+                for line_number, line in enumerate(log_file, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                        entries[entry["id"]] = entry["record"]
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        print(f"Skipping corrupt entry at {self.log_path}:{line_number}", file=sys.stderr)
+        except FileNotFoundError:
+            pass
+
+        return entries
+
+    def append(self, entries: Dict[str, Any]) -> None:
+        """
+        Append new or updated entries to the log.
+
+        Write cost is proportional to the entries passed in, not to the size
+        of the stored mapping.
+        """
+        os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+        lines = "".join(
+            json.dumps({"id": entry_id, "record": value}) + "\n"
+            for entry_id, value in entries.items()
+        )
+
+        with self._lock:
+            self._repair_tail()
+            with open(self.log_path, "a") as log_file:
+                log_file.write(lines)
+                log_file.flush()
+                os.fsync(log_file.fileno())
+
+            snapshot_size = os.path.getsize(self.snapshot_path) if os.path.exists(self.snapshot_path) else 0
+            if os.path.getsize(self.log_path) > max(LOG_COMPACT_MIN_BYTES, snapshot_size):
+                self.compact()
+
+    def compact(self, entries: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Fold the log into a new snapshot, swapped in with an atomic rename.
+
+        If `entries` is given it replaces the stored contents instead.
+        """
+        with self._lock:
+            if entries is None:
+                entries = self.load()
+
+            tmp_path = self.snapshot_path + ".tmp"
+            with open(tmp_path, "w") as json_file:
+                json.dump(entries, json_file, indent=2)
+                json_file.flush()
+                os.fsync(json_file.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+
+            # The snapshot now contains every logged entry, so the log can be reset
+            with open(self.log_path, "w") as log_file:
+                os.fsync(log_file.fileno())
+
+    def _repair_tail(self) -> None:
+        """Drop a partially written last line so new entries start on a clean line."""
+        try:
+            with open(self.log_path, "rb+") as log_file:
+                log_file.seek(0, os.SEEK_END)
+                size = log_file.tell()
+                if size == 0:
+                    return
+                log_file.seek(size - 1)
+                if log_file.read(1) == b"\n":
+                    return
+                # Scan back to the last complete line
+                position = size - 1
+                while position > 0:
+                    step = min(4096, position)
+                    log_file.seek(position - step)
+                    chunk = log_file.read(step)
+                    newline = chunk.rfind(b"\n")
+                    if newline != -1:
+                        position = position - step + newline + 1
+                        break
+                    position -= step
+                log_file.truncate(position)
+                print(f"Truncated partial entry at end of {self.log_path}", file=sys.stderr)
+        except FileNotFoundError:
+            pass
+
+class TopicStore:
+    """
+    Per-topic paper membership.
+
+    Each topic folder holds a RecordLog (papers_info.json snapshot plus
+    papers_info.jsonl log) mapping paper IDs to an empty reference; the
+    paper records themselves live once in the shared paper store. Topics
+    written before the store existed embed full records as values, which
+    are still honoured when reading.
+    """
+
+    def __init__(self, paper_dir: str):
+        self.paper_dir = paper_dir
+
+    def _log(self, topic_dir: str) -> RecordLog:
+        path = os.path.join(self.paper_dir, topic_dir)
+        return RecordLog(os.path.join(path, PAPERS_SNAPSHOT), os.path.join(path, PAPERS_LOG))
+
+    def exists(self, topic_dir: str) -> bool:
+        """Whether any papers have been saved for this topic folder."""
+        return self._log(topic_dir).exists()
+
+    def topics(self) -> List[str]:
+        """List topic folders that contain saved papers."""
+        if not os.path.isdir(self.paper_dir):
+            return []
+        return [
+            topic_dir for topic_dir in sorted(os.listdir(self.paper_dir))
+            if os.path.isdir(os.path.join(self.paper_dir, topic_dir)) and self.exists(topic_dir)
+        ]
+
+    def load(self, topic_dir: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Return paper ID -> embedded value for a topic, in insertion order.
+
+        Values are empty references, or full records for legacy topics.
+        """
+        return self._log(topic_dir).load()
+
+    def add(self, topic_dir: str, paper_ids: List[str]) -> str:
+        """
+        Record paper IDs as members of a topic.
+
+        Returns:
+            Path of the topic log that was written
+        """
+        log = self._log(topic_dir)
+        log.append({paper_id: {} for paper_id in paper_ids})
+        return log.log_path
+
+    def strip_records(self, topic_dir: str) -> None:
+        """
+        Rewrite a legacy topic so it holds references only.
+
+        The original files are copied to `.bak` first, so the embedded
+        records survive even if the shared store is later lost.
+        """
+        log = self._log(topic_dir)
+        for path in (log.snapshot_path, log.log_path):
+            if os.path.exists(path) and not os.path.exists(path + ".bak"):
+                shutil.copy2(path, path + ".bak")
+        log.compact({paper_id: {} for paper_id in log.load()})
+
+topic_store = TopicStore(PAPER_DIR)
+
+# Canonical paper records, one per paper ID, shared by every topic
+paper_records = RecordLog(
+    os.path.join(PAPER_DIR, PAPER_STORE_SNAPSHOT),
+    os.path.join(PAPER_DIR, PAPER_STORE_LOG)
+)
+
+class PaperIndex:
+    """
+    Persistent paper ID -> (topic, record) index stored in SQLite.
+
+    Lets extract_info resolve a paper with a single primary-key lookup
+    instead of opening every topic folder. An FTS5 table over titles,
+    authors and summaries, kept in step with the same writes, provides
+    BM25-ranked full-text search of the local corpus. A topic manifest
+    (topic membership, paper counts and last-updated times) lets
+    papers://folders answer without touching the topic folders.
+
+    The index is derived data: it can always be rebuilt from the topic
+    store and the shared paper record store on disk.
+    """
+
+    def __init__(self, db_path: str, store: "TopicStore", records: RecordLog):
+        self.db_path = db_path
+        self.store = store
+        self.records = records
+        self._conn = None
+        # Set when the manifest tables were just created and must be filled from disk
+        self.needs_rebuild = False
+        # Batch searches write from worker threads, so serialize access
+        self._lock = threading.RLock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS papers (
+                    paper_id TEXT PRIMARY KEY,
+                    topic TEXT NOT NULL,
+                    record TEXT NOT NULL
+                )
+                """
+            )
+            has_fts = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'papers_fts'"
+            ).fetchone()
+            self._conn.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+                    paper_id UNINDEXED, title, authors, summary,
+                    tokenize = 'porter unicode61'
+                )
+                """
+            )
+            if not has_fts:
+                # Index databases created before full-text search existed
+                rows = self._conn.execute("SELECT paper_id, record FROM papers").fetchall()
+                self._index_text(self._conn, {paper_id: json.loads(record) for paper_id, record in rows})
+            has_manifest = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'topics'"
+            ).fetchone()
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS topic_papers (
+                    topic TEXT NOT NULL,
+                    paper_id TEXT NOT NULL,
+                    published TEXT NOT NULL DEFAULT '',
+                    title_key TEXT NOT NULL DEFAULT '',
+                    authors_key TEXT NOT NULL DEFAULT '',
+                    PRIMARY KEY (topic, paper_id)
+                )
+                """
+            )
+            # Sort and filter columns are copied from each record so topic pages are index lookups
+            member_columns = {row[1] for row in self._conn.execute("PRAGMA table_info(topic_papers)")}
+            if "published" not in member_columns:
+                for column in ("published", "title_key", "authors_key"):
+                    self._conn.execute(f"ALTER TABLE topic_papers ADD COLUMN {column} TEXT NOT NULL DEFAULT ''")
+                rows = self._conn.execute("SELECT paper_id, record FROM papers").fetchall()
+                self._conn.executemany(
+                    "UPDATE topic_papers SET published = ?, title_key = ?, authors_key = ? WHERE paper_id = ?",
+                    [(*self._member_keys(json.loads(record)), paper_id) for paper_id, record in rows]
+                )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_topic_papers_order ON topic_papers (topic)")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_topic_papers_published ON topic_papers (topic, published)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_topic_papers_title ON topic_papers (topic, title_key)"
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS topics (
+                    topic TEXT PRIMARY KEY,
+                    paper_count INTEGER NOT NULL,
+                    last_updated TEXT NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS topic_sync (
+                    topic TEXT PRIMARY KEY,
+                    last_published TEXT NOT NULL,
+                    last_paper_id TEXT NOT NULL,
+                    last_synced TEXT NOT NULL,
+                    resume_offset INTEGER NOT NULL DEFAULT 0,
+                    pending_published TEXT,
+                    pending_paper_id TEXT
+                )
+                """
+            )
+            sync_columns = {row[1] for row in self._conn.execute("PRAGMA table_info(topic_sync)")}
+            if "resume_offset" not in sync_columns:
+                self._conn.execute("ALTER TABLE topic_sync ADD COLUMN resume_offset INTEGER NOT NULL DEFAULT 0")
+                self._conn.execute("ALTER TABLE topic_sync ADD COLUMN pending_published TEXT")
+                self._conn.execute("ALTER TABLE topic_sync ADD COLUMN pending_paper_id TEXT")
+            # Also rebuild indexes created before the shared paper store existed
+            has_papers = self._conn.execute("SELECT 1 FROM papers LIMIT 1").fetchone()
+            self.needs_rebuild = not has_manifest or (has_papers is not None and not self.records.exists())
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def _index_text(conn: sqlite3.Connection, papers_info: Dict[str, Dict[str, Any]]) -> None:
+        conn.executemany(
+            "DELETE FROM papers_fts WHERE paper_id = ?", [(paper_id,) for paper_id in papers_info]
+        )
+        conn.executemany(
+            "INSERT INTO papers_fts (paper_id, title, authors, summary) VALUES (?, ?, ?, ?)",
+            [
+                (paper_id, info.get("title", ""), ", ".join(info.get("authors", [])), info.get("summary", ""))
+                for paper_id, info in papers_info.items()
+            ]
+        )
+
+    @staticmethod
+    def _member_keys(info: Dict[str, Any]) -> tuple:
+        """Published date, title sort key and author search key of a record."""
+        authors = "\x1f".join(name.lower() for name in info.get("authors", []))
+        return info.get("published", ""), info.get("title", "").lower(), authors
+
+    def upsert(self, topic: str, papers_info: Dict[str, Dict[str, Any]]) -> None:
+        """Record (or refresh) the topic and metadata of each paper."""
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO papers (paper_id, topic, record) VALUES (?, ?, ?)",
+                [(paper_id, topic, json.dumps(info)) for paper_id, info in papers_info.items()]
+            )
+            self._index_text(self.conn, papers_info)
+            keys = {paper_id: self._member_keys(info) for paper_id, info in papers_info.items()}
+            added = self.conn.executemany(
+                "INSERT OR IGNORE INTO topic_papers (topic, paper_id, published, title_key, authors_key) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(topic, paper_id, *member_keys) for paper_id, member_keys in keys.items()]
+            ).rowcount
+            # A refreshed record may be a member of other topics too
+            self.conn.executemany(
+                "UPDATE topic_papers SET published = ?, title_key = ?, authors_key = ? WHERE paper_id = ?",
+                [(*member_keys, paper_id) for paper_id, member_keys in keys.items()]
+            )
+            self.conn.execute(
+                """
+                INSERT INTO topics (topic, paper_count, last_updated) VALUES (?, ?, ?)
+                ON CONFLICT (topic) DO UPDATE SET
+                    paper_count = paper_count + excluded.paper_count,
+                    last_updated = excluded.last_updated
+                """,
+                (topic, max(added, 0), datetime.now().isoformat(timespec="seconds"))
+            )
+
+    def _ready(self) -> sqlite3.Connection:
+        """
+        Return the connection, first indexing corpora saved before the
+        current tables existed (done once, on first read).
+        """
+        conn = self.conn
+        if self.needs_rebuild:
+            self.rebuild()
+        return conn
+
+    def topics(self) -> List[Dict[str, Any]]:
+        """Return the topic manifest: name, paper count and last update, by name."""
+        with self._lock:
+            rows = self._ready().execute(
+                "SELECT topic, paper_count, last_updated FROM topics ORDER BY topic"
+            ).fetchall()
+        return [
+            {"topic": topic, "paper_count": paper_count, "last_updated": last_updated}
+            for topic, paper_count, last_updated in rows
+        ]
+
+    def lookup(self, paper_id: str) -> Optional[Dict[str, Any]]:
+        """Return {"topic": ..., "record": ...} for a paper, or None if unknown."""
+        with self._lock:
+            row = self._ready().execute(
+                "SELECT topic, record FROM papers WHERE paper_id = ?", (paper_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"topic": row[0], "record": json.loads(row[1])}
+
+    def get_many(self, paper_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Return the records of the given papers that are in the index."""
+        records = {}
+        with self._lock:
+            conn = self._ready()
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(paper_ids), 500):
+                chunk = paper_ids[start:start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                for paper_id, record in conn.execute(
+                    f"SELECT paper_id, record FROM papers WHERE paper_id IN ({placeholders})", chunk
+                ):
+                    records[paper_id] = json.loads(record)
+        return records
+
+    def topic_page(self, topic: str, offset: int, limit: int, sort: Optional[str] = None,
+                   author: Optional[str] = None, published_after: Optional[str] = None,
+                   published_before: Optional[str] = None) -> tuple:
+        """
+        Return (matching paper count, [(paper_id, record), ...]) for one page
+        of a topic's papers, oldest saved first unless `sort` is given.
+
+        Sorting, date filters and paging run on the topic_papers indexes,
+        and only the page's records are decoded.
+        """
+        where = "topic = ?"
+        params: list = [topic]
+        if published_after:
+            where += " AND published >= ?"
+            params.append(published_after)
+        if published_before:
+            where += " AND published <= ?"
+            params.append(published_before)
+        if author:
+            where += " AND instr(authors_key, ?) > 0"
+            params.append(author.lower())
+        with self._lock:
+            conn = self._ready()
+            if len(params) == 1:
+                row = conn.execute("SELECT paper_count FROM topics WHERE topic = ?", (topic,)).fetchone()
+                total = row[0] if row else 0
+            else:
+                total = conn.execute(f"SELECT COUNT(*) FROM topic_papers WHERE {where}", params).fetchone()[0]
+            page_ids = [row[0] for row in conn.execute(
+                f"SELECT paper_id FROM topic_papers WHERE {where} "
+                f"ORDER BY {TOPIC_SORTS[sort] if sort else 'rowid'} LIMIT ? OFFSET ?",
+                [*params, limit, offset]
+            )]
+        records = self.get_many(page_ids)
+        return total, [(paper_id, records[paper_id]) for paper_id in page_ids if paper_id in records]
+
+    def known_members(self, topic: str, paper_ids: List[str]) -> set:
+        """Return which of the given papers are already members of a topic."""
+        members = set()
+        with self._lock:
+            conn = self._ready()
+            for start in range(0, len(paper_ids), 500):
+                chunk = paper_ids[start:start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                members.update(
+                    row[0] for row in conn.execute(
+                        f"SELECT paper_id FROM topic_papers WHERE topic = ? AND paper_id IN ({placeholders})",
+                        [topic, *chunk]
+                    )
+                )
+        return members
+
+    def sync_state(self, topic: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a topic's sync high-water mark, or None if it was never synced.
+
+        While a sync is unfinished, `resume_offset` is how far into the
+        newest-first results it got, and `pending_published` and
+        `pending_paper_id` name the newest paper it has seen. That paper
+        becomes the mark once the sync finishes.
+        """
+        with self._lock:
+            row = self._ready().execute(
+                "SELECT last_published, last_paper_id, last_synced, resume_offset, pending_published, "
+                "pending_paper_id FROM topic_sync WHERE topic = ?", (topic,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"last_published": row[0], "last_paper_id": row[1], "last_synced": row[2],
+                "resume_offset": row[3], "pending_published": row[4], "pending_paper_id": row[5]}
+
+    def set_sync_state(self, topic: str, last_published: str, last_paper_id: str, resume_offset: int = 0,
+                       pending_published: Optional[str] = None, pending_paper_id: Optional[str] = None) -> None:
+        """Record a topic's sync high-water mark and, for an unfinished sync, where to resume."""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO topic_sync (topic, last_published, last_paper_id, last_synced, "
+                "resume_offset, pending_published, pending_paper_id) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (topic, last_published, last_paper_id, datetime.now().isoformat(timespec="seconds"),
+                 resume_offset, pending_published, pending_paper_id)
+            )
+
+    def search(self, query: str, k: int) -> List[Dict[str, Any]]:
+        """
+        Return the k best BM25 matches for a free-text query.
+
+        Titles weigh more than authors, and authors more than summaries.
+        """
+        # Quote each term so user input can't be parsed as FTS5 query syntax
+        terms = re.findall(r"\w+", query.lower())
+        if not terms or k <= 0:
+            return []
+        match = " OR ".join(f'"{term}"' for term in terms)
+        with self._lock:
+            rows = self._ready().execute(
+                """
+                SELECT p.paper_id, p.topic, p.record, bm25(papers_fts, 0.0, 3.0, 2.0, 1.0) AS rank
+                FROM papers_fts
+                JOIN papers p ON p.paper_id = papers_fts.paper_id
+                WHERE papers_fts MATCH ?
+                ORDER BY rank
+                LIMIT ?
+                """,
+                (match, k)
+            ).fetchall()
+        results = []
+        for paper_id, topic, record, rank in rows:
+            info = json.loads(record)
+            results.append({
+                "paper_id": paper_id,
+                "topic": topic,
+                "title": info.get("title"),
+                "authors": info.get("authors", []),
+                "published": info.get("published"),
+                # SQLite's bm25() is negated so that better matches sort first
+                "score": round(-rank, 4)
+            })
+        return results
+
+    def rebuild(self) -> Dict[str, int]:
+        """
+        Re-create the index from the topic store and the paper record store.
+
+        Records embedded in topics saved before the shared store existed are
+        moved into it, and those topics are rewritten to hold references only.
+        """
+        with self._lock:
+            self.needs_rebuild = False
+            with self.conn:
+                self.conn.execute("DELETE FROM papers")
+                self.conn.execute("DELETE FROM papers_fts")
+                self.conn.execute("DELETE FROM topic_papers")
+                self.conn.execute("DELETE FROM topics")
+
+            canonical = self.records.load()
+            migrated = {}
+            legacy_topics = []
+            indexed = set()
+            for topic_dir in self.store.topics():
+                papers_info = {}
+                for paper_id, value in self.store.load(topic_dir).items():
+                    if value:
+                        if topic_dir not in legacy_topics:
+                            legacy_topics.append(topic_dir)
+                        if paper_id not in canonical:
+                            canonical[paper_id] = migrated[paper_id] = value
+                    if paper_id in canonical:
+                        papers_info[paper_id] = canonical[paper_id]
+                self.upsert(topic_dir, papers_info)
+                indexed.update(papers_info)
+
+            # Persist migrated records before dropping them from their topics
+            if migrated:
+                self.records.append(migrated)
+            for topic_dir in legacy_topics:
+                self.store.strip_records(topic_dir)
+
+        return {
+            "topics_indexed": len(self.store.topics()),
+            "papers_indexed": len(indexed),
+            "records_migrated": len(migrated)
+        }
+
+paper_index = PaperIndex(PAPER_INDEX_PATH, topic_store, paper_records)
+
+class RelatedIndex:
+    """
+    Hashed bag-of-words vectors of every stored paper, for similarity search.
+
+    Each paper's title and summary are hashed into RELATED_DIM buckets with
+    sublinear term frequency and L2-normalized, so a dot product is the
+    cosine similarity. Rows live in a memory-mapped .npy matrix whose
+    capacity doubles as it fills; paper_ids.txt maps rows to paper IDs and
+    is only appended to, after the row has been written. A `backfilled`
+    marker records that every paper stored before the index existed has
+    been vectorized, since papers saved since then are added as they come.
+    """
+
+    def __init__(self, directory: str, dim: int):
+        self.directory = directory
+        self.dim = dim
+        self.matrix_path = os.path.join(directory, "vectors.npy")
+        self.ids_path = os.path.join(directory, "paper_ids.txt")
+        self.marker_path = os.path.join(directory, "backfilled")
+        self._matrix = None
+        self._ids = None
+        self._rows = None
+        self._lock = threading.RLock()
+
+    def _load(self) -> None:
+        if self._ids is not None:
+            return
+        self._ids = []
+        if os.path.exists(self.ids_path):
+            with open(self.ids_path, "r") as ids_file:
+                self._ids = [line.strip() for line in ids_file if line.strip()]
+        if os.path.exists(self.matrix_path):
+            self._matrix = np.load(self.matrix_path, mmap_mode="r+")
+            # Ignore IDs without a row (not expected, but never index past the matrix)
+            self._ids = self._ids[:self._matrix.shape[0]]
+        self._rows = {paper_id: row for row, paper_id in enumerate(self._ids)}
+
+    @property
+    def count(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._ids)
+
+    @property
+    def backfilled(self) -> bool:
+        return os.path.exists(self.marker_path)
+
+    def _mark_backfilled(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.marker_path, "w"):
+            pass
+
+    def __contains__(self, paper_id: str) -> bool:
+        with self._lock:
+            self._load()
+            return paper_id in self._rows
+
+    def vectorize(self, text: str) -> np.ndarray:
+        """Hash text into a unit-length float32 vector."""
+        counts = {}
+        for token in re.findall(r"[a-z0-9]+", text.lower()):
+            if len(token) < 3 or token in RELATED_STOPWORDS:
+                continue
+            counts[token] = counts.get(token, 0) + 1
+
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token, count in counts.items():
+            # crc32 is stable across processes, unlike hash()
+            digest = zlib.crc32(token.encode())
+            sign = 1.0 if digest & 0x80000000 else -1.0
+            vector[digest % self.dim] += sign * (1.0 + math.log(count))
+
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+    def _ensure_capacity(self, rows: int) -> None:
+        capacity = self._matrix.shape[0] if self._matrix is not None else 0
+        if rows <= capacity:
+            return
+        new_capacity = max(RELATED_INITIAL_CAPACITY, capacity)
+        while new_capacity < rows:
+            new_capacity *= 2
+
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self.matrix_path + ".tmp.npy"
+        grown = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32, shape=(new_capacity, self.dim))
+        if capacity:
+            grown[:capacity] = self._matrix
+        grown.flush()
+        del grown
+        self._matrix = None
+        os.replace(tmp_path, self.matrix_path)
+        self._matrix = np.load(self.matrix_path, mmap_mode="r+")
+
+    def add(self, papers_info: Dict[str, Dict[str, Any]]) -> None:
+        """Add new papers and refresh the vectors of papers already indexed."""
+        if not papers_info:
+            return
+        with self._lock:
+            self._load()
+            new_ids = [paper_id for paper_id in papers_info if paper_id not in self._rows]
+            new_rows = {paper_id: len(self._ids) + offset for offset, paper_id in enumerate(new_ids)}
+            self._ensure_capacity(len(self._ids) + len(new_ids))
+
+            for paper_id, info in papers_info.items():
+                row = self._rows.get(paper_id, new_rows.get(paper_id))
+                self._matrix[row] = self.vectorize(f"{info.get('title', '')} {info.get('summary', '')}")
+            self._matrix.flush()
+
+            # Publish new rows only once their vectors are on disk
+            if new_ids:
+                with open(self.ids_path, "a") as ids_file:
+                    ids_file.write("".join(paper_id + "\n" for paper_id in new_ids))
+                    ids_file.flush()
+                    os.fsync(ids_file.fileno())
+                for paper_id in new_ids:
+                    self._rows[paper_id] = len(self._ids)
+                    self._ids.append(paper_id)
+
+    def neighbours(self, paper_id: str, k: int) -> List[Dict[str, Any]]:
+        """Return the k most similar papers (cosine similarity), best first."""
+        with self._lock:
+            self._load()
+            row = self._rows.get(paper_id)
+            count = len(self._ids)
+            if row is None or count < 2 or k <= 0:
+                return []
+            matrix = self._matrix[:count]
+            similarities = matrix @ matrix[row]
+            similarities[row] = -np.inf
+
+            k = min(k, count - 1)
+            # argpartition finds the top k in linear time; only those k get sorted
+            top = np.argpartition(-similarities, k - 1)[:k]
+            top = top[np.argsort(-similarities[top])]
+            return [
+                {"paper_id": self._ids[index], "similarity": round(float(similarities[index]), 4)}
+                for index in top
+            ]
+
+    def backfill(self, papers_info: Dict[str, Dict[str, Any]]) -> int:
+        """Vectorize the stored papers not yet indexed; returns how many were added."""
+        with self._lock:
+            self._load()
+            missing = {paper_id: info for paper_id, info in papers_info.items() if paper_id not in self._rows}
+            self.add(missing)
+            self._mark_backfilled()
+            return len(missing)
+
+    def rebuild(self, papers_info: Dict[str, Dict[str, Any]]) -> int:
+        """Re-create the vectors from scratch; returns the number of papers indexed."""
+        with self._lock:
+            self._matrix = None
+            for path in (self.matrix_path, self.ids_path, self.marker_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._ids = []
+            self._rows = {}
+            self.add(papers_info)
+            self._mark_backfilled()
+            return len(self._ids)
+
+related_index = RelatedIndex(RELATED_DIR, RELATED_DIM)
+
+class ArxivScheduler:
+    """
+    Process-wide rate limiter for arXiv API requests.
+
+    Every request reserves the next free slot, spaced min_interval seconds
+    apart, so concurrent searches share one request budget instead of each
+    keeping its own delay.
+    """
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until the caller may send its request."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+arxiv_scheduler = ArxivScheduler(ARXIV_MIN_INTERVAL)
+
+class QueryCache:
+    """
+    Disk-backed TTL cache of arXiv query results.
+
+    Entries are keyed by (topic, max_results, sort) and expire after `ttl`
+    seconds. When the stored payloads exceed `max_bytes`, the least recently
+    used entries are evicted first.
+    """
+
+    def __init__(self, db_path: str, ttl: float, max_bytes: int):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+        self._conn = None
+        self._lock = threading.RLock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS query_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_query_cache_last_access ON query_cache (last_access)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def make_key(topic: str, max_results: int, sort_by: arxiv.SortCriterion) -> str:
+        return json.dumps([" ".join(topic.lower().split()), max_results, sort_by.value])
+
+    def get(self, key: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Return the cached records for a key, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock, self.conn:
+            row = self.conn.execute(
+                "SELECT payload, created_at FROM query_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            if now - row[1] > self.ttl:
+                self.conn.execute("DELETE FROM query_cache WHERE cache_key = ?", (key,))
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+            self.conn.execute(
+                "UPDATE query_cache SET last_access = ? WHERE cache_key = ?", (now, key)
+            )
+            self.stats["hits"] += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, papers_info: Dict[str, Dict[str, Any]]) -> None:
+        """Store records for a key and evict LRU entries beyond the size bound."""
+        payload = json.dumps(papers_info)
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO query_cache (cache_key, payload, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now)
+            )
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM query_cache").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            for evict_key, size in self.conn.execute(
+                "SELECT cache_key, size FROM query_cache ORDER BY last_access ASC"
+            ).fetchall():
+                if total <= self.max_bytes or evict_key == key:
+                    break
+                self.conn.execute("DELETE FROM query_cache WHERE cache_key = ?", (evict_key,))
+                total -= size
+                self.stats["evictions"] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process plus the current cache footprint."""
+        with self._lock:
+            entries, size = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM query_cache"
+            ).fetchone()
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+                "entries": entries,
+                "size_bytes": size,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl
+            }
+
+query_cache = QueryCache(ARXIV_CACHE_PATH, ARXIV_CACHE_TTL, ARXIV_CACHE_MAX_BYTES)
+
+class ScheduledArxivClient(arxiv.Client):
+    """arxiv.Client whose page requests (including retries) go through the shared scheduler."""
+
+    query_url_format = ARXIV_QUERY_URL
+
+    def __init__(self, page_size: int = 100, num_retries: int = 3):
+        # Spacing is enforced by arxiv_scheduler, so the per-client delay is disabled
+        super().__init__(page_size=page_size, delay_seconds=0, num_retries=num_retries)
+
+    def _parse_feed(self, *args, **kwargs):
+        arxiv_scheduler.wait()
+        return super()._parse_feed(*args, **kwargs)
+
+# _parse_feed is private to arxiv.Client (pinned below 5 in pyproject.toml); refuse to
+# start rather than silently lose rate limiting if a release renames it
+if not callable(getattr(arxiv.Client, "_parse_feed", None)):
+    raise ImportError("arxiv.Client._parse_feed not found; ScheduledArxivClient needs updating for this arxiv release")
+
+def paper_record(paper: arxiv.Result) -> Dict[str, Any]:
+    """Convert an arXiv result into the stored paper record."""
+    return {
+        'title': paper.title,
+        'authors': [author.name for author in paper.authors],
+        'summary': paper.summary,
+        'pdf_url': paper.pdf_url,
+        'published': str(paper.published.date())
+    }
+
+def base_paper_id(paper_id: str) -> str:
+    """Strip the version suffix from an arXiv short ID (2301.07041v2 -> 2301.07041)."""
+    return re.sub(r"v\d+$", "", paper_id)
+
+def fetch_papers(topic: str, max_results: int, sort_by: arxiv.SortCriterion = arxiv.SortCriterion.Relevance) -> Dict[str, Dict[str, Any]]:
+    """
+    Query arXiv and return paper records keyed by short ID, in result order.
+
+    Repeat queries within ARXIV_CACHE_TTL are answered from the query cache.
+    """
+    cache_key = QueryCache.make_key(topic, max_results, sort_by)
+    cached = query_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    client = ScheduledArxivClient(page_size=min(max(max_results, 1), 2000))
+
+    search = arxiv.Search(
+        query = topic,
+        max_results = max_results,
+        sort_by = sort_by
+    )
+
+    papers_info = {}
+    for paper in client.results(search):
+        papers_info[paper.get_short_id()] = paper_record(paper)
+
+    query_cache.put(cache_key, papers_info)
+    return papers_info
+
+def save_papers(topic: str, papers_info: Dict[str, Dict[str, Any]]) -> str:
+    """
+    Persist records for a topic and update the paper ID index.
+
+    Each record is stored once in the shared paper store, and only if it is
+    new or changed; the topic itself records membership references.
+
+    Returns:
+        Path of the topic log that was written
+    """
+    topic_dir = topic_dir_name(topic)
+    paper_ids = list(papers_info)
+
+    known = paper_index.get_many(paper_ids)
+    changed = {paper_id: info for paper_id, info in papers_info.items() if known.get(paper_id) != info}
+    if changed:
+        paper_records.append(changed)
+        related_index.add(changed)
+
+    members = paper_index.known_members(topic_dir, paper_ids)
+    file_path = topic_store.add(topic_dir, [paper_id for paper_id in paper_ids if paper_id not in members])
+
+    # Keep the global paper ID index in sync with the stores
+    paper_index.upsert(topic_dir, papers_info)
+
+    return file_path
+
 @mcp.tool()
 def search_papers(topic: str, max_results: int = 5) -> List[str]:
     """
@@ -24,51 +1040,168 @@ def search_papers(topic: str, max_results: int = 5) -> List[str]:
         List of paper IDs found in the search
     """
     
-    # Use arxiv to find the papers 
-    client = arxiv.Client()
-
     # Search for the most relevant articles matching the queried topic
-    search = arxiv.Search(
-        query = topic,
-        max_results = max_results,
-        sort_by = arxiv.SortCriterion.Relevance
-    )
+    papers_info = fetch_papers(topic, max_results)
+    
+    file_path = save_papers(topic, papers_info)
+    
+    print(f"Results are saved in: {file_path}", file=sys.stderr)
+    
+    return list(papers_info.keys())
 
-    papers = client.results(search)
+@mcp.tool()
+def search_papers_batch(topics: List[str], max_results: int = 5, concurrency: int = 4) -> Dict[str, Any]:
+    """
+    Search arXiv for many topics concurrently and store each topic's results.
     
-    # Create directory for this topic
-    path = os.path.join(PAPER_DIR, topic.lower().replace(" ", "_"))
-    os.makedirs(path, exist_ok=True)
+    Requests from all topics share one arXiv rate limiter, and each topic is
+    written to disk as soon as its results arrive.
     
-    file_path = os.path.join(path, "papers_info.json")
+    Args:
+        topics: The topics to search for
+        max_results: Maximum number of results to retrieve per topic (default: 5)
+        concurrency: Number of topics searched in parallel (default: 4, max: 8)
+        
+    Returns:
+        Per-topic paper IDs and timings, plus totals for the whole batch
+    """
+    # Topics that normalize to the same folder would race on the same files
+    unique_topics = {}
+    for topic in topics:
+        unique_topics.setdefault(topic_dir_name(topic), topic)
 
-    # Try to load existing papers info
-    try:
-        with open(file_path, "r") as json_file:
-            papers_info = json.load(json_file)
-    except (FileNotFoundError, json.JSONDecodeError):
-        papers_info = {}
-
-    # Process each paper and add to papers_info  
-    paper_ids = []
-    for paper in papers:
-        paper_ids.append(paper.get_short_id())
-        paper_info = {
-            'title': paper.title,
-            'authors': [author.name for author in paper.authors],
-            'summary': paper.summary,
-            'pdf_url': paper.pdf_url,
-            'published': str(paper.published.date())
+    def search_one(topic: str) -> Dict[str, Any]:
+        started = time.perf_counter()
+        papers_info = fetch_papers(topic, max_results)
+        save_papers(topic, papers_info)
+        return {
+            "paper_ids": list(papers_info.keys()),
+            "seconds": round(time.perf_counter() - started, 3)
         }
-        papers_info[paper.get_short_id()] = paper_info
+
+    results = {}
+    failed = 0
+    batch_started = time.perf_counter()
+    workers = max(1, min(concurrency, MAX_BATCH_CONCURRENCY, len(unique_topics) or 1))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(search_one, topic): topic for topic in unique_topics.values()}
+        for future in as_completed(futures):
+            topic = futures[future]
+            try:
+                results[topic] = future.result()
+            except Exception as e:
+                failed += 1
+                results[topic] = {"paper_ids": [], "error": str(e)}
+                print(f"Batch search failed for {topic}: {str(e)}", file=sys.stderr)
+
+    return {
+        "results": results,
+        "topics_searched": len(unique_topics),
+        "topics_failed": failed,
+        "total_papers": sum(len(result["paper_ids"]) for result in results.values()),
+        "elapsed_seconds": round(time.perf_counter() - batch_started, 3)
+    }
+
+@mcp.tool()
+def sync_topic(topic: str, max_results: int = 200) -> Dict[str, Any]:
+    """
+    Fetch only the papers on a topic submitted since the last sync.
+    
+    Asks arXiv for the newest submissions first and pages through them until
+    it reaches a paper that is already stored (or one older than the topic's
+    high-water mark), so a routine refresh only downloads the new delta.
+    
+    If `max_results` runs out first, the sync is incomplete: the mark stays
+    put and the next call resumes paging where this one stopped, skipping
+    the papers it already stored, until it reaches the old mark.
+    
+    Args:
+        topic: The topic to refresh
+        max_results: Upper bound on results scanned in one sync (default: 200)
+        
+    Returns:
+        New paper IDs, the previous and updated high-water marks, scan stats,
+        and whether the sync reached the old mark (`complete`)
+    """
+    started = time.perf_counter()
+    topic_dir = topic_dir_name(topic)
     
-    # Save updated papers_info to json file
-    with open(file_path, "w") as json_file:
-        json.dump(papers_info, json_file, indent=2)
+    members = list(topic_store.load(topic_dir)) if topic_store.exists(topic_dir) else []
+    known = {base_paper_id(paper_id) for paper_id in members}
     
-    print(f"Results are saved in: {file_path}")
+    state = paper_index.sync_state(topic_dir)
+    if state is None and members:
+        # Never synced: derive the mark from what is already stored
+        records = paper_index.get_many(members)
+        newest = max(records.items(), key=lambda item: item[1].get("published", ""), default=None)
+        if newest is not None:
+            state = {"last_published": newest[1]["published"], "last_paper_id": newest[0]}
+    previous_mark = state["last_published"] if state else None
+    resume_offset = state.get("resume_offset") or 0 if state else 0
     
-    return paper_ids
+    client = ScheduledArxivClient(page_size=min(max(max_results, 1), SYNC_PAGE_SIZE))
+    search = arxiv.Search(
+        query = topic,
+        max_results = resume_offset + max_results,
+        sort_by = arxiv.SortCriterion.SubmittedDate,
+        sort_order = arxiv.SortOrder.Descending
+    )
+    
+    new_papers = {}
+    scanned = 0
+    reached_known = False
+    for paper in client.results(search, offset=resume_offset):
+        scanned += 1
+        paper_id = paper.get_short_id()
+        record = paper_record(paper)
+        if previous_mark and record["published"] < previous_mark:
+            reached_known = True
+            break
+        if base_paper_id(paper_id) in known:
+            if resume_offset:
+                # Stored by the unfinished sync being resumed; the old mark is further down
+                continue
+            # Results are newest first, so everything after this is already stored
+            reached_known = True
+            break
+        new_papers[paper_id] = record
+    
+    if new_papers:
+        save_papers(topic, new_papers)
+    
+    # Fewer results than asked for means arXiv has nothing older left to page through.
+    # A first sync has no mark to reach and just sets the baseline.
+    complete = reached_known or scanned < max_results or previous_mark is None
+    last_published, last_paper_id = (state["last_published"], state["last_paper_id"]) if state else ("", "")
+    newest_published, newest_paper_id = last_published, last_paper_id
+    if state and state.get("pending_published") and state["pending_published"] > newest_published:
+        newest_published, newest_paper_id = state["pending_published"], state["pending_paper_id"]
+    for paper_id, record in new_papers.items():
+        if record["published"] > newest_published:
+            newest_published, newest_paper_id = record["published"], paper_id
+    if complete:
+        last_published, last_paper_id = newest_published, newest_paper_id
+        if last_published:
+            paper_index.set_sync_state(topic_dir, last_published, last_paper_id)
+    else:
+        # Don't move the mark past papers that haven't been fetched yet
+        paper_index.set_sync_state(topic_dir, last_published, last_paper_id, resume_offset + scanned,
+                                   newest_published, newest_paper_id)
+    
+    result = {
+        "topic": topic,
+        "new_paper_ids": list(new_papers),
+        "previous_high_water_mark": previous_mark,
+        "high_water_mark": last_published or None,
+        "results_scanned": scanned,
+        "reached_known_papers": reached_known,
+        "complete": complete,
+        "elapsed_seconds": round(time.perf_counter() - started, 3)
+    }
+    if not complete:
+        result["resume_offset"] = resume_offset + scanned
+        result["hint"] = "max_results ran out before reaching the previous sync; call sync_topic again to continue"
+    return result
 
 @mcp.tool()
 def extract_info(paper_id: str) -> str:
@@ -81,88 +1214,204 @@ def extract_info(paper_id: str) -> str:
     Returns:
         JSON string with paper information if found, error message if not found
     """
- 
-    for item in os.listdir(PAPER_DIR):
-        item_path = os.path.join(PAPER_DIR, item)
-        if os.path.isdir(item_path):
-            file_path = os.path.join(item_path, "papers_info.json")
-            if os.path.isfile(file_path):
-                try:
-                    with open(file_path, "r") as json_file:
-                        papers_info = json.load(json_file)
-                        if paper_id in papers_info:
-                            return json.dumps(papers_info[paper_id], indent=2)
-                except (FileNotFoundError, json.JSONDecodeError) as e:
-                    print(f"Error reading {file_path}: {str(e)}")
-                    continue
+    entry = paper_index.lookup(paper_id)
+    if entry is not None:
+        return json.dumps(entry["record"], indent=2)
     
     return f"There's no saved information related to paper {paper_id}."
 
+@mcp.tool()
+def search_local_papers(query: str, k: int = 10) -> List[Dict[str, Any]]:
+    """
+    Full-text search over saved papers, ranked with BM25.
+    
+    Matches titles, authors and summaries of every paper already stored
+    under data/papers, without calling arXiv.
+    
+    Args:
+        query: Free-text search terms
+        k: Maximum number of results to return (default: 10)
+        
+    Returns:
+        Matching papers with their topic, title, authors, published date and score
+    """
+    return paper_index.search(query, k)
+
+@mcp.tool()
+def find_related_papers(paper_id: str, k: int = 5) -> List[Dict[str, Any]]:
+    """
+    Find the stored papers most similar to a given paper.
+    
+    Compares hashed bag-of-words vectors of titles and summaries with cosine
+    similarity, entirely from the local corpus.
+    
+    Args:
+        paper_id: The ID of a stored paper
+        k: Number of related papers to return (default: 5)
+        
+    Returns:
+        Related papers with their title, published date and similarity score, best first
+    """
+    # Vectorize papers saved before the related index existed, even if newer ones were added since
+    if not related_index.backfilled and paper_records.exists():
+        related_index.backfill(paper_records.load())
+    
+    if paper_id not in related_index:
+        entry = paper_index.lookup(paper_id)
+        if entry is None:
+            return [{"error": f"There's no saved information related to paper {paper_id}."}]
+        related_index.add({paper_id: entry["record"]})
+    
+    neighbours = related_index.neighbours(paper_id, k)
+    records = paper_index.get_many([neighbour["paper_id"] for neighbour in neighbours])
+    for neighbour in neighbours:
+        record = records.get(neighbour["paper_id"], {})
+        neighbour["title"] = record.get("title")
+        neighbour["published"] = record.get("published")
+    return neighbours
+
+@mcp.tool()
+def rebuild_paper_index() -> Dict[str, int]:
+    """
+    Rebuild the paper ID index from the topic folders and paper store on disk.
 
+    Corpora saved before the index existed are indexed automatically on
+    first use; run this after editing the stored files by hand.
+
+    Returns:
+        Number of topics and papers indexed, legacy records migrated and
+        papers vectorized for find_related_papers
+    """
+    stats = paper_index.rebuild()
+    stats["papers_vectorized"] = related_index.rebuild(paper_records.load())
+    return stats
 
 @mcp.resource("papers://folders")
 def get_available_folders() -> str:
     """
     List all available topic folders in the papers directory.
     
-    This resource provides a simple list of all available topic folders.
+    This resource lists every topic folder with its paper count and last
+    update time, read from the topic manifest in the paper index.
     """
-    folders = []
-    
-    # Get all topic directories
-    if os.path.exists(PAPER_DIR):
-        for topic_dir in os.listdir(PAPER_DIR):
-            topic_path = os.path.join(PAPER_DIR, topic_dir)
-            if os.path.isdir(topic_path):
-                papers_file = os.path.join(topic_path, "papers_info.json")
-                if os.path.exists(papers_file):
-                    folders.append(topic_dir)
+    topics = paper_index.topics()
     
     # Create a simple markdown list
     content = "# Available Topics\n\n"
-    if folders:
-        for folder in folders:
-            content += f"- {folder}\n"
-        content += f"\nUse @{folder} to access papers in that topic.\n"
+    if topics:
+        for entry in topics:
+            content += f"- {entry['topic']} ({entry['paper_count']} papers, updated {entry['last_updated']})\n"
+        content += f"\nUse @{topics[-1]['topic']} to access papers in that topic.\n"
     else:
         content += "No topics found.\n"
     
     return content
 
+@mcp.resource("arxiv://cache")
+def get_cache_stats() -> str:
+    """
+    Report arXiv query cache statistics.
+
+    Hit and miss counts cover the current server process; entry count and
+    size describe the on-disk cache.
+    """
+    return json.dumps(query_cache.summary(), indent=2)
+
+def render_topic_page(topic: str, total: int, page: List[tuple], cursor: int = 0,
+                      page_size: int = DEFAULT_PAGE_SIZE, sort: Optional[str] = None,
+                      author: Optional[str] = None, published_after: Optional[str] = None,
+                      published_before: Optional[str] = None) -> str:
+    """
+    Render one page of a topic's papers as markdown.
+
+    `page` holds the (paper_id, record) pairs on the page and `total` the
+    number of papers matching the filters, so the output grows with
+    page_size rather than topic size.
+    """
+    end = cursor + page_size
+    parts = [
+        f"# Papers on {topic.replace('_', ' ').title()}\n\n",
+        f"Total papers: {total}\n\n",
+    ]
+    if cursor and cursor >= total:
+        parts.append(f"No more papers: the cursor is past the last of {total}.\n\n")
+    elif cursor or total > end:
+        parts.append(f"Showing papers {cursor + 1}-{min(end, total)} of {total}\n\n")
+
+    for paper_id, paper_info in page:
+        parts.append(
+            f"## {paper_info['title']}\n"
+            f"- **Paper ID**: {paper_id}\n"
+            f"- **Authors**: {', '.join(paper_info['authors'])}\n"
+            f"- **Published**: {paper_info['published']}\n"
+            f"- **PDF URL**: [{paper_info['pdf_url']}]({paper_info['pdf_url']})\n\n"
+            f"### Summary\n{paper_info['summary'][:500]}...\n\n"
+            "---\n\n"
+        )
+
+    if total > end:
+        query = {"cursor": end, "page_size": page_size}
+        for name, value in (("sort", sort), ("author", author),
+                            ("published_after", published_after), ("published_before", published_before)):
+            if value:
+                query[name] = value
+        parts.append(f"Next page: `papers://{topic}?{urllib.parse.urlencode(query)}`\n")
+
+    return "".join(parts)
+
 @mcp.resource("papers://{topic}")
 def get_topic_papers(topic: str) -> str:
     """
     Get detailed information about papers on a specific topic.
     
+    Results are paginated. Optional query parameters, e.g.
+    papers://machine_learning?page_size=20&sort=published&author=smith:
+    cursor (from the previous page), page_size, sort (published or title),
+    author, published_after and published_before (YYYY-MM-DD).
+    
     Args:
         topic: The research topic to retrieve papers for
     """
-    topic_dir = topic.lower().replace(" ", "_")
-    papers_file = os.path.join(PAPER_DIR, topic_dir, "papers_info.json")
+    topic, _, query_string = topic.partition("?")
+    params = {name: values[-1] for name, values in urllib.parse.parse_qs(query_string).items()}
+    topic = urllib.parse.unquote(topic)
+    topic_dir = topic_dir_name(topic)
     
-    if not os.path.exists(papers_file):
+    if not topic_store.exists(topic_dir):
         return f"# No papers found for topic: {topic}\n\nTry searching for papers on this topic first."
     
     try:
-        with open(papers_file, 'r') as f:
-            papers_data = json.load(f)
-        
-        # Create markdown content with paper details
-        content = f"# Papers on {topic.replace('_', ' ').title()}\n\n"
-        content += f"Total papers: {len(papers_data)}\n\n"
-        
-        for paper_id, paper_info in papers_data.items():
-            content += f"## {paper_info['title']}\n"
-            content += f"- **Paper ID**: {paper_id}\n"
-            content += f"- **Authors**: {', '.join(paper_info['authors'])}\n"
-            content += f"- **Published**: {paper_info['published']}\n"
-            content += f"- **PDF URL**: [{paper_info['pdf_url']}]({paper_info['pdf_url']})\n\n"
-            content += f"### Summary\n{paper_info['summary'][:500]}...\n\n"
-            content += "---\n\n"
-        
-        return content
-    except json.JSONDecodeError:
-        return f"# Error reading papers data for {topic}\n\nThe papers data file is corrupted."
+        cursor = int(params.get("cursor", 0))
+        page_size = int(params.get("page_size", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return "# Invalid page request\n\ncursor and page_size must be integers."
+    sort = params.get("sort")
+    if cursor < 0 or not 1 <= page_size <= MAX_PAGE_SIZE:
+        return f"# Invalid page request\n\ncursor must be >= 0 and page_size between 1 and {MAX_PAGE_SIZE}."
+    if sort is not None and sort not in TOPIC_SORTS:
+        return f"# Invalid page request\n\nsort must be one of: {', '.join(TOPIC_SORTS)}."
+    
+    filters = {"author": params.get("author")}
+    for name in ("published_after", "published_before"):
+        value = params.get(name)
+        try:
+            # Normalized, since stored dates are compared as YYYY-MM-DD strings
+            filters[name] = date.fromisoformat(value).isoformat() if value else None
+        except ValueError:
+            return f"# Invalid page request\n\n{name} must be a date in YYYY-MM-DD form."
+    
+    # Topics hold references; the index pages through them and loads only this page's records
+    total, page = paper_index.topic_page(topic_dir, cursor, page_size, sort, **filters)
+    
+    return render_topic_page(
+        topic,
+        total,
+        page,
+        cursor=cursor,
+        page_size=page_size,
+        sort=sort,
+        **filters
+    )
 
 @mcp.prompt()
 def generate_search_prompt(topic: str, num_papers: int = 5) -> str:
@@ -191,5 +1440,17 @@ Follow these instructions:
 Please present both detailed information about each paper and a high-level synthesis of the research landscape in {topic}."""
 
 if __name__ == "__main__":
-    # Initialize and run the server
-    mcp.run(transport='stdio')
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Research MCP server")
+    parser.add_argument(
+        "--rebuild-index",
+        action="store_true",
+        help="Rebuild the paper ID index from data/papers and exit"
+    )
+    args = parser.parse_args()
+
+    if args.rebuild_index:
+        stats = rebuild_paper_index()
+        print(f"Indexed {stats['papers_indexed']} papers across {stats['topics_indexed']} topics")
+    else:
+        # Initialize and run the server
+        mcp.run(transport='stdio')
\ No newline at end of file
@@ -0,0 +1,262 @@
+"""
+Shared fixtures: local stub HTTP servers standing in for arXiv, the
+insurance extraction API and monitored JSON feeds, and server modules
+bound to temporary storage.
+
+The servers/ modules are imported directly (servers/ is not a package).
+Every test rebinds the module-level stores to a temporary directory, so
+nothing is written under data/.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import urllib.parse
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+SERVERS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "servers")
+sys.path.insert(0, SERVERS_DIR)
+
+
+class StubServer:
+    """A threaded HTTP server on an ephemeral localhost port that records every request."""
+
+    def __init__(self, handler_class):
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler_class)
+        self.httpd.daemon_threads = True
+        self.httpd.stub = self
+        self.port = self.httpd.server_address[1]
+        self.url = f"http://127.0.0.1:{self.port}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def begin(self, path: str) -> None:
+        with self._lock:
+            self.requests.append({"path": path, "at": time.monotonic()})
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def end(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def close(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    @property
+    def stub(self) -> StubServer:
+        return self.server.stub
+
+    def send_body(self, status: int, body: bytes, content_type: str = "application/json") -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def arxiv_entry(paper_id: str, query: str, day: int) -> str:
+    return f"""<entry><id>http://arxiv.org/abs/{paper_id}v1</id>
+<updated>2024-01-{day:02d}T00:00:00Z</updated><published>2024-01-{day:02d}T00:00:00Z</published>
+<title>{query} paper {paper_id}</title><summary>A study of {query} ({paper_id}).</summary>
+<author><name>Author {paper_id}</name></author>
+<link href="http://arxiv.org/abs/{paper_id}v1" rel="alternate" type="text/html"/>
+<link title="pdf" href="http://arxiv.org/pdf/{paper_id}v1" rel="related" type="application/pdf"/>
+<arxiv:primary_category xmlns:arxiv="http://arxiv.org/schemas/atom" term="cs.LG"/><category term="cs.LG"/></entry>"""
+
+
+class ArxivHandler(StubHandler):
+    """Atom feed of 30 papers per query; queries containing "unavailable" get a 503."""
+
+    total = 30
+
+    def do_GET(self):
+        self.stub.begin(self.path)
+        try:
+            params = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+            query = params.get("search_query", [""])[0]
+            if "unavailable" in query:
+                self.send_body(503, b"unavailable", "text/plain")
+                return
+            start = int(params.get("start", ["0"])[0])
+            count = int(params.get("max_results", ["10"])[0])
+            prefix = 2400 + zlib.crc32(query.encode()) % 100
+            entries = "".join(
+                arxiv_entry(f"{prefix}.{10000 + k}", query, 1 + (self.total - k) % 28)
+                for k in range(start, min(start + count, self.total))
+            )
+            body = f"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">
+<opensearch:totalResults>{self.total}</opensearch:totalResults><opensearch:startIndex>{start}</opensearch:startIndex>
+<opensearch:itemsPerPage>{count}</opensearch:itemsPerPage>{entries}</feed>"""
+            self.send_body(200, body.encode(), "application/atom+xml")
+        finally:
+            self.stub.end()
+
+
+class InsuranceHandler(StubHandler):
+    """Accepts a multipart PDF upload and returns a fixed certificate extraction."""
+
+    protocol_version = "HTTP/1.1"
+
+    def read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            body = b""
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return body
+                body += self.rfile.read(size)
+                self.rfile.readline()
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def do_POST(self):
+        self.stub.begin(self.path)
+        try:
+            body = self.read_body()
+            self.stub.requests[-1]["bytes"] = len(body)
+            time.sleep(0.05)
+            if b"%PDF-" not in body:
+                result = {"Success": "False", "error": "Could not read the uploaded file as a PDF"}
+            else:
+                result = {
+                    "Success": "True",
+                    "RequestId": str(len(self.stub.requests)),
+                    "Classification": "COI",
+                    "Insured": {"Name": "Acme Corp"},
+                    "Coverages": [{"CoverageType": "General Liability", "PolicyNumber": "GL1"}]
+                }
+            self.send_body(200, json.dumps(result).encode())
+        finally:
+            self.stub.end()
+
+
+class FeedHandler(StubHandler):
+    """
+    JSON feeds selected by path:
+    /ok/<name>, /wrapped/<name>, /slow/<name> (headers after 2s),
+    /trickle/<name> (one byte every 0.2s), /error/<name> (HTTP 500).
+    """
+
+    def do_GET(self):
+        self.stub.begin(self.path)
+        try:
+            kind, _, name = self.path.strip("/").partition("/")
+            items = [{"id": f"{name}-{i}", "title": f"{name} engineer {i}"} for i in range(3)]
+            if kind == "error":
+                self.send_body(500, b'{"error": "boom"}')
+            elif kind == "slow":
+                time.sleep(2.0)
+                self.send_body(200, json.dumps(items).encode())
+            elif kind == "trickle":
+                body = json.dumps(items).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                for i in range(len(body)):
+                    self.wfile.write(body[i:i + 1])
+                    self.wfile.flush()
+                    time.sleep(0.2)
+            elif kind == "wrapped":
+                self.send_body(200, json.dumps({"jobs": items}).encode())
+            else:
+                time.sleep(0.1)
+                self.send_body(200, json.dumps(items).encode())
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.stub.end()
+
+
+@pytest.fixture
+def arxiv_stub():
+    server = StubServer(ArxivHandler)
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def insurance_stub():
+    server = StubServer(InsuranceHandler)
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def feed_stub():
+    server = StubServer(FeedHandler)
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def research(tmp_path, monkeypatch, arxiv_stub):
+    """research_server with its stores under tmp_path and arXiv pointed at the stub."""
+    import research_server as rs
+
+    paper_dir = str(tmp_path / "papers")
+    monkeypatch.setattr(rs, "PAPER_DIR", paper_dir)
+    store = rs.TopicStore(paper_dir)
+    records = rs.RecordLog(
+        os.path.join(paper_dir, rs.PAPER_STORE_SNAPSHOT),
+        os.path.join(paper_dir, rs.PAPER_STORE_LOG)
+    )
+    monkeypatch.setattr(rs, "topic_store", store)
+    monkeypatch.setattr(rs, "paper_records", records)
+    monkeypatch.setattr(rs, "paper_index", rs.PaperIndex(os.path.join(paper_dir, "paper_index.db"), store, records))
+    monkeypatch.setattr(rs, "related_index", rs.RelatedIndex(os.path.join(paper_dir, "related"), rs.RELATED_DIM))
+    monkeypatch.setattr(rs, "query_cache", rs.QueryCache(os.path.join(paper_dir, "arxiv_cache.db"), 3600, 1024 * 1024))
+    monkeypatch.setattr(rs, "arxiv_scheduler", rs.ArxivScheduler(0))
+    monkeypatch.setattr(rs.ScheduledArxivClient, "query_url_format", arxiv_stub.url + "/api/query?{}")
+    return rs
+
+
+@pytest.fixture
+def insurance(tmp_path, monkeypatch, insurance_stub):
+    """insurance_server with its stores under tmp_path and uploads sent to the stub."""
+    import insurance_server as ins
+
+    data_dir = tmp_path / "insurance"
+    api_url = insurance_stub.url + "/extract"
+    monkeypatch.setattr(ins, "INSURANCE_API_URL", api_url)
+    monkeypatch.setattr(ins, "BATCH_OUTPUT_DIR", str(data_dir / "batches"))
+    monkeypatch.setattr(ins, "PACKET_OUTPUT_DIR", str(data_dir / "packets"))
+    monkeypatch.setattr(ins, "extraction_cache", ins.ExtractionCache(
+        str(data_dir / "extraction_cache.db"), 3600, 1024 * 1024, api_url))
+    monkeypatch.setattr(ins, "certificate_store", ins.CertificateStore(str(data_dir / "certificates.db")))
+    monkeypatch.setattr(ins, "preflight", ins.PdfPreflight(1024 * 1024))
+    monkeypatch.setattr(ins, "circuit_breaker", ins.CircuitBreaker(5, 30))
+    monkeypatch.setattr(ins, "job_queue", ins.CertificateJobQueue(str(data_dir / "jobs.db"), 1, 3))
+    monkeypatch.setattr(ins, "JOB_RETRY_DELAY", 0.05)
+    return ins
+
+
+@pytest.fixture
+def monitoring(tmp_path, monkeypatch):
+    """monitoring_server with its database, schedule and seen set under tmp_path."""
+    import monitoring_server as ms
+
+    db_path = str(tmp_path / "monitoring.db")
+    manager = ms.MonitoringManager(db_path, 30, 1000)
+    monkeypatch.setattr(ms, "monitoring", manager)
+    monkeypatch.setattr(ms, "scheduler", ms.MonitorScheduler(manager))
+    monkeypatch.setattr(ms, "keyword_matcher", ms.KeywordMatcher())
+    monkeypatch.setattr(ms, "seen_items", ms.SeenItems(db_path, str(tmp_path / "seen_items.bloom"), 0.01, 50000, 1000))
+    return ms
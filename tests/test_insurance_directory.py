@@ -0,0 +1,106 @@
+"""process_certificate_directory against a stub insurance extraction API."""
+
+import json
+import os
+
+
+def write_pdf(path, tag: bytes = b"") -> None:
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4\n" + tag + b"x" * 2000 + b"\n%%EOF\n")
+
+
+def uploads(stub):
+    return [request for request in stub.requests if request["path"] == "/extract"]
+
+
+def read_results(path):
+    with open(path) as f:
+        return {os.path.basename(outcome["file"]): outcome["result"] for outcome in map(json.loads, f)}
+
+
+def test_duplicate_pdfs_are_uploaded_once(insurance, insurance_stub, tmp_path):
+    folder = tmp_path / "certs"
+    folder.mkdir()
+    write_pdf(folder / "a.pdf", b"first")
+    write_pdf(folder / "a_copy.pdf", b"first")
+    write_pdf(folder / "a_copy2.pdf", b"first")
+    write_pdf(folder / "b.pdf", b"second")
+
+    result = insurance.process_certificate_directory(str(folder), concurrency=4,
+                                                     output_path=str(tmp_path / "out.jsonl"))
+
+    assert result["files_found"] == 4
+    assert result["succeeded"] == 4
+    assert result["failed"] == 0
+    assert len(uploads(insurance_stub)) == 2
+    saved = insurance.preflight.summary()
+    assert saved["cache_hits"] + saved["duplicates_in_flight"] == 2
+
+
+def test_empty_and_non_pdf_files_are_rejected_locally(insurance, insurance_stub, tmp_path):
+    folder = tmp_path / "certs"
+    folder.mkdir()
+    write_pdf(folder / "good.pdf")
+    (folder / "empty.pdf").write_bytes(b"")
+    (folder / "scan.pdf").write_bytes(b"PK\x03\x04 this is a zip file, not a PDF" * 10)
+    (folder / "notes.txt").write_text("not a certificate")
+
+    result = insurance.process_certificate_directory(str(folder), output_path=str(tmp_path / "out.jsonl"))
+
+    assert result["files_found"] == 3
+    assert result["succeeded"] == 1
+    assert result["failed"] == 2
+    assert {os.path.basename(failure["file"]) for failure in result["failures"]} == {"empty.pdf", "scan.pdf"}
+    assert len(uploads(insurance_stub)) == 1
+    reasons = {name: outcome.get("preflight") for name, outcome in read_results(tmp_path / "out.jsonl").items()}
+    assert reasons == {"good.pdf": None, "empty.pdf": "empty", "scan.pdf": "not_pdf"}
+
+
+def test_rerun_is_served_from_the_extraction_cache(insurance, insurance_stub, tmp_path):
+    folder = tmp_path / "certs"
+    folder.mkdir()
+    for i in range(3):
+        write_pdf(folder / f"cert{i}.pdf", str(i).encode())
+
+    first = insurance.process_certificate_directory(str(folder), output_path=str(tmp_path / "first.jsonl"))
+    second = insurance.process_certificate_directory(str(folder), output_path=str(tmp_path / "second.jsonl"))
+
+    assert first["succeeded"] == second["succeeded"] == 3
+    assert len(uploads(insurance_stub)) == 3
+    assert insurance.extraction_cache.summary()["hits"] == 3
+    assert insurance.preflight.summary()["cache_hits"] == 3
+    assert insurance.extraction_cache.summary()["upload_bytes_saved"] == 3 * os.path.getsize(folder / "cert0.pdf")
+    assert read_results(tmp_path / "first.jsonl") == read_results(tmp_path / "second.jsonl")
+
+
+def test_unwritable_output_path_fails_before_any_upload(insurance, insurance_stub, tmp_path):
+    folder = tmp_path / "certs"
+    folder.mkdir()
+    write_pdf(folder / "a.pdf")
+    (tmp_path / "taken").write_text("a file, not a directory")
+
+    result = insurance.process_certificate_directory(str(folder), output_path=str(tmp_path / "taken" / "out.jsonl"))
+
+    assert result["Success"] == "False"
+    assert "Cannot write results" in result["error"]
+    assert uploads(insurance_stub) == []
+
+
+def test_unexpected_error_is_recorded_for_that_file_only(insurance, insurance_stub, tmp_path, monkeypatch):
+    folder = tmp_path / "certs"
+    folder.mkdir()
+    write_pdf(folder / "good.pdf")
+    write_pdf(folder / "broken.pdf", b"broken")
+    extract = insurance.extract_certificate
+
+    def flaky_extract(file_path):
+        if file_path.endswith("broken.pdf"):
+            raise RuntimeError("disk read failed")
+        return extract(file_path)
+
+    monkeypatch.setattr(insurance, "extract_certificate", flaky_extract)
+    result = insurance.process_certificate_directory(str(folder), output_path=str(tmp_path / "out.jsonl"))
+
+    assert result["succeeded"] == 1
+    assert result["failures"] == [{"file": str(folder / "broken.pdf"), "error": "disk read failed"}]
+    assert read_results(tmp_path / "out.jsonl")["broken.pdf"] == {"error": "disk read failed", "Success": "False"}
@@ -0,0 +1,102 @@
+"""Background job retries and the inbox checkpoint for failed extractions."""
+
+import time
+
+import pytest
+
+from test_insurance_directory import write_pdf
+
+
+def wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            pytest.fail("condition not met in time")
+        time.sleep(0.02)
+
+
+def failing_extract(monkeypatch, insurance, failures: int):
+    """Make the next `failures` extractions fail as a 503 would, then extract normally."""
+    extract = insurance.extract_certificate
+    calls = []
+
+    def flaky(file_path):
+        calls.append(file_path)
+        if len(calls) <= failures:
+            return {"error": "503 Server Error", "status_code": 503, "Success": "False"}
+        return extract(file_path)
+
+    monkeypatch.setattr(insurance, "extract_certificate", flaky)
+    return calls
+
+
+def finished(insurance, job_id):
+    return insurance.job_queue.get(job_id)["status"] in ("succeeded", "failed")
+
+
+def test_transient_failure_is_retried(insurance, tmp_path, monkeypatch):
+    calls = failing_extract(monkeypatch, insurance, 2)
+    write_pdf(tmp_path / "cert.pdf")
+
+    job_id = insurance.job_queue.submit(str(tmp_path / "cert.pdf"))
+    wait_for(lambda: finished(insurance, job_id))
+
+    job = insurance.job_queue.get(job_id)
+    assert job["status"] == "succeeded"
+    assert job["attempts"] == 3
+    assert len(calls) == 3
+
+
+def test_retries_stop_at_max_attempts(insurance, tmp_path, monkeypatch):
+    calls = failing_extract(monkeypatch, insurance, 10)
+    write_pdf(tmp_path / "cert.pdf")
+
+    job_id = insurance.job_queue.submit(str(tmp_path / "cert.pdf"))
+    wait_for(lambda: finished(insurance, job_id))
+
+    job = insurance.job_queue.get(job_id)
+    assert job["status"] == "failed"
+    assert job["error"] == "503 Server Error"
+    assert len(calls) == 3
+
+
+def test_preflight_rejection_is_not_retried(insurance, tmp_path):
+    (tmp_path / "empty.pdf").write_bytes(b"")
+
+    job_id = insurance.job_queue.submit(str(tmp_path / "empty.pdf"))
+    wait_for(lambda: finished(insurance, job_id))
+
+    job = insurance.job_queue.get(job_id)
+    assert job["status"] == "failed"
+    assert job["attempts"] == 1
+
+
+def test_failed_inbox_file_is_submitted_again_after_restart(insurance, tmp_path, monkeypatch):
+    failing_extract(monkeypatch, insurance, 3)
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    write_pdf(inbox / "cert.pdf")
+    checkpoint = str(tmp_path / "inbox.db")
+
+    watcher = insurance.InboxWatcher(str(inbox), checkpoint, 0.05, 0)
+    watcher.scan()
+    assert watcher.scan() == 1
+    job_id = watcher._in_flight[str(inbox / "cert.pdf")]
+    wait_for(lambda: finished(insurance, job_id))
+    watcher.scan()
+
+    summary = watcher.summary()
+    assert summary["files_failed"] == 1
+    assert summary["files_processed"] == 0
+    # Not resubmitted while the same content is still failing in this process
+    assert watcher.scan() == 0
+
+    restarted = insurance.InboxWatcher(str(inbox), checkpoint, 0.05, 0)
+    restarted.load_checkpoint()
+    restarted.scan()
+    assert restarted.scan() == 1
+    job_id = restarted._in_flight[str(inbox / "cert.pdf")]
+    wait_for(lambda: finished(insurance, job_id))
+    restarted.scan()
+    assert restarted.summary()["files_processed"] == 1
+    assert restarted.summary()["files_failed"] == 0
@@ -0,0 +1,36 @@
+"""AdaptiveConcurrencyLimiter: latency is judged per MB uploaded."""
+
+import insurance_server as ins
+
+MB = 1024 * 1024
+
+
+def warmed_up_limiter() -> ins.AdaptiveConcurrencyLimiter:
+    limiter = ins.AdaptiveConcurrencyLimiter(8, 16, 2.0, 1)
+    for _ in range(5):
+        limiter.acquire()
+        limiter.release(0.5, False, 100 * 1024)
+    return limiter
+
+
+def test_large_upload_that_is_slow_to_send_keeps_the_limit():
+    limiter = warmed_up_limiter()
+    before = limiter.limit
+
+    limiter.acquire()
+    # 20x the baseline latency, but for a 20 MB body the rate per MB is unchanged
+    limiter.release(10.0, False, 20 * MB)
+
+    assert limiter.stats["decreases"] == 0
+    assert limiter.limit > before
+
+
+def test_slow_response_for_a_small_upload_halves_the_limit():
+    limiter = warmed_up_limiter()
+    before = limiter.limit
+
+    limiter.acquire()
+    limiter.release(2.0, False, 100 * 1024)
+
+    assert limiter.stats["decreases"] == 1
+    assert limiter.limit == before / 2
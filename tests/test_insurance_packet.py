@@ -0,0 +1,34 @@
+"""process_certificate_packet: splitting a packet and extracting each part."""
+
+import os
+
+import pytest
+
+pypdf = pytest.importorskip("pypdf")
+
+
+def write_packet(path, pages: int) -> None:
+    writer = pypdf.PdfWriter()
+    for index in range(pages):
+        # Distinct page sizes keep the parts' content, and so their cache keys, apart
+        writer.add_blank_page(width=612 + index, height=792)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+def test_packet_parts_are_split_and_extracted(insurance, tmp_path):
+    write_packet(tmp_path / "packet.pdf", 6)
+
+    result = insurance.process_certificate_packet(str(tmp_path / "packet.pdf"), pages_per_certificate=2, concurrency=3)
+
+    assert result["Success"] == "True"
+    assert result["split_method"] == "fixed"
+    assert [part["pages"] for part in result["certificates"]] == [[1, 2], [3, 4], [5, 6]]
+    for part in result["certificates"]:
+        assert len(pypdf.PdfReader(part["file"]).pages) == 2
+    assert not [name for name in os.listdir(os.path.dirname(part["file"])) if name.endswith(".tmp")]
+
+    # A re-run reuses the split files and the cached extractions
+    again = insurance.process_certificate_packet(str(tmp_path / "packet.pdf"), pages_per_certificate=2)
+    assert [part["result"] for part in again["certificates"]] == [part["result"] for part in result["certificates"]]
+    assert insurance.extraction_cache.summary()["hits"] == 3
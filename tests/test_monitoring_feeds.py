@@ -0,0 +1,117 @@
+"""FeedFetcher against stub JSON feeds: statuses, deadlines and per-host limits."""
+
+import time
+
+import pytest
+
+import monitoring_server as ms
+
+
+def feed(stub, path: str, host: str = "127.0.0.1") -> str:
+    return f"http://{host}:{stub.port}{path}"
+
+
+def started(stub, prefix: str):
+    return sorted(request["at"] for request in stub.requests if request["path"].startswith(prefix))
+
+
+def test_statuses_for_ok_partial_timeout_and_error(feed_stub):
+    fetcher = ms.FeedFetcher(8, 100, 10, 0.6, 1024 * 1024)
+    ok, wrapped = feed(feed_stub, "/ok/a"), feed(feed_stub, "/wrapped/b")
+    slow, trickle, error = feed(feed_stub, "/slow/c"), feed(feed_stub, "/trickle/d"), feed(feed_stub, "/error/e")
+    monitors = [
+        {"monitor_id": "healthy", "feed_urls": [ok, wrapped]},
+        {"monitor_id": "partial", "feed_urls": [ok, slow]},
+        {"monitor_id": "timed_out", "feed_urls": [slow, trickle]},
+        {"monitor_id": "failed", "feed_urls": [error]},
+        {"monitor_id": "mixed", "feed_urls": [error, slow]},
+    ]
+
+    began = time.monotonic()
+    items, checks = fetcher.fetch(monitors)
+    elapsed = time.monotonic() - began
+
+    # A slow or trickling feed is abandoned at its deadline rather than awaited
+    assert elapsed < 0.6 + 0.5
+    assert set(items) == {ok, wrapped}
+    assert [item["id"] for item in items[wrapped]] == ["b-0", "b-1", "b-2"]
+    assert {monitor_id: check["status"] for monitor_id, check in checks.items()} == {
+        "healthy": "ok", "partial": "partial", "timed_out": "timeout", "failed": "error", "mixed": "error"
+    }
+    assert checks["healthy"]["items_fetched"] == 6
+    assert checks["healthy"]["feed_errors"] == {}
+    assert checks["partial"]["items_fetched"] == 3
+    assert set(checks["partial"]["feed_errors"]) == {slow}
+    assert set(checks["timed_out"]["feed_errors"]) == {slow, trickle}
+    assert "500" in checks["failed"]["feed_errors"][error]
+    # Feeds shared by several monitors are requested once per pass
+    assert len(feed_stub.requests) == 5
+    summary = fetcher.summary()
+    assert summary["timeouts"] == 2
+    assert summary["failures"] == 1
+
+
+def test_requests_to_one_host_are_rate_limited(feed_stub):
+    fetcher = ms.FeedFetcher(8, 5, 1, 5.0, 1024 * 1024)
+    limited = [feed(feed_stub, f"/ok/local{i}") for i in range(4)]
+    other_host = [feed(feed_stub, "/ok/other0", host="localhost")]
+
+    items, checks = fetcher.fetch([{"monitor_id": "jobs", "feed_urls": limited + other_host}])
+
+    assert checks["jobs"]["status"] == "ok"
+    assert len(items) == 5
+    local = started(feed_stub, "/ok/local")
+    gaps = [later - earlier for earlier, later in zip(local, local[1:])]
+    # 5 requests per second with no burst: consecutive requests are ~0.2s apart
+    assert min(gaps) > 0.15
+    # The other host has its own bucket, so it is not queued behind the first
+    assert started(feed_stub, "/ok/other")[0] - local[0] < 0.15
+    hosts = fetcher.summary()["hosts"]
+    assert set(hosts) == {f"127.0.0.1:{feed_stub.port}", f"localhost:{feed_stub.port}"}
+    assert hosts[f"127.0.0.1:{feed_stub.port}"]["rate_limit_wait_seconds"] > 1.0
+
+
+def test_concurrent_fetches_are_capped(feed_stub):
+    fetcher = ms.FeedFetcher(2, 100, 10, 5.0, 1024 * 1024)
+    urls = [feed(feed_stub, f"/ok/feed{i}") for i in range(6)]
+
+    _, checks = fetcher.fetch([{"monitor_id": "jobs", "feed_urls": urls}])
+
+    assert checks["jobs"]["status"] == "ok"
+    assert checks["jobs"]["items_fetched"] == 18
+    assert feed_stub.max_in_flight == 2
+
+
+def test_queued_fetches_share_the_pass_deadline(feed_stub):
+    fetcher = ms.FeedFetcher(1, 100, 10, 0.6, 1024 * 1024)
+    slow = feed(feed_stub, "/slow/a")
+    queued = [feed(feed_stub, "/wrapped/b"), feed(feed_stub, "/wrapped/c")]
+
+    began = time.monotonic()
+    _, checks = fetcher.fetch([{"monitor_id": "jobs", "feed_urls": [slow] + queued}])
+
+    # The only worker is stuck on the slow feed; the queued ones time out with the pass
+    assert time.monotonic() - began < 0.6 + 0.5
+    assert checks["jobs"]["status"] == "timeout"
+    assert set(checks["jobs"]["feed_errors"]) == {slow, *queued}
+    assert fetcher.summary()["abandoned"] == 1
+    assert [request["path"] for request in feed_stub.requests] == ["/slow/a"]
+
+    # The abandoned fetch gives up at the deadline, so the next pass gets the worker back
+    items, checks = fetcher.fetch([{"monitor_id": "jobs", "feed_urls": queued}])
+    assert checks["jobs"]["status"] == "ok"
+    assert set(items) == set(queued)
+
+
+def test_host_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        ms.TokenBucket(0, 1)
+    with pytest.raises(ValueError):
+        ms.FeedFetcher(8, 0, 3, 10, 1024 * 1024)
+
+
+def test_validate_feed_urls():
+    urls = ["https://example.com/jobs.json", " https://example.com/jobs.json ", "http://example.org/feed"]
+    assert ms.validate_feed_urls(urls) == ["https://example.com/jobs.json", "http://example.org/feed"]
+    with pytest.raises(ValueError):
+        ms.validate_feed_urls(["ftp://example.com/jobs.json"])
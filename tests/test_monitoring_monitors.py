@@ -0,0 +1,26 @@
+"""Monitor creation and on-demand checks."""
+
+
+def test_check_all_monitors_checks_every_monitor_by_default(monitoring):
+    monitoring.create_job_monitor(["Acme"], ["python"], "+15550100", check_frequency="weekly")
+    monitoring.create_research_monitor(["graph networks"], "+15550100", check_frequency="daily")
+
+    # Neither monitor is due for days
+    assert monitoring.check_all_monitors(due_only=True)["monitors_checked"] == 0
+    assert monitoring.check_all_monitors()["monitors_checked"] == 2
+
+
+def test_unknown_check_frequency_falls_back_to_daily(monitoring):
+    result = monitoring.create_job_monitor(["Acme"], ["python"], "+15550100", check_frequency="every other tuesday")
+
+    assert result["monitor_created"] is True
+    assert "every other tuesday" in result["warning"]
+    stored = monitoring.monitoring.list_monitors(active=True)
+    assert [monitor["check_frequency"] for monitor in stored] == ["daily"]
+
+
+def test_valid_check_frequency_has_no_warning(monitoring):
+    result = monitoring.create_industry_news_monitor("fintech", ["payments"], "+15550100", check_frequency="6h")
+
+    assert result["industry_monitor_created"] is True
+    assert "warning" not in result
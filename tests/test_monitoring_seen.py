@@ -0,0 +1,56 @@
+"""SeenItems: exact suppression and Bloom filter upkeep as the table is pruned."""
+
+import monitoring_server as ms
+
+
+def postings(start: int, count: int):
+    return [{"url": f"https://example.com/jobs/{i}", "title": f"Engineer {i}"} for i in range(start, start + count)]
+
+
+def fingerprints(items):
+    return [ms.item_fingerprint("jobs", item) for item in items]
+
+
+def test_seen_items_are_suppressed(tmp_path):
+    seen = ms.SeenItems(str(tmp_path / "monitoring.db"), str(tmp_path / "seen.bloom"), 0.01, 1000, 100)
+
+    assert len(seen.filter_new({"jobs": postings(0, 10)})["jobs"]) == 10
+    assert len(seen.filter_new({"jobs": postings(5, 10)})["jobs"]) == 5
+    assert seen.summary()["suppressed"] == 5
+
+
+def test_pruned_fingerprints_are_cleared_from_the_bloom_filter(tmp_path):
+    seen = ms.SeenItems(str(tmp_path / "monitoring.db"), str(tmp_path / "seen.bloom"), 0.01, 1000, 100)
+    for start in range(0, 3000, 100):
+        seen.filter_new({"jobs": postings(start, 100)})
+
+    summary = seen.summary()
+    assert summary["stored_fingerprints"] == 1000
+    assert summary["bloom_rebuilds"] >= 10
+    assert summary["pruned_since_rebuild"] < 1000 * ms.SEEN_REBUILD_FRACTION
+    # The filter holds what the table holds, not all 3000 fingerprints ever seen
+    pruned = fingerprints(postings(0, 1000))
+    assert sum(fingerprint in seen.bloom for fingerprint in pruned) < 50
+    assert all(fingerprint in seen.bloom for fingerprint in fingerprints(postings(2000, 1000)))
+
+
+def test_forgotten_monitor_counts_towards_a_rebuild(tmp_path):
+    seen = ms.SeenItems(str(tmp_path / "monitoring.db"), str(tmp_path / "seen.bloom"), 0.01, 1000, 100)
+    seen.filter_new({"jobs": postings(0, 200)})
+    rebuilds = seen.summary()["bloom_rebuilds"]
+
+    seen.forget_monitor("jobs")
+
+    assert seen.summary()["bloom_rebuilds"] == rebuilds + 1
+    assert sum(fingerprint in seen.bloom for fingerprint in fingerprints(postings(0, 200))) < 10
+
+
+def test_filter_sized_for_other_settings_is_rebuilt_from_the_table(tmp_path):
+    db_path, bloom_path = str(tmp_path / "monitoring.db"), str(tmp_path / "seen.bloom")
+    ms.SeenItems(db_path, bloom_path, 0.01, 1000, 100).filter_new({"jobs": postings(0, 50)})
+
+    reopened = ms.SeenItems(db_path, bloom_path, 0.01, 5000, 100)
+
+    assert reopened.filter_new({"jobs": postings(0, 60)})["jobs"] == postings(50, 10)
+    assert reopened.summary()["bloom_rebuilds"] == 1
+    assert reopened.bloom.capacity == 5000
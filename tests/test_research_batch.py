@@ -0,0 +1,58 @@
+"""search_papers_batch against a stub arXiv API."""
+
+
+def test_batch_dedupes_topics_sharing_a_folder(research, arxiv_stub):
+    result = research.search_papers_batch(["graph networks", "Graph Networks", "diffusion"], max_results=3)
+
+    assert result["topics_searched"] == 2
+    assert result["topics_failed"] == 0
+    assert set(result["results"]) == {"graph networks", "diffusion"}
+    assert result["total_papers"] == 6
+    assert len(arxiv_stub.requests) == 2
+
+
+def test_batch_stores_each_topic(research):
+    result = research.search_papers_batch(["graph networks", "diffusion"], max_results=3)
+
+    for topic, outcome in result["results"].items():
+        stored = research.topic_store.load(research.topic_dir_name(topic))
+        assert set(stored) == set(outcome["paper_ids"])
+        for paper_id in outcome["paper_ids"]:
+            assert research.paper_index.lookup(paper_id) is not None
+
+
+def test_repeated_batch_is_served_from_cache(research, arxiv_stub):
+    first = research.search_papers_batch(["graph networks", "diffusion"], max_results=3)
+    requests_made = len(arxiv_stub.requests)
+    second = research.search_papers_batch(["diffusion", "graph networks"], max_results=3)
+
+    assert len(arxiv_stub.requests) == requests_made
+    for topic in first["results"]:
+        assert second["results"][topic]["paper_ids"] == first["results"][topic]["paper_ids"]
+    assert research.query_cache.summary()["hits"] == 2
+
+
+def test_failed_topic_does_not_sink_the_batch(research):
+    result = research.search_papers_batch(["diffusion", "unavailable topic"], max_results=3)
+
+    assert result["topics_searched"] == 2
+    assert result["topics_failed"] == 1
+    assert result["results"]["unavailable topic"]["paper_ids"] == []
+    assert "error" in result["results"]["unavailable topic"]
+    assert len(result["results"]["diffusion"]["paper_ids"]) == 3
+
+
+def test_every_arxiv_request_goes_through_the_scheduler(research, arxiv_stub, monkeypatch):
+    class CountingScheduler(research.ArxivScheduler):
+        waits = 0
+
+        def wait(self):
+            CountingScheduler.waits += 1
+            super().wait()
+
+    monkeypatch.setattr(research, "arxiv_scheduler", CountingScheduler(0))
+    research.search_papers_batch(["graph networks", "unavailable topic"], max_results=3)
+
+    # Includes the retries of the failing topic
+    assert len(arxiv_stub.requests) > 2
+    assert CountingScheduler.waits == len(arxiv_stub.requests)
@@ -0,0 +1,25 @@
+"""papers://{topic} paging and filters."""
+
+
+def test_cursor_past_the_end_says_there_are_no_more_papers(research):
+    research.search_papers_batch(["graph networks"], max_results=5)
+
+    page = research.get_topic_papers("graph_networks?cursor=5&page_size=5")
+
+    assert "Total papers: 5" in page
+    assert "No more papers" in page
+    assert "Showing papers" not in page
+    assert "Next page" not in page
+
+
+def test_date_filters_are_validated(research):
+    research.search_papers_batch(["graph networks"], max_results=5)
+
+    page = research.get_topic_papers("graph_networks?published_after=2024-13-01")
+    assert page.startswith("# Invalid page request")
+    assert "published_after" in page
+    assert research.get_topic_papers("graph_networks?published_before=yesterday").startswith("# Invalid page request")
+
+    # Published dates are 2024-01-01..03 and 2024-01-27..28
+    assert "Total papers: 2" in research.get_topic_papers("graph_networks?published_after=2024-01-27")
+    assert "Total papers: 2" in research.get_topic_papers("graph_networks?published_after=20240127")
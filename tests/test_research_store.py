@@ -0,0 +1,29 @@
+"""Migration of topic folders written before the shared paper store existed."""
+
+import json
+import os
+
+
+def test_legacy_topic_is_migrated_and_backed_up(research):
+    topic_dir = os.path.join(research.PAPER_DIR, "legacy_topic")
+    os.makedirs(topic_dir)
+    legacy = {
+        "2401.00001v1": {"title": "Old paper", "authors": ["A. Author"], "summary": "Stored inline."},
+        "2401.00002v1": {"title": "Another", "authors": ["B. Author"], "summary": "Also inline."},
+    }
+    snapshot = os.path.join(topic_dir, research.PAPERS_SNAPSHOT)
+    with open(snapshot, "w") as f:
+        json.dump(legacy, f)
+
+    result = research.paper_index.rebuild()
+
+    assert result["records_migrated"] == 2
+    assert research.topic_store.load("legacy_topic") == {paper_id: {} for paper_id in legacy}
+    assert research.paper_records.load() == legacy
+    with open(snapshot + ".bak") as f:
+        assert json.load(f) == legacy
+
+    # A second rebuild finds nothing left to migrate and keeps the original backup
+    assert research.paper_index.rebuild()["records_migrated"] == 0
+    with open(snapshot + ".bak") as f:
+        assert json.load(f) == legacy